@@ -0,0 +1,303 @@
+"""JSON API over the player dataset, for clients that aren't the Streamlit apps.
+
+    python api_server.py [--port 8000] [--workers 4]
+
+    GET /api/version
+    GET /api/search?q=messi&k=50
+    GET /api/top_valued?k=10&min_age=18&max_age=25&league=...&league=...
+    GET /api/undervalued?k=10&max_value=20000000&min_age=..&max_age=..&league=..
+    GET /api/best_by_position?position=Defender&k=10
+    GET /api/compare?id=158023&id=20801&percentiles=1
+
+The server answers the same queries as fifa.py over the PlayerDataset (see
+player_data.py). Queries and their JSON encoding run in a pool of worker
+processes, each holding its own copy of the dataset and its indexes, so
+they run in parallel instead of taking turns on the GIL; the event loop
+only parses requests and writes responses. Responses are gzipped for
+clients that accept it, and carry an ETag made of the dataset version and
+the normalized query, so a matching If-None-Match gets a 304 before any
+query runs. The dataset file is checked for changes every few seconds, and
+each query carries the version the server answers with, so a worker still
+holding an older version reloads before running it.
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import multiprocessing
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from urllib.parse import urlencode
+
+import numpy as np
+import tornado.web
+from tornado.ioloop import IOLoop, PeriodicCallback
+
+from player_data import PARQUET_PATH, PLAYER_COLUMNS, SOURCE_PATH, load_players
+from positions import POSITION_GROUPS
+from similarity import ATTRIBUTES
+
+logger = logging.getLogger(__name__)
+
+# Columns returned for undervalued players
+UNDERVALUED_COLUMNS = PLAYER_COLUMNS + ['fair_value_eur', 'undervaluation']
+
+# Same limits as the pages in fifa.py
+MAX_RESULTS = 100
+MAX_COMPARED = 10
+
+# How often the dataset file is checked for a new version (milliseconds)
+RELOAD_INTERVAL_MS = 5000
+
+
+class QueryError(ValueError):
+    """A bad request parameter, answered with 400."""
+
+    status_code = 400
+
+
+class NotFound(QueryError):
+    """A request for something that doesn't exist, answered with 404."""
+
+    status_code = 404
+
+
+def _records(frame, columns):
+    """JSON array of the rows of `frame` (NaN becomes null)."""
+    return frame[columns].to_json(orient='records', force_ascii=False)
+
+
+def _int(value, name, low=None, high=None):
+    try:
+        number = int(value)
+    except (TypeError, ValueError):
+        raise QueryError(f"{name} must be an integer, got {value!r}")
+    if (low is not None and number < low) or (high is not None and number > high):
+        raise QueryError(f"{name} must be between {low} and {high}")
+    return number
+
+
+def _market_filters(args):
+    age_range = None
+    if 'min_age' in args or 'max_age' in args:
+        age_range = (_int(args.get('min_age', [0])[0], 'min_age'), _int(args.get('max_age', [200])[0], 'max_age'))
+    leagues = tuple(sorted(args.get('league', []))) or None
+    return dict(age_range=age_range, leagues=leagues)
+
+
+# Queries: each takes the dataset and the query arguments (name -> list of values) and
+# returns the JSON body. They run in the worker processes.
+
+def query_search(dataset, args):
+    text = args.get('q', [''])[0]
+    k = _int(args.get('k', [50])[0], 'k', 1, MAX_RESULTS)
+    positions = dataset.search_index.search(text, k=k) if text.strip() else dataset.search_index.best(k=k)
+    return f'{{"players": {_records(dataset.df.iloc[positions], PLAYER_COLUMNS)}}}'
+
+
+def query_top_valued(dataset, args):
+    k = _int(args.get('k', [10])[0], 'k', 1, MAX_RESULTS)
+    positions = dataset.market.top_valued(k, **_market_filters(args))
+    return f'{{"players": {_records(dataset.df.iloc[positions], PLAYER_COLUMNS)}}}'
+
+
+def query_undervalued(dataset, args):
+    k = _int(args.get('k', [10])[0], 'k', 1, MAX_RESULTS)
+    max_value = _int(args.get('max_value', [20_000_000])[0], 'max_value', 0)
+    positions = dataset.market.undervalued(k, max_value=max_value, **_market_filters(args))
+    return f'{{"players": {_records(dataset.df.iloc[positions], UNDERVALUED_COLUMNS)}}}'
+
+
+def query_best_by_position(dataset, args):
+    position = args.get('position', [''])[0]
+    if position not in POSITION_GROUPS:
+        raise QueryError(f"position must be one of {', '.join(POSITION_GROUPS)}")
+    k = _int(args.get('k', [10])[0], 'k', 1, MAX_RESULTS)
+    order = dataset.market.view('overall')
+    positions = order[dataset.positions.group_mask(position)[order]][:k]
+    return f'{{"players": {_records(dataset.df.iloc[positions], PLAYER_COLUMNS)}}}'
+
+
+def query_compare(dataset, args):
+    ids = [_int(value, 'id') for value in args.get('id', [])]
+    if not 2 <= len(ids) <= MAX_COMPARED:
+        raise QueryError(f"compare takes 2 to {MAX_COMPARED} id parameters")
+    try:
+        positions = dataset.players.positions(ids)
+    except KeyError as e:
+        raise NotFound(f"Unknown player ids {e.args[0]}")
+    if args.get('percentiles', ['0'])[0] in ('1', 'true'):
+        values = dataset.percentiles.rows(positions)
+    else:
+        values = dataset.df[ATTRIBUTES].iloc[positions].to_numpy(dtype=float)
+    values = np.where(np.isnan(values), None, np.round(values.astype(float), 2)).tolist()
+    players = [{'player_id': player_id, 'label': dataset.players.label(player_id),
+                'values': dict(zip(ATTRIBUTES, row))} for player_id, row in zip(ids, values)]
+    return json.dumps({'attributes': ATTRIBUTES, 'players': players}, ensure_ascii=False)
+
+
+QUERIES = {
+    'search': query_search,
+    'top_valued': query_top_valued,
+    'undervalued': query_undervalued,
+    'best_by_position': query_best_by_position,
+    'compare': query_compare,
+}
+
+
+class DatasetHolder:
+    """The current PlayerDataset, swapped for a new one when the file on disk changes.
+
+    With `indexes`, the indexes the queries use are built before the new
+    version is handed out (the worker processes); without, only the version
+    and summary are needed (the server process).
+    """
+
+    def __init__(self, source, parquet_path, indexes=True):
+        self.source = source
+        self.parquet_path = parquet_path
+        self.indexes = indexes
+        self.dataset = None
+
+    def refresh(self):
+        dataset = load_players(self.source, self.parquet_path)
+        if dataset is not self.dataset:
+            if self.indexes:
+                for index in ('players', 'positions', 'percentiles', 'market', 'search_index'):
+                    getattr(dataset, index)
+                dataset.market.view('overall')
+            self.dataset = dataset
+            logger.info("Serving dataset %s: %s", dataset.version, dataset.summary())
+        return dataset
+
+
+# The worker process's dataset, set up by _init_worker
+_holder = None
+
+
+def _init_worker(source, parquet_path):
+    global _holder
+    _holder = DatasetHolder(source, parquet_path)
+    _holder.refresh()
+
+
+def _worker_version():
+    return _holder.dataset.version
+
+
+def run_query(name, version, args):
+    """Run QUERIES[name] in a worker, reloading first if the server has moved past its dataset."""
+    dataset = _holder.dataset
+    if dataset.version != version:
+        dataset = _holder.refresh()
+    return QUERIES[name](dataset, args)
+
+
+def query_pool(workers, source, parquet_path):
+    """Worker processes that load the dataset once each; started (and loaded) before returning."""
+    # spawned, not forked: the server process is already running its event loop
+    pool = ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn'),
+                               initializer=_init_worker, initargs=(source, parquet_path))
+    for future in [pool.submit(_worker_version) for _ in range(workers)]:
+        future.result()
+    return pool
+
+
+class JsonHandler(tornado.web.RequestHandler):
+    def initialize(self, holder, executor):
+        self.holder = holder
+        self.executor = executor
+
+    def set_default_headers(self):
+        self.set_header('Content-Type', 'application/json; charset=UTF-8')
+
+    def compute_etag(self):
+        # set explicitly in get() from the dataset version and the query, not from the body
+        return None
+
+    def write_error(self, status_code, **kwargs):
+        self.finish(json.dumps({'error': self._reason, 'status': status_code}))
+
+    def etag_for(self, dataset, name):
+        args = sorted((key, value.decode()) for key, values in self.request.query_arguments.items()
+                      for value in values)
+        digest = hashlib.sha1(f"{name}?{urlencode(args)}".encode()).hexdigest()[:16]
+        return f'"{dataset.version}-{digest}"'
+
+
+class QueryHandler(JsonHandler):
+    async def get(self, name):
+        query = QUERIES.get(name)
+        if query is None:
+            raise tornado.web.HTTPError(404, reason=f"Unknown query {name!r}")
+        dataset = self.holder.dataset
+        etag = self.etag_for(dataset, name)
+        self.set_header('Etag', etag)
+        self.set_header('Cache-Control', 'no-cache')
+        if self.check_etag_header():
+            self.set_status(304)
+            return
+        args = {key: [value.decode() for value in values] for key, values in self.request.query_arguments.items()}
+        try:
+            body = await IOLoop.current().run_in_executor(self.executor, run_query, name, dataset.version, args)
+        except QueryError as e:
+            raise tornado.web.HTTPError(e.status_code, reason=str(e)) from e
+        self.write(body)
+
+
+class VersionHandler(JsonHandler):
+    def get(self):
+        dataset = self.holder.dataset
+        self.write(json.dumps({'version': dataset.version, 'players': len(dataset.df),
+                               'queries': sorted(QUERIES), 'summary': dataset.summary()}))
+
+
+def make_app(holder, executor):
+    handlers = [
+        (r'/api/version', VersionHandler, dict(holder=holder, executor=executor)),
+        (r'/api/(\w+)', QueryHandler, dict(holder=holder, executor=executor)),
+    ]
+    return tornado.web.Application(handlers, compress_response=True)
+
+
+async def serve(port, workers, source, parquet_path):
+    holder = DatasetHolder(source, parquet_path, indexes=False)
+    await IOLoop.current().run_in_executor(None, holder.refresh)
+    executor = await IOLoop.current().run_in_executor(None, query_pool, workers, source, parquet_path)
+
+    reload_busy = False
+
+    async def reload():
+        nonlocal reload_busy
+        if reload_busy:
+            return
+        reload_busy = True
+        try:
+            await IOLoop.current().run_in_executor(None, holder.refresh)
+        except Exception:
+            logger.exception("Reloading the dataset failed, still serving %s", holder.dataset.version)
+        finally:
+            reload_busy = False
+
+    PeriodicCallback(reload, RELOAD_INTERVAL_MS).start()
+    make_app(holder, executor).listen(port)
+    logger.info("Listening on http://localhost:%d/api/", port)
+    await asyncio.Event().wait()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--port', type=int, default=8000)
+    parser.add_argument('--workers', type=int, default=4, help="processes running queries")
+    parser.add_argument('--source', default=SOURCE_PATH)
+    parser.add_argument('--parquet', default=PARQUET_PATH)
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s %(levelname)s %(message)s')
+    asyncio.run(serve(args.port, args.workers, args.source, args.parquet))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Benchmark the Dream Team auto-builder over a full player dataset.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_dream_team [--data fifa_data.pkl]
+
+For each budget it times `build_dream_team` (median of --repeat runs) and
+checks the result against two bounds: the search's own upper bound and the
+optimum with costs rounded down, which no team within the budget can beat.
+Exits non-zero if any run takes longer than --limit seconds.
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import pandas as pd
+
+from dream_team import build_dream_team
+from positions import PositionIndex
+
+BUDGETS = [5_000_000, 25_000_000, 100_000_000, 500_000_000]
+
+
+def load(path):
+    if path.endswith('.parquet'):
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--data', default='fifa_data.pkl', help="pickle or Parquet player dataset")
+    parser.add_argument('--cost', default='value_eur', choices=['value_eur', 'wage_eur'])
+    parser.add_argument('--budgets', type=lambda text: [float(b) for b in text.split(',')], default=BUDGETS,
+                        help="comma-separated budgets in EUR")
+    parser.add_argument('--repeat', type=int, default=3)
+    parser.add_argument('--limit', type=float, default=1.0, help="seconds allowed per build")
+    args = parser.parse_args(argv)
+
+    df = load(args.data)
+    group_masks = PositionIndex(df['player_positions']).group_masks
+    print(f"{len(df):,} players from {args.data}, budget on {args.cost}")
+    print(f"{'budget':>14} {'seconds':>8} {'score':>8} {'bound':>8} {'relaxed':>8} {'gap':>7}  cost")
+
+    failed = False
+    for budget in args.budgets:
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            team = build_dream_team(df, group_masks, budget, args.cost)
+            timings.append(time.perf_counter() - start)
+        seconds = statistics.median(timings)
+        if team is None:
+            print(f"{budget:>14,} {seconds:>8.3f}  no team fits")
+            continue
+        relaxed = build_dream_team(df, group_masks, budget, args.cost, round_costs='down')
+        upper = max(team.bound, relaxed.bound) if relaxed else team.bound
+        gap = (upper - team.score) / upper if upper else 0.0
+        assert team.cost <= budget and len(set(team.positions())) == 11
+        failed |= seconds > args.limit
+        print(f"{budget:>14,} {seconds:>8.3f} {team.score:>8.1f} {team.bound:>8.1f} "
+              f"{relaxed.bound if relaxed else float('nan'):>8.1f} {gap:>7.2%}  {team.cost:,.0f}")
+
+    if failed:
+        print(f"FAIL: a build took longer than {args.limit}s")
+        return 1
+    print(f"OK: every build under {args.limit}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,126 @@
+"""Benchmark the multi-condition player filter against a boolean scan.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_filters [--players 1000000] [--data fifa_data.pkl]
+
+Builds the filter indexes over a synthetic (or the given) player table,
+then times scout-style queries of six conditions each: uncached through
+`FilterIndex` (match plus sort) and as one boolean mask per condition over
+every row. Prints the median of --repeat runs and the index build time,
+checks that both give the same players in the same order, and exits
+non-zero if a filtered query takes longer than --limit seconds.
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from compaction import compact_players
+from player_filter import CATEGORY_COLUMNS, RANGE_COLUMNS, FilterIndex
+from player_index import ensure_player_id
+from positions import PositionIndex
+from synthetic_players import synthetic_players
+
+
+def load(path, players):
+    if path is None:
+        df = synthetic_players(players)
+    elif path.endswith('.parquet'):
+        df = pd.read_parquet(path)
+    else:
+        df = pd.read_pickle(path)
+    return ensure_player_id(compact_players(df.reset_index(drop=True)))
+
+
+def scout_queries(df):
+    """Named (ranges, categories, groups, sort_by) queries, six conditions each."""
+    leagues = df['league_name'].value_counts().index.tolist()
+    nations = df['nationality'].value_counts().index.tolist()
+    clubs = df['club_name'].value_counts().index.tolist()
+    return {
+        'young fast forwards': ((('age', 18, 23), ('pace', 80, None), ('dribbling', 75, None),
+                                 ('value_eur', None, 20_000_000)), (('league_name', tuple(leagues[:5])),),
+                                ('Forward',), 'potential'),
+        'cheap strong defenders': ((('age', None, 28), ('defending', 70, None), ('physic', 70, None),
+                                    ('wage_eur', None, 20_000)), (('nationality', tuple(nations[:3])),),
+                                   ('Defender',), 'overall'),
+        'broad midfield search': ((('age', 20, 32), ('overall', 60, None), ('value_eur', 1_000_000, 50_000_000),
+                                   ('passing', 50, None)), (('league_name', tuple(leagues[:10])),),
+                                  ('Midfielder',), 'value_eur'),
+        'one club': ((('overall', 50, None), ('age', 16, 40), ('potential', 50, None), ('wage_eur', None, 200_000)),
+                     (('club_name', tuple(clubs[100:102])), ('nationality', tuple(nations[:20]))), (), 'overall'),
+    }
+
+
+def scan(df, positions, ranges, categories, groups, sort_by):
+    """The same query as one boolean mask per condition over every row, then a sort."""
+    mask = np.ones(len(df), dtype=bool)
+    for column, low, high in ranges:
+        values = df[column].to_numpy()
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+    for column, values in categories:
+        mask &= df[column].isin(values).to_numpy()
+    if groups:
+        mask &= np.logical_or.reduce([positions.group_mask(group) for group in groups])
+    rows = np.flatnonzero(mask)
+    return rows[np.argsort(-df[sort_by].to_numpy(dtype=np.float64)[rows], kind='stable')]
+
+
+def median_seconds(fn, repeat):
+    fn()  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--players', type=int, default=1_000_000, help="synthetic players, without --data")
+    parser.add_argument('--data', help="pickle or Parquet player dataset")
+    parser.add_argument('--repeat', type=int, default=7)
+    parser.add_argument('--limit', type=float, default=0.02, help="seconds allowed per filtered query")
+    args = parser.parse_args(argv)
+
+    df = load(args.data, args.players)
+    positions = PositionIndex(df['player_positions'])
+    filters = FilterIndex(df, positions)
+    start = time.perf_counter()
+    for column in RANGE_COLUMNS:
+        filters.range_index(column)
+    for column in CATEGORY_COLUMNS:
+        filters.category_index(column)
+    print(f"{len(df):,} players, indexes built in {time.perf_counter() - start:.2f}s")
+    print(f"{'query':<24} {'matches':>8} {'index ms':>9} {'scan ms':>8} {'speedup':>8}  smallest condition")
+
+    failed = False
+    for name, (ranges, categories, groups, sort_by) in scout_queries(df).items():
+        # _query skips the result cache, so every run does the whole lookup
+        result = filters._query(ranges, categories, groups, sort_by, True)
+        expected = scan(df, positions, ranges, categories, groups, sort_by)
+        assert np.array_equal(result, expected), f"{name}: filter and scan disagree"
+        indexed = median_seconds(lambda: filters._query(ranges, categories, groups, sort_by, True), args.repeat)
+        scanned = median_seconds(lambda: scan(df, positions, ranges, categories, groups, sort_by), args.repeat)
+        smallest = filters.predicates(ranges, categories, groups)[0]
+        failed |= indexed > args.limit
+        print(f"{name:<24} {len(result):>8,} {indexed * 1000:>9.2f} {scanned * 1000:>8.2f} "
+              f"{scanned / indexed:>7.1f}x  {smallest.label[:40]} ({smallest.size:,})")
+
+    if failed:
+        print(f"FAIL: a filtered query took longer than {args.limit}s")
+        return 1
+    print(f"OK: every filtered query under {args.limit}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,73 @@
+"""Benchmark the compiled tree evaluator against XGBoost's own predict.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_income_predict [--model income_xgb_model.pkl]
+
+Scores random feature rows (5% missing) at each batch size with
+`model.predict` and with `CompiledTrees`, printing the median latency of
+each, and checks that the compiled probabilities match the model's.
+Exits non-zero if any batch differs by more than --tolerance.
+"""
+import argparse
+import statistics
+import sys
+import time
+
+import joblib
+import numpy as np
+
+from compiled_trees import CompiledTrees
+from income_pipeline import MODEL_PATH
+
+BATCH_SIZES = [1, 100, 100_000]
+
+
+def median_seconds(fn, X, repeat):
+    fn(X)  # warm up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(X)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--batches', type=lambda text: [int(b) for b in text.split(',')], default=BATCH_SIZES,
+                        help="comma-separated batch sizes")
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--tolerance', type=float, default=1e-5)
+    args = parser.parse_args(argv)
+
+    model = joblib.load(args.model)
+    start = time.perf_counter()
+    trees = CompiledTrees.from_model(model)
+    print(f"Compiled {len(trees.roots)} trees ({len(trees.feature):,} nodes, depth {trees.depth}) "
+          f"in {time.perf_counter() - start:.3f}s")
+    print(f"{'batch':>8} {'xgboost ms':>11} {'compiled ms':>12} {'speedup':>8} {'max diff':>10}")
+
+    rng = np.random.default_rng(0)
+    failed = False
+    for batch in args.batches:
+        X = rng.standard_normal((batch, trees.num_features)).astype(np.float32)
+        X[rng.random(X.shape) < 0.05] = np.nan
+        repeat = max(3, args.repeat if batch < 10_000 else args.repeat // 10)
+        xgb_seconds = median_seconds(model.predict, X, repeat)
+        compiled_seconds = median_seconds(trees.predict, X, repeat)
+        diff = np.abs(model.predict_proba(X)[:, 1] - trees.predict_proba(X)[:, 1]).max()
+        failed |= diff > args.tolerance
+        print(f"{batch:>8,} {xgb_seconds * 1000:>11.3f} {compiled_seconds * 1000:>12.3f} "
+              f"{xgb_seconds / compiled_seconds:>7.1f}x {diff:>10.2e}")
+
+    if failed:
+        print(f"FAIL: compiled probabilities differ by more than {args.tolerance}")
+        return 1
+    print(f"OK: compiled probabilities within {args.tolerance}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
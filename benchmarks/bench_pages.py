@@ -0,0 +1,284 @@
+"""Benchmark every Streamlit page headlessly against synthetic player datasets.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pages [--sizes 20000,200000,2000000] [--output bench_pages.json]
+    python -m benchmarks.bench_pages --compare baseline.json bench_pages.json
+
+Each app runs in a fresh process per dataset size, with its working
+directory holding a synthetic fifa_data.pkl (generated once into --workdir
+and reused). The dataset load is timed first, then every page is driven
+through streamlit.testing's AppTest: a first run plus the page's usual
+interactions. Per page the JSON records wall time, the slowest run, the
+number of script runs and peak RSS (the process high-water mark after the
+page). The income page uses a small model fitted on synthetic census rows,
+the goal page synthetic goal events.
+
+--compare (or --baseline while benchmarking) flags entries that got slower
+or bigger than the baseline by more than --threshold, and exits non-zero.
+"""
+import argparse
+import json
+import os
+import platform
+import resource
+import subprocess
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+from synthetic_players import synthetic_goals, write_dataset
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIZES = [20_000, 200_000, 2_000_000]
+
+# Goal events next to every synthetic player dataset (the workbook has about 1,500)
+GOAL_EVENTS = 20_000
+APPS = ['fifa.py', 'fifa01.py', 'income_model.py']
+
+# Regressions smaller than this many seconds are treated as timing noise
+MIN_SECONDS_DELTA = 0.05
+
+
+def prepare_income(workdir):
+    """Model and preprocessing fitted on synthetic census rows (the training data isn't in the repo)."""
+    import joblib
+    import xgboost as xgb
+    from income_pipeline import IncomePreprocessor, MODEL_PATH, PREPROCESSOR_PATH, occ_mapping, workclass_mapping
+
+    os.makedirs(workdir, exist_ok=True)
+    if os.path.exists(os.path.join(workdir, PREPROCESSOR_PATH)):
+        return
+    rng = np.random.default_rng(0)
+    n = 20_000
+    train = pd.DataFrame({
+        'age': rng.integers(17, 90, n), 'capital.gain': rng.integers(0, 10_000, n),
+        'capital.loss': rng.integers(0, 500, n), 'hours.per.week': rng.integers(5, 80, n),
+        'workclass': rng.choice(list(workclass_mapping), n), 'occupation': rng.choice(list(occ_mapping), n),
+        'relationship': rng.choice(['Not-in-family', 'Husband', 'Wife', 'Own-child', 'Unmarried', 'Other-relative'], n),
+    })
+    preprocessor = IncomePreprocessor.fit(train)
+    labels = (train['capital.gain'] + 40 * train['hours.per.week'] > 6000).astype(int)
+    model = xgb.XGBClassifier(n_estimators=100, max_depth=6).fit(preprocessor.transform(train), labels)
+    joblib.dump(model, os.path.join(workdir, MODEL_PATH))
+    preprocessor.save(os.path.join(workdir, PREPROCESSOR_PATH))
+
+
+def prepare_players(workdir, size):
+    path = os.path.join(workdir, 'fifa_data.pkl')
+    if not os.path.exists(path):
+        os.makedirs(workdir, exist_ok=True)
+        write_dataset(size, path)
+
+
+def prepare_goals(workdir, events=GOAL_EVENTS):
+    """The cleaned goal Parquet file the goal page loads, without a workbook next to it."""
+    from goal_data import PARQUET_PATH, clean_goals
+
+    path = os.path.join(workdir, PARQUET_PATH)
+    if not os.path.exists(path):
+        os.makedirs(workdir, exist_ok=True)
+        clean_goals(synthetic_goals(events)).to_parquet(path, index=False)
+
+
+def _button(at, label):
+    return next(button for button in at.button if button.label == label)
+
+
+def _first_ids(at, count):
+    from player_data import load_players
+    return load_players().players.ids[:count].tolist()
+
+
+# Interactions per page after its first run, each followed by a rerun
+SCENARIOS = {
+    'main': [lambda at: at],
+    'player_search': [lambda at: at.text_input[0].set_value("messi"),
+                      lambda at: at.text_input[0].set_value("kylian mbappe")],
+    'player_comparison': [lambda at: at.session_state.__setitem__('compare_selected', _first_ids(at, 5)),
+                          lambda at: _button(at, "Compare Players").click()],
+    'market_value': [lambda at: at.slider[0].set_value(30),
+                     lambda at: at.slider[1].set_value((20, 30))],
+    'best_players_position': [lambda at: at.selectbox[0].set_value("Forward"),
+                              lambda at: at.selectbox[0].set_value("Goalkeeper")],
+    'dream_team_creator': [lambda at: at.radio[0].set_value("Auto-build within a budget"),
+                           lambda at: _button(at, "Build Team").click(),
+                           lambda at: _button(at, "Visualize Dream Team").click()],
+    'similar_players': [lambda at: at.text_input[0].set_value("silva")],
+    'advanced_filter': [lambda at: at.slider[0].set_value((20, 25)),
+                        lambda at: at.multiselect[0].set_value(["Forward"]),
+                        lambda at: at.multiselect[1].set_value(at.multiselect[1].options[:3]),
+                        lambda at: _button(at, "Next").click()],
+    'goal_statistics': [lambda at: at.selectbox[0].set_value("Club"),
+                        lambda at: at.selectbox[1].set_value("Season"),
+                        lambda at: at.multiselect(key="goal_filter_Competition").set_value(
+                            at.multiselect(key="goal_filter_Competition").options[:2])],
+    'income_prediction': [lambda at: _button(at, "Predict").click(),
+                          lambda at: at.number_input[0].set_value(52),
+                          lambda at: _button(at, "Predict").click()],
+}
+
+APP_PAGES = {
+    'fifa.py': ['main', 'player_search', 'player_comparison', 'market_value', 'best_players_position',
+                'dream_team_creator', 'similar_players', 'advanced_filter', 'goal_statistics'],
+    'fifa01.py': ['main', 'player_search', 'player_comparison', 'market_value', 'best_players_position'],
+    'income_model.py': ['income_prediction'],
+}
+
+
+def _peak_rss_mb():
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # kilobytes on Linux
+
+
+def run_app(app, players, timeout):
+    """Benchmark every page of `app` in this process (cwd holds its data); returns result dicts."""
+    from streamlit.testing.v1 import AppTest
+
+    results = []
+    if players is not None:
+        from player_data import load_players
+        start = time.perf_counter()
+        dataset = load_players()
+        results.append({'app': app, 'page': 'load', 'players': players,
+                        'wall_seconds': time.perf_counter() - start, 'max_run_seconds': time.perf_counter() - start,
+                        'reruns': 0, 'peak_rss_mb': _peak_rss_mb(), 'dataset': dataset.summary()})
+
+    for page in APP_PAGES[app]:
+        at = AppTest.from_file(os.path.join(ROOT, app), default_timeout=timeout)
+        if app != 'income_model.py':
+            at.session_state['page'] = page
+        timings, errors = [], []
+        start = time.perf_counter()
+        for step in [None] + SCENARIOS[page]:
+            if step is not None:
+                step(at)
+            run_start = time.perf_counter()
+            at.run()
+            timings.append(time.perf_counter() - run_start)
+            errors += [exception.value for exception in at.exception]
+        results.append({'app': app, 'page': page, 'players': players,
+                        'wall_seconds': time.perf_counter() - start, 'max_run_seconds': max(timings),
+                        'reruns': len(timings), 'peak_rss_mb': _peak_rss_mb(), 'errors': errors})
+    return results
+
+
+def _worker(args):
+    os.chdir(args.worker_dir)
+    sys.path.insert(0, ROOT)
+    players = None if args.worker_players < 0 else args.worker_players
+    results = run_app(args.worker_app, players, args.timeout)
+    with open(args.worker_output, 'w') as f:
+        json.dump(results, f)
+
+
+def benchmark(apps, sizes, workdir, timeout):
+    results = []
+    for app in apps:
+        if app == 'income_model.py':
+            jobs = [(os.path.join(workdir, 'income'), -1)]
+            prepare_income(jobs[0][0])
+        else:
+            jobs = []
+            for size in sizes:
+                directory = os.path.join(workdir, f'players_{size}')
+                prepare_players(directory, size)
+                if 'goal_statistics' in APP_PAGES[app]:
+                    prepare_goals(directory)
+                jobs.append((directory, size))
+        for directory, size in jobs:
+            print(f"{app} {'' if size < 0 else f'{size:,} players'}...", file=sys.stderr)
+            output = os.path.join(directory, 'results.json')
+            subprocess.run([sys.executable, '-m', 'benchmarks.bench_pages', '--worker-app', app,
+                            '--worker-dir', directory, '--worker-players', str(size), '--worker-output', output,
+                            '--timeout', str(timeout)], cwd=ROOT, check=True, stdout=subprocess.DEVNULL)
+            with open(output) as f:
+                worker_results = json.load(f)
+            for result in worker_results:
+                results.append(result)
+                print(f"  {result['page']:<22} {result['wall_seconds']:>8.3f}s "
+                      f"(max run {result['max_run_seconds']:.3f}s, {result['reruns']} runs) "
+                      f"{result['peak_rss_mb']:>8.0f} MB"
+                      + (f"  ERRORS: {result['errors']}" if result.get('errors') else ''), file=sys.stderr)
+    return results
+
+
+def _key(result):
+    return result['app'], result['page'], result['players']
+
+
+def compare(baseline, current, threshold):
+    """Regression messages for entries slower or bigger than the baseline by more than `threshold`."""
+    previous = {_key(result): result for result in baseline['results']}
+    regressions = []
+    for result in current['results']:
+        before = previous.get(_key(result))
+        if before is None:
+            continue
+        name = f"{result['app']} {result['page']} ({result['players'] or '-'} players)"
+        for metric, minimum in [('wall_seconds', MIN_SECONDS_DELTA), ('max_run_seconds', MIN_SECONDS_DELTA),
+                                ('peak_rss_mb', 1.0)]:
+            old, new = before[metric], result[metric]
+            if new > old * (1 + threshold) and new - old > minimum:
+                regressions.append(f"{name}: {metric} {old:.3f} -> {new:.3f} (+{(new / old - 1):.0%})")
+        if result.get('errors') and not before.get('errors'):
+            regressions.append(f"{name}: new errors {result['errors']}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--apps', type=lambda text: text.split(','), default=APPS)
+    parser.add_argument('--sizes', type=lambda text: [int(s) for s in text.split(',')], default=SIZES,
+                        help="comma-separated player counts")
+    parser.add_argument('--workdir', default='bench_data', help="where synthetic datasets are kept")
+    parser.add_argument('--output', default='bench_pages.json')
+    parser.add_argument('--baseline', help="results JSON to compare this run against")
+    parser.add_argument('--compare', nargs=2, metavar=('BASELINE', 'CURRENT'),
+                        help="only compare two saved results files")
+    parser.add_argument('--threshold', type=float, default=0.25, help="allowed relative increase")
+    parser.add_argument('--timeout', type=float, default=600, help="seconds allowed per script run")
+    parser.add_argument('--worker-app', help=argparse.SUPPRESS)
+    parser.add_argument('--worker-dir', help=argparse.SUPPRESS)
+    parser.add_argument('--worker-players', type=int, help=argparse.SUPPRESS)
+    parser.add_argument('--worker-output', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker_app:
+        _worker(args)
+        return 0
+
+    if args.compare:
+        with open(args.compare[0]) as f:
+            baseline = json.load(f)
+        with open(args.compare[1]) as f:
+            current = json.load(f)
+    else:
+        sys.path.insert(0, ROOT)
+        current = {
+            'meta': {'python': platform.python_version(), 'platform': platform.platform(),
+                     'cpus': os.cpu_count(), 'time': time.strftime('%Y-%m-%dT%H:%M:%S')},
+            'results': benchmark(args.apps, args.sizes, os.path.abspath(args.workdir), args.timeout),
+        }
+        with open(args.output, 'w') as f:
+            json.dump(current, f, indent=2)
+        print(f"Wrote {args.output}", file=sys.stderr)
+        baseline = None
+        if args.baseline:
+            with open(args.baseline) as f:
+                baseline = json.load(f)
+
+    if baseline is None:
+        return 0
+    regressions = compare(baseline, current, args.threshold)
+    for message in regressions:
+        print(f"REGRESSION {message}")
+    if regressions:
+        return 1
+    print(f"OK: no regressions beyond {args.threshold:.0%}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
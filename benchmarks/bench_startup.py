@@ -0,0 +1,150 @@
+"""Cold-start report for the Streamlit apps: time to first paint and what gets imported.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup [--apps fifa.py] [--size 200000] [--repeat 3]
+
+Each run is a fresh `python -X importtime` process (the state a new server
+is in) that opens the app's main page through streamlit.testing's AppTest.
+Streamlit and AppTest are imported before timing starts, like the server
+has them; everything the script imports after that is listed, by top-level
+package, with its cumulative import time. First paint is when the main
+page finished drawing (the 'render' timer of metrics.py, or the end of the
+run for apps without one, like fifa01.py). Exits non-zero when the median first paint is
+over --budget, or when the main page imports a library it never uses.
+"""
+import argparse
+import collections
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+APPS = ['fifa.py']
+
+# Longest the main page may take to draw in a fresh process (seconds); an AppTest
+# run of a one-line script already takes about a third of it on one CPU
+PAINT_BUDGET_SECONDS = 0.75
+
+# Libraries no code on the main page uses; any of them in its first run fails the check
+UNUSED_ON_MAIN = ['matplotlib', 'duckdb', 'xgboost', 'sklearn']
+
+# Written to stderr by the worker once its own imports are done
+MARKER = "-- app imports --"
+
+
+def parse_importtime(lines):
+    """Cumulative microseconds per top-level package, from `-X importtime` lines.
+
+    Only imports requested directly (not nested under another import) are
+    counted, so every microsecond is attributed once.
+    """
+    packages = collections.Counter()
+    for line in lines:
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line.split('|', 2)
+        if name[1:2] == ' ':  # nested imports are indented under their importer
+            continue
+        packages[name.strip().split('.')[0]] += int(cumulative)
+    return packages
+
+
+def _worker(args):
+    os.chdir(args.worker_dir)
+    sys.path.insert(0, ROOT)
+    metrics_path = os.path.join(args.worker_dir, 'startup_metrics.jsonl')
+    if os.path.exists(metrics_path):
+        os.remove(metrics_path)
+    os.environ['FIFA_METRICS'] = f'jsonl:{metrics_path}'
+    from streamlit.testing.v1 import AppTest
+
+    print(MARKER, file=sys.stderr, flush=True)
+    at = AppTest.from_file(os.path.join(ROOT, args.worker_app), default_timeout=args.timeout)
+    start = time.time()
+    at.run()
+    run_seconds = time.time() - start
+
+    paint_seconds = run_seconds
+    if os.path.exists(metrics_path):
+        with open(metrics_path) as f:
+            for event in map(json.loads, f):
+                if event.get('operation') == 'render' and event.get('name') == 'main':
+                    paint_seconds = event['time'] - start
+                    break
+    print(json.dumps({'paint_seconds': paint_seconds, 'run_seconds': run_seconds,
+                      'errors': [str(exception.value) for exception in at.exception]}))
+
+
+def measure(app, workdir, timeout):
+    """One cold start of `app` in a fresh process: timings and imported packages."""
+    completed = subprocess.run([sys.executable, '-X', 'importtime', '-m', 'benchmarks.bench_startup',
+                                '--worker-app', app, '--worker-dir', workdir, '--timeout', str(timeout)],
+                               cwd=ROOT, check=True, capture_output=True, text=True)
+    stderr = completed.stderr.splitlines()
+    result = json.loads(completed.stdout.strip().splitlines()[-1])
+    result['imports'] = parse_importtime(stderr[stderr.index(MARKER) + 1:])
+    return result
+
+
+def report(app, results, top):
+    paint = statistics.median(result['paint_seconds'] for result in results)
+    run = statistics.median(result['run_seconds'] for result in results)
+    imports = results[-1]['imports']
+    print(f"{app}: first paint {paint * 1000:.0f} ms, first run {run * 1000:.0f} ms "
+          f"(median of {len(results)}), {sum(imports.values()) / 1000:.0f} ms importing")
+    for package, microseconds in imports.most_common(top):
+        print(f"  {package:<24} {microseconds / 1000:>8.1f} ms")
+    return paint
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--apps', type=lambda text: text.split(','), default=APPS)
+    parser.add_argument('--size', type=int, default=200_000, help="players in the synthetic dataset")
+    parser.add_argument('--workdir', default='bench_data', help="where synthetic datasets are kept")
+    parser.add_argument('--repeat', type=int, default=3, help="fresh processes per app")
+    parser.add_argument('--budget', type=float, default=PAINT_BUDGET_SECONDS, help="first paint budget (seconds)")
+    parser.add_argument('--top', type=int, default=10, help="packages listed per app")
+    parser.add_argument('--output', help="also write the results as JSON")
+    parser.add_argument('--timeout', type=float, default=600, help="seconds allowed per script run")
+    parser.add_argument('--worker-app', help=argparse.SUPPRESS)
+    parser.add_argument('--worker-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.worker_app:
+        _worker(args)
+        return 0
+
+    # only here: the workers must start without pandas, the apps import it themselves
+    from benchmarks.bench_pages import prepare_players
+
+    workdir = os.path.join(os.path.abspath(args.workdir), f'players_{args.size}')
+    prepare_players(workdir, args.size)
+    failures, output = [], {}
+    for app in args.apps:
+        results = [measure(app, workdir, args.timeout) for _ in range(args.repeat)]
+        output[app] = results
+        paint = report(app, results, args.top)
+        if paint > args.budget:
+            failures.append(f"{app}: first paint {paint:.3f}s is over the {args.budget:.3f}s budget")
+        unused = sorted(set(UNUSED_ON_MAIN) & set(results[-1]['imports']))
+        if unused:
+            failures.append(f"{app}: the main page imports {', '.join(unused)}")
+        errors = [error for result in results for error in result['errors']]
+        if errors:
+            failures.append(f"{app}: errors {errors}")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(output, f, indent=1)
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
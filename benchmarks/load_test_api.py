@@ -0,0 +1,122 @@
+"""Load-test the JSON API (api_server.py) and report latency percentiles and throughput.
+
+Start the server, then run from the repository root:
+
+    python api_server.py --port 8000 &
+    python -m benchmarks.load_test_api [--url http://localhost:8000] [--concurrency 32] [--requests 2000]
+
+Requests cycle through a mix of every query (names taken from the
+dataset's best players, so searches and comparisons hit real rows),
+gzip-accepted like a browser. With --revalidate, each request after the
+first per URL sends the ETag it got back, which measures the 304 path.
+Prints p50/p90/p99 latency and requests/sec per query and overall.
+"""
+import argparse
+import asyncio
+import collections
+import json
+import statistics
+import sys
+import time
+from urllib.parse import urlencode
+
+from tornado.httpclient import AsyncHTTPClient, HTTPClientError, HTTPRequest
+
+from positions import POSITION_GROUPS
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q / 100 * (len(ordered) - 1))))]
+
+
+async def fetch_json(client, url):
+    response = await client.fetch(url)
+    return json.loads(response.body)
+
+
+async def build_urls(client, base):
+    """A mix of query URLs built from the dataset the server holds."""
+    best = (await fetch_json(client, f"{base}/api/search?k=50"))['players']
+    leagues = sorted({player['league_name'] for player in best if player['league_name']})[:3]
+    urls = []
+    for i, player in enumerate(best):
+        name = player['short_name'].split()[-1]
+        urls.append(('search', f"{base}/api/search?{urlencode({'q': name, 'k': 20})}"))
+        other = best[(i + 1) % len(best)]['player_id']
+        urls.append(('compare', f"{base}/api/compare?id={player['player_id']}&id={other}&percentiles={i % 2}"))
+    for k in (10, 25, 50):
+        urls.append(('top_valued', f"{base}/api/top_valued?k={k}"))
+        urls.append(('top_valued', f"{base}/api/top_valued?k={k}&min_age=18&max_age=25"))
+        urls.append(('undervalued', f"{base}/api/undervalued?k={k}&max_value=20000000"))
+        for league in leagues:
+            urls.append(('undervalued', f"{base}/api/undervalued?{urlencode({'k': k, 'league': league})}"))
+        for group in POSITION_GROUPS:
+            urls.append(('best_by_position', f"{base}/api/best_by_position?{urlencode({'position': group, 'k': k})}"))
+    return urls
+
+
+async def run(base, concurrency, total, revalidate, timeout):
+    client = AsyncHTTPClient(max_clients=concurrency)
+    urls = await build_urls(client, base)
+    etags = {}
+    latencies = collections.defaultdict(list)
+    statuses = collections.Counter()
+    next_request = 0
+
+    async def worker():
+        nonlocal next_request
+        while next_request < total:
+            name, url = urls[next_request % len(urls)]
+            next_request += 1
+            headers = {'Accept-Encoding': 'gzip'}
+            if revalidate and url in etags:
+                headers['If-None-Match'] = etags[url]
+            request = HTTPRequest(url, headers=headers, decompress_response=True, request_timeout=timeout)
+            start = time.perf_counter()
+            try:
+                response = await client.fetch(request)
+                code = response.code
+                if 'Etag' in response.headers:
+                    etags[url] = response.headers['Etag']
+            except HTTPClientError as e:
+                code = e.code  # 304 is reported as an error by the client
+            latencies[name].append(time.perf_counter() - start)
+            statuses[code] += 1
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    client.close()
+    return latencies, statuses, elapsed
+
+
+def report(latencies, statuses, elapsed):
+    rows = sorted(latencies.items()) + [('all', [t for values in latencies.values() for t in values])]
+    print(f"{'query':<18} {'requests':>9} {'p50 ms':>8} {'p90 ms':>8} {'p99 ms':>8} {'mean ms':>8}")
+    for name, values in rows:
+        print(f"{name:<18} {len(values):>9} {percentile(values, 50) * 1000:>8.1f} "
+              f"{percentile(values, 90) * 1000:>8.1f} {percentile(values, 99) * 1000:>8.1f} "
+              f"{statistics.fmean(values) * 1000:>8.1f}")
+    total = len(rows[-1][1])
+    print(f"{total:,} requests in {elapsed:.2f}s: {total / elapsed:.0f} requests/sec, "
+          f"status codes {dict(sorted(statuses.items()))}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--url', default='http://localhost:8000')
+    parser.add_argument('--concurrency', type=int, default=32)
+    parser.add_argument('--requests', type=int, default=2000)
+    parser.add_argument('--revalidate', action='store_true', help="send If-None-Match with known ETags")
+    parser.add_argument('--timeout', type=float, default=60, help="seconds allowed per request")
+    args = parser.parse_args(argv)
+
+    latencies, statuses, elapsed = asyncio.run(run(args.url.rstrip('/'), args.concurrency, args.requests,
+                                                   args.revalidate, args.timeout))
+    report(latencies, statuses, elapsed)
+    return 0 if set(statuses) <= {200, 304} else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""Compact dtypes for the player table, and a report of what they save.
+
+    python compaction.py [fifa_data.pkl]
+
+prints the memory per row of the pickled table against the compacted one.
+"""
+import collections
+import sys
+
+import numpy as np
+import pandas as pd
+
+# Low-cardinality text, stored as categoricals (int8/int16 codes into one copy of each value)
+CATEGORY_COLUMNS = ['nationality', 'club_name', 'league_name', 'player_positions']
+
+# Name text: categoricals when values repeat, otherwise strings out of per-value Python objects
+STRING_COLUMNS = ['short_name', 'long_name']
+
+# Share of distinct values up to which a STRING_COLUMNS column is stored as a categorical
+STRING_CATEGORY_MAX_UNIQUE = 0.5
+
+# Integer columns by the smallest integer type each group is cast to; a column with
+# missing or fractional values becomes the group's float type instead
+NUMERIC_COLUMNS = {
+    'ratings': (['age', 'overall', 'potential', 'pace', 'shooting', 'passing', 'dribbling', 'defending',
+                 'physic'], np.int8, np.float32),
+    'money': (['value_eur', 'wage_eur'], np.int32, np.float64),
+    'ids': (['player_id', 'sofifa_id'], np.int32, np.float64),
+}
+
+INTEGER_TYPES = [np.int8, np.int16, np.int32, np.int64]
+
+ColumnMemory = collections.namedtuple('ColumnMemory', 'column before_dtype after_dtype before_bytes after_bytes')
+
+
+def downcast(series, smallest=np.int8, float_dtype=np.float32):
+    """`series` as the smallest integer type (from `smallest` up) that holds every value.
+
+    Missing or fractional values can't be stored as integers, those columns
+    become `float_dtype` instead. Non-numeric columns are returned as is.
+    """
+    if not pd.api.types.is_numeric_dtype(series) or pd.api.types.is_bool_dtype(series):
+        return series
+    values = series.to_numpy()
+    if values.dtype.kind == 'f' and not (np.isfinite(values).all() and (values == np.round(values)).all()):
+        return series.astype(float_dtype)
+    if not len(values):
+        return series.astype(smallest)
+    low, high = values.min(), values.max()
+    for dtype in INTEGER_TYPES[INTEGER_TYPES.index(smallest):]:
+        info = np.iinfo(dtype)
+        if info.min <= low and high <= info.max:
+            return series.astype(dtype)
+    return series
+
+
+def is_text(series):
+    """Object columns and pandas string columns (the default for text since pandas 3)."""
+    return pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series)
+
+
+def compact_players(df):
+    """Cast the player table to compact dtypes, in place. Returns `df`.
+
+    Every consumer reads numbers through `to_numpy(dtype=np.float64)` or
+    compares them, so the narrower integer types never overflow in use.
+    """
+    for column in CATEGORY_COLUMNS:
+        if column in df.columns:
+            values = df[column].astype('category')
+            # Parquet dictionaries come in first-seen order; sorted categories keep
+            # factorize(sort=True) and every picker built from them alphabetical
+            df[column] = values.cat.reorder_categories(values.cat.categories.sort_values())
+    for column in STRING_COLUMNS:
+        if column in df.columns and is_text(df[column]) and not isinstance(df[column].dtype, pd.CategoricalDtype):
+            if df[column].nunique() <= STRING_CATEGORY_MAX_UNIQUE * len(df):
+                df[column] = df[column].astype('category')
+            else:
+                df[column] = df[column].astype('string[pyarrow]')
+    for columns, smallest, float_dtype in NUMERIC_COLUMNS.values():
+        for column in columns:
+            if column in df.columns:
+                df[column] = downcast(df[column], smallest, float_dtype)
+    return df
+
+
+def column_memory(before, after):
+    """Deep memory use of every column of `after` before and after compaction."""
+    before_bytes = before.memory_usage(deep=True, index=False)
+    after_bytes = after.memory_usage(deep=True, index=False)
+    return [ColumnMemory(column, str(before[column].dtype) if column in before else '-', str(after[column].dtype),
+                         int(before_bytes.get(column, 0)), int(after_bytes[column]))
+            for column in after.columns]
+
+
+def memory_report(before, after):
+    """A table of bytes per row per column, before and after, with the totals."""
+    rows = max(len(after), 1)
+    columns = column_memory(before, after)
+    lines = [f"{'column':<18} {'before':>14} {'after':>14} {'B/row':>8} {'B/row':>8}"]
+    for entry in columns:
+        lines.append(f"{entry.column:<18} {entry.before_dtype:>14} {entry.after_dtype:>14} "
+                     f"{entry.before_bytes / rows:>8.1f} {entry.after_bytes / rows:>8.1f}")
+    before_total = sum(entry.before_bytes for entry in columns)
+    after_total = sum(entry.after_bytes for entry in columns)
+    lines.append(f"{'total':<48} {before_total / rows:>8.1f} {after_total / rows:>8.1f}")
+    lines.append(f"{len(after):,} rows: {before_total / 1e6:.1f} MB -> {after_total / 1e6:.1f} MB "
+                 f"({before_total / max(after_total, 1):.1f}x smaller)")
+    return '\n'.join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    source = argv[0] if argv else 'fifa_data.pkl'
+    before = pd.read_pickle(source)
+    after = compact_players(before.copy())
+    print(memory_report(before, after))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,141 @@
+import json
+
+import numpy as np
+
+# Rows evaluated at once, bounds the (rows x trees) temporaries of a prediction
+BLOCK_ROWS = 4096
+
+# Objectives whose margin goes through a sigmoid, the rest predict the margin itself
+LOGISTIC_OBJECTIVES = ('binary:logistic', 'reg:logistic')
+IDENTITY_OBJECTIVES = ('reg:squarederror', 'reg:linear', 'reg:absoluteerror', 'reg:pseudohubererror')
+
+
+def _parse_float(text):
+    # newer XGBoost writes per-target vectors like '[5.00449E-1]'
+    return float(str(text).strip('[]').split(',')[0])
+
+
+class CompiledTrees:
+    """An XGBoost tree ensemble flattened into NumPy arrays.
+
+    All trees share one set of node arrays (split feature, threshold,
+    children, default direction for missing values, leaf value); leaves
+    point to themselves, so every row descends every tree in lock-step for
+    `depth` steps and no per-row branching is needed. Predicting a few rows
+    this way skips the DMatrix construction and library call overhead of
+    `model.predict`.
+    """
+
+    def __init__(self, feature, threshold, left, right, default_left, value, roots, depth,
+                 base_margin, objective, num_features):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        # right then left child of every node, indexed by 2 * node + go_left
+        self.children = np.column_stack([right, left]).ravel()
+        self.default_left = default_left
+        self.value = value
+        self.roots = roots
+        self.depth = depth
+        self.base_margin = base_margin
+        self.objective = objective
+        self.num_features = num_features
+
+    @classmethod
+    def from_model(cls, model):
+        """Compile an XGBoost sklearn model or Booster; ValueError if it can't be compiled."""
+        booster = model.get_booster() if hasattr(model, 'get_booster') else model
+        learner = json.loads(booster.save_raw('json'))['learner']
+        objective = learner['objective']['name']
+        params = learner['learner_model_param']
+        if learner['gradient_booster']['name'] != 'gbtree':
+            raise ValueError(f"Only gbtree models can be compiled, not {learner['gradient_booster']['name']}")
+        if objective not in LOGISTIC_OBJECTIVES + IDENTITY_OBJECTIVES:
+            raise ValueError(f"Unsupported objective {objective}")
+        if int(params.get('num_class', 0)) > 1 or int(params.get('num_target', 1)) > 1:
+            raise ValueError("Only single-output models can be compiled")
+
+        model_json = learner['gradient_booster']['model']
+        trees = model_json['trees']
+        best_iteration = booster.attr('best_iteration')
+        if best_iteration is not None:
+            # predict() stops at the best iteration of early stopping as well
+            indptr = model_json.get('iteration_indptr')
+            trees = trees[:indptr[int(best_iteration) + 1] if indptr else int(best_iteration) + 1]
+
+        base_score = _parse_float(params['base_score'])
+        if objective in LOGISTIC_OBJECTIVES:
+            base_margin = float(np.log(base_score / (1.0 - base_score)))
+        else:
+            base_margin = base_score
+
+        features, thresholds, lefts, rights, defaults, values, roots, depth = [], [], [], [], [], [], [], 0
+        offset = 0
+        for tree in trees:
+            if any(tree.get('split_type', [])):
+                raise ValueError("Categorical splits can't be compiled")
+            left = np.asarray(tree['left_children'], dtype=np.int64)
+            right = np.asarray(tree['right_children'], dtype=np.int64)
+            condition = np.asarray(tree['split_conditions'], dtype=np.float32)
+            nodes = np.arange(len(left))
+            leaf = left == -1
+            features.append(np.where(leaf, 0, tree['split_indices']))
+            thresholds.append(np.where(leaf, 0, condition))
+            lefts.append(np.where(leaf, nodes, left) + offset)
+            rights.append(np.where(leaf, nodes, right) + offset)
+            defaults.append(np.asarray(tree['default_left'], dtype=bool))
+            values.append(np.where(leaf, condition, 0))
+            roots.append(offset)
+            depth = max(depth, _tree_depth(left, right))
+            offset += len(left)
+
+        return cls(np.concatenate(features).astype(np.int32), np.concatenate(thresholds).astype(np.float32),
+                   np.concatenate(lefts).astype(np.int32), np.concatenate(rights).astype(np.int32),
+                   np.concatenate(defaults), np.concatenate(values).astype(np.float64),
+                   np.asarray(roots, dtype=np.int32), depth, base_margin, objective,
+                   int(params['num_feature']))
+
+    def margin(self, X):
+        """Raw ensemble output (before the sigmoid) per row."""
+        X = np.asarray(X, dtype=np.float32)  # XGBoost compares features as float32 as well
+        if X.ndim != 2 or X.shape[1] != self.num_features:
+            raise ValueError(f"Expected {self.num_features} features, got shape {X.shape}")
+        out = np.empty(len(X), dtype=np.float64)
+        for start in range(0, len(X), BLOCK_ROWS):
+            block = np.ascontiguousarray(X[start:start + BLOCK_ROWS])
+            flat = block.ravel()
+            row_start = (np.arange(len(block), dtype=np.int32) * self.num_features)[:, None]
+            missing = np.isnan(flat).any()
+            node = np.broadcast_to(self.roots, (len(block), len(self.roots)))
+            for _ in range(self.depth):
+                x = flat[row_start + self.feature[node]]
+                go_left = x < self.threshold[node]  # False for NaN
+                if missing:
+                    go_left |= np.isnan(x) & self.default_left[node]
+                node = self.children[2 * node + go_left]
+            out[start:start + len(block)] = self.value[node].sum(axis=1) + self.base_margin
+        return out
+
+    def predict_proba(self, X):
+        """Probability of the positive class, shape (rows, 2) like the sklearn classifier."""
+        p = 1.0 / (1.0 + np.exp(-self.margin(X)))
+        return np.column_stack([1.0 - p, p])
+
+    def predict(self, X):
+        """Class labels for logistic objectives, predicted values otherwise."""
+        margin = self.margin(X)
+        if self.objective in LOGISTIC_OBJECTIVES:
+            return (margin > 0).astype(np.int64)
+        return margin
+
+
+def _tree_depth(left, right):
+    """Number of splits on the longest root-to-leaf path."""
+    depth, level = 0, np.array([0])
+    while True:
+        level = np.concatenate([left[level], right[level]])
+        level = level[level >= 0]
+        if not len(level):
+            return depth
+        depth += 1
@@ -0,0 +1,346 @@
+import heapq
+
+import numpy as np
+
+# Players per position group in the dream team (4-3-3)
+FORMATION = {
+    "Goalkeeper": 1,
+    "Defender": 4,
+    "Midfielder": 3,
+    "Forward": 3,
+}
+
+# Budget resolution of the knapsack: costs are rounded to budget / BUDGET_STEPS
+BUDGET_STEPS = 2048
+
+# Finer resolution tried when costs rounded up leave no team but one may fit
+FINE_BUDGET_STEPS = 16 * BUDGET_STEPS
+
+# Branch-and-bound nodes explored at most when players are picked for two groups at once
+MAX_BRANCHES = 24
+
+# Candidates compared pairwise at a time when pruning dominated players
+PRUNE_BLOCK = 512
+
+
+class DreamTeam:
+    """An optimized XI: row positions per position group plus its totals.
+
+    `bound` is an upper bound on the score of any team within the budget;
+    it equals `score` when the search proved the team optimal.
+    """
+
+    def __init__(self, players, score, cost, bound):
+        self.players = players
+        self.score = score
+        self.cost = cost
+        self.bound = bound
+
+    def positions(self):
+        return [pos for group in self.players.values() for pos in group]
+
+
+def team_score(df, weights):
+    """Objective per player: a weighted sum of attribute columns."""
+    score = np.zeros(len(df), dtype=np.float64)
+    for column, weight in weights.items():
+        score += weight * df[column].to_numpy(dtype=np.float64)
+    return score
+
+
+def _prefilter_dominated(candidates, score, cost, depth, dominators, levels=64):
+    """Cheap first pass of `prune_dominated` over score buckets, without sorting players.
+
+    A player is dropped when the strictly better buckets already hold
+    `depth` possible dominators no more expensive than them.
+    """
+    s, c = score[candidates], cost[candidates]
+    lo, hi = s.min(), s.max()
+    if hi == lo:
+        return candidates
+    bucket = ((hi - s) / (hi - lo) * (levels - 1)).astype(np.int16)  # 0 holds the best scores
+    order = np.argsort(bucket, kind='stable')
+    bounds = np.searchsorted(bucket[order], np.arange(levels + 1))
+
+    threshold = np.full(levels, np.inf)
+    cheapest = np.empty(0)
+    for b in range(levels):
+        if len(cheapest) == depth:
+            threshold[b] = cheapest[-1]
+        in_bucket = order[bounds[b]:bounds[b + 1]]
+        costs = c[in_bucket[dominators[candidates[in_bucket]]]]
+        if len(costs) > depth:
+            costs = np.partition(costs, depth)[:depth]
+        cheapest = np.sort(np.concatenate([cheapest, costs]))[:depth]
+    return candidates[c < threshold[bucket]]
+
+
+def prune_dominated(candidates, score, cost, depth, dominators=None):
+    """Drop candidates that at least `depth` others match on score at no higher cost.
+
+    Such a player never needs to be in an optimal team that has room for
+    fewer than `depth` of those dominating players elsewhere: one of them is
+    always free to take their place. `dominators` (a boolean mask over rows)
+    limits which players count as dominating.
+    Walks candidates best score first in blocks, keeping the `depth`
+    cheapest dominator costs seen so far; within a block, players are
+    compared pairwise.
+    """
+    if dominators is None:
+        dominators = np.ones(len(score), dtype=bool)
+    if len(candidates) > PRUNE_BLOCK:
+        candidates = _prefilter_dominated(candidates, score, cost, depth, dominators)
+    order = candidates[np.lexsort((cost[candidates], -score[candidates]))]
+    cheapest = np.empty(0)  # sorted, the `depth` smallest dominator costs so far
+    kept = []
+    for start in range(0, len(order), PRUNE_BLOCK):
+        block = order[start:start + PRUNE_BLOCK]
+        if len(cheapest) == depth:
+            block = block[cost[block] < cheapest[-1]]
+        if not len(block):
+            continue
+        c = cost[block]
+        counts = dominators[block]
+        # [i, j]: dominator j comes before player i in the block and costs no more
+        earlier = (c[None, :] <= c[:, None]) & np.tri(len(c), k=-1, dtype=bool) & counts[None, :]
+        dominated = np.searchsorted(cheapest, c, side='right') + earlier.sum(axis=1)
+        kept.append(block[dominated < depth])
+        cheapest = np.sort(np.concatenate([cheapest, c[counts]]))[:depth]
+    return np.concatenate(kept) if kept else np.empty(0, dtype=np.int64)
+
+
+def _best_group(candidates, score, steps, size, budget_steps):
+    """Exact knapsack for one group: best `size` players per budget (in steps)."""
+    width = budget_steps + 1
+    best = np.full((size + 1, width), -np.inf)
+    best[0] = 0.0
+    taken = np.zeros((len(candidates), size, width), dtype=bool)
+    for i, pos in enumerate(candidates):
+        w, s = steps[pos], score[pos]
+        if w > budget_steps:
+            continue
+        # every count at once, from the values before this player (0/1 knapsack)
+        option = best[:-1, :width - w] + s
+        better = option > best[1:, w:]
+        best[1:, w:] = np.where(better, option, best[1:, w:])
+        taken[i, :, w:] = better
+
+    def pick(budget):
+        chosen, count = [], size
+        for i in range(len(candidates) - 1, -1, -1):
+            if count and taken[i, count - 1, budget]:
+                chosen.append(candidates[i])
+                budget -= steps[candidates[i]]
+                count -= 1
+        return chosen[::-1]
+
+    return best[size], pick
+
+
+def _breakpoints(curve):
+    """Budgets at which a non-decreasing 'best within budget' curve improves."""
+    previous = np.concatenate([[-np.inf], curve[:-1]])
+    return np.flatnonzero(curve > previous)
+
+
+def _combine(left, right):
+    """Max-plus convolution of two 'best score within budget' curves.
+
+    Returns the combined curve and, per budget, the share given to `left`.
+    Only budgets where one curve improves can be part of a best split, so
+    the loop runs over the breakpoints of the sparser curve.
+    """
+    width = len(left)
+    combined = np.full(width, -np.inf)
+    split = np.zeros(width, dtype=np.int64)
+    left_points, right_points = _breakpoints(left), _breakpoints(right)
+    if len(left_points) <= len(right_points):
+        for w in left_points:
+            option = left[w] + right[:width - w]
+            better = option > combined[w:]
+            combined[w:][better] = option[better]
+            split[w:][better] = w
+    else:
+        budgets = np.arange(width)
+        for w in right_points:
+            option = right[w] + left[:width - w]
+            better = option > combined[w:]
+            combined[w:][better] = option[better]
+            split[w:][better] = budgets[:width - w][better]
+    return combined, split
+
+
+class _GroupSolver:
+    """Per-group knapsack solutions, cached by the set of players excluded from the group."""
+
+    def __init__(self, score, steps, group_candidates, formation, budget_steps):
+        self.score, self.steps = score, steps
+        self.group_candidates = group_candidates
+        self.formation = formation
+        self.budget_steps = budget_steps
+        self._cache = {}
+
+    def group(self, group, excluded):
+        key = (group, excluded)
+        if key not in self._cache:
+            candidates = self.group_candidates[group]
+            if excluded:
+                candidates = candidates[~np.isin(candidates, list(excluded))]
+            self._cache[key] = _best_group(candidates, self.score, self.steps,
+                                           self.formation[group], self.budget_steps)
+        return self._cache[key]
+
+    def solve(self, excluded):
+        """Best team (possibly reusing a player across groups) given per-group exclusions."""
+        keys = [excluded.get(group, frozenset()) for group in self.formation]
+        solutions = [self.group(group, key) for group, key in zip(self.formation, keys)]
+        total, splits = solutions[0][0], []
+        for i, (curve, _) in enumerate(solutions[1:], start=2):
+            # combined curves of the first i groups are shared by branches that only differ later
+            prefix = ('combined',) + tuple(keys[:i])
+            if prefix not in self._cache:
+                self._cache[prefix] = _combine(total, curve)
+            total, split = self._cache[prefix]
+            splits.append(split)
+        if total[self.budget_steps] == -np.inf:
+            return None
+
+        # walk the splits back to each group's share of the budget
+        budgets, w = [], self.budget_steps
+        for split in reversed(splits):
+            budgets.append(w - split[w])
+            w = split[w]
+        budgets.append(w)
+        budgets.reverse()
+        players = {group: pick(b) for group, (_, pick), b in zip(self.formation, solutions, budgets)}
+        return total[self.budget_steps], players
+
+
+def _shared_player(players):
+    """A player picked for two groups at once, as (position, group, group), or None."""
+    seen = {}
+    for group, positions in players.items():
+        for pos in positions:
+            if pos in seen:
+                return pos, seen[pos], group
+            seen[pos] = group
+    return None
+
+
+def _branches(solver, excluded, shared):
+    """Solutions with the shared player excluded from one group or the other."""
+    pos, *groups = shared
+    for group_out in groups:
+        branch = dict(excluded)
+        branch[group_out] = branch.get(group_out, frozenset()) | {pos}
+        option = solver.solve(branch)
+        if option is not None:
+            yield option[0], branch, option[1]
+
+
+def _solve_distinct(solver):
+    """Branch and bound over players picked for two groups at once.
+
+    Excluding a player from a group can only lower the team score. A greedy
+    dive (always keeping the better branch) gives a first valid team, then
+    nodes are explored best-first (deepest first among equal scores) and
+    pruned against it; the first node without a shared player is optimal.
+    After MAX_BRANCHES nodes the best valid team so far is returned.
+    Returns (players, upper bound on the score of any valid team).
+    """
+    root = solver.solve({})
+    if root is None:
+        return None, -np.inf
+
+    incumbent = None
+    score, excluded, players = root[0], {}, root[1]
+    while True:
+        shared = _shared_player(players)
+        if shared is None:
+            incumbent = (score, players)
+            break
+        options = list(_branches(solver, excluded, shared))
+        if not options:
+            break
+        score, excluded, players = max(options, key=lambda option: option[0])
+
+    queue, nodes = [(-root[0], 0, 0, {}, root[1])], 0
+    while queue:
+        bound, depth, _, excluded, players = queue[0]
+        if incumbent is not None and -bound <= incumbent[0]:
+            return incumbent[1], incumbent[0]
+        if nodes >= MAX_BRANCHES:
+            break
+        heapq.heappop(queue)
+        shared = _shared_player(players)
+        if shared is None:
+            return players, -bound
+        for score, branch, option in _branches(solver, excluded, shared):
+            if incumbent is None or score > incumbent[0]:
+                nodes += 1
+                heapq.heappush(queue, (-score, depth - 1, nodes, branch, option))
+    best_bound = -queue[0][0] if queue else -np.inf
+    if incumbent is None:
+        return None, best_bound
+    return incumbent[1], max(best_bound, incumbent[0])
+
+
+def _search(score, cost, group_candidates, budget, formation, budget_steps, round_costs):
+    """Best distinct team with costs rounded `round_costs` to budget / `budget_steps`, or None."""
+    unit = budget / budget_steps if budget > 0 else 1.0
+    rounded = np.ceil(cost / unit) if round_costs == 'up' else np.floor(cost / unit)
+    steps = np.nan_to_num(rounded, nan=budget_steps + 1).astype(np.int64)
+    players, bound = _solve_distinct(_GroupSolver(score, steps, group_candidates, formation, budget_steps))
+    if players is None:
+        return None
+    positions = [pos for group in players.values() for pos in group]
+    return DreamTeam(players, float(score[positions].sum()), float(cost[positions].sum()), float(bound))
+
+
+def build_dream_team(df, group_masks, budget, cost_column='value_eur', weights=None,
+                     formation=FORMATION, budget_steps=BUDGET_STEPS, round_costs='up'):
+    """Best XI for `formation` with total `cost_column` within `budget`.
+
+    Maximizes the weighted attribute sum `weights` (default: `overall`).
+    Dominated players are pruned per group, then each group is solved
+    exactly over costs rounded to budget / `budget_steps` and the groups are
+    combined. Costs are rounded up, so the team always fits the budget, but
+    rounding can cost the best team (or every team). The search is then
+    checked against the one with costs rounded down, which no team within
+    the budget can beat: its team is taken when it really fits and scores
+    more, and its bound becomes `DreamTeam.bound`. If neither fits, costs
+    rounded up at FINE_BUDGET_STEPS are tried last. `round_costs='down'`
+    returns the rounded-down search alone. Returns None if no team fits.
+    """
+    weights = weights or {'overall': 1.0}
+    score = team_score(df, weights)
+    cost = df[cost_column].to_numpy(dtype=np.float64)
+
+    usable = np.isfinite(score) & np.isfinite(cost) & (cost <= budget)
+    # A dominated player can go when one of their dominators is always free to swap in:
+    # with `team_size` dominators one is always outside the team, and dominators who
+    # only fit this group can only be kept out by the group's own slots.
+    team_size = sum(formation.values())
+    eligible = sum(group_masks[group].astype(np.int8) for group in formation)
+    group_candidates = {}
+    for group, size in formation.items():
+        candidates = np.flatnonzero(group_masks[group] & usable)
+        candidates = prune_dominated(candidates, score, cost, size, group_masks[group] & (eligible == 1))
+        group_candidates[group] = prune_dominated(candidates, score, cost, team_size)
+
+    def search(steps, rounding):
+        return _search(score, cost, group_candidates, budget, formation, steps, rounding)
+
+    team = search(budget_steps, round_costs)
+    if round_costs != 'up':
+        return team
+    relaxed = search(budget_steps, 'down')
+    if relaxed is None:
+        return None
+    if relaxed.cost <= budget and (team is None or relaxed.score > team.score):
+        team = relaxed
+    if team is None and budget_steps < FINE_BUDGET_STEPS:
+        team = search(FINE_BUDGET_STEPS, 'up')
+    if team is not None:
+        team.bound = max(relaxed.bound, team.score)
+    return team
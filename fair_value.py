@@ -0,0 +1,55 @@
+import numpy as np
+
+from positions import GROUP_NAMES
+
+
+class FairValueModel:
+    """Linear model of log market value on rating, age and position group.
+
+    Fitted with one least-squares solve over all players with a known value.
+    A player's undervaluation score is log(fair value) - log(actual value),
+    so 0.69 means the model prices them at about twice their market value.
+    """
+
+    def __init__(self, coef):
+        self.coef = coef
+
+    @staticmethod
+    def design_matrix(df, primary_group):
+        overall = df['overall'].to_numpy(dtype=np.float64)
+        potential = df['potential'].to_numpy(dtype=np.float64)
+        age = df['age'].to_numpy(dtype=np.float64)
+        columns = [np.ones_like(overall), overall, potential, age, age ** 2, (potential - overall) * age]
+        # one-hot position groups, the first group is the baseline
+        columns += [(primary_group == i).astype(np.float64) for i in range(1, len(GROUP_NAMES))]
+        return np.column_stack(columns)
+
+    @classmethod
+    def fit(cls, df, primary_group):
+        X = cls.design_matrix(df, primary_group)
+        value = df['value_eur'].to_numpy(dtype=np.float64)
+        known = (value > 0) & np.isfinite(X).all(axis=1)
+        coef, *_ = np.linalg.lstsq(X[known], np.log(value[known]), rcond=None)
+        return cls(coef)
+
+    def predict(self, df, primary_group):
+        """Fair value in EUR for every row of `df`."""
+        return np.exp(self.design_matrix(df, primary_group) @ self.coef)
+
+    def undervaluation(self, df, primary_group):
+        fair = self.predict(df, primary_group)
+        value = df['value_eur'].to_numpy(dtype=np.float64)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            score = np.log(fair) - np.log(value)
+        # players without a market value have no meaningful score
+        score[~(value > 0)] = np.nan
+        return fair, score
+
+
+def add_fair_value(df, primary_group):
+    """Fit the model on `df` and store `fair_value_eur` and `undervaluation` columns."""
+    model = FairValueModel.fit(df, primary_group)
+    fair, score = model.undervaluation(df, primary_group)
+    df['fair_value_eur'] = np.round(fair)
+    df['undervaluation'] = score
+    return model
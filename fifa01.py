@@ -1,10 +1,10 @@
 import streamlit as st
-import pandas as pd
-import matplotlib.pyplot as plt
-import plotly.graph_objects as go
 
-# Load your cleaned and refined dataset
-df = pd.read_pickle("fifa_data.pkl")  # Replace with your .pkl file path
+# Number of suggestions shown on the Player Search page
+SEARCH_RESULTS = 50
+
+# Most players shown together on the Player Comparison radar
+MAX_COMPARED = 10
 
 # Initialize the session state for page navigation
 if 'page' not in st.session_state:
@@ -14,6 +14,15 @@ if 'page' not in st.session_state:
 def goto_feature(feature):
     st.session_state.page = feature.lower().replace(" ", "_")  # Navigate to the selected feature
 
+# Load your cleaned and refined dataset (shared by every session, read once per process, and
+# only by the pages that show players, so the main page never reads it; those pages caption
+# the sidebar with its summary)
+def players():
+    from player_data import load_players
+    dataset = load_players()
+    st.sidebar.caption(f"Dataset: {dataset.summary()}")
+    return dataset, dataset.df
+
 # Main Page
 if st.session_state.page == "main":
     # Set the title and description
@@ -48,22 +57,24 @@ if st.session_state.page == "main":
 # Player Search Page
 elif st.session_state.page == "player_search":
     st.title("Player Search")
+    dataset, df = players()
     search_query = st.text_input("Enter the player name:")
 
     if search_query:
-        # Filter the DataFrame based on the search query (partial matching)
-        filtered_df = df[df['short_name'].str.contains(search_query, case=False)]
+        # Look up the best matches in the search index (accent-insensitive, ranked)
+        filtered_df = df.iloc[dataset.search_index.search(search_query, k=SEARCH_RESULTS)]
 
         if not filtered_df.empty:
             st.write(f"### Results for '{search_query}':")
 
             # Dropdown menu for selecting a player
-            player_names = filtered_df['short_name'].tolist()
-            selected_player = st.selectbox("Select a player from the suggestions:", player_names)
+            player_ids = filtered_df['player_id'].tolist()
+            selected_player = st.selectbox("Select a player from the suggestions:", player_ids,
+                                           format_func=dataset.players.label)
 
             # Display player details for the selected player
-            if selected_player:
-                player_info = filtered_df[filtered_df['short_name'] == selected_player].iloc[0]
+            if selected_player is not None:
+                player_info = dataset.players.row(selected_player)
                 st.markdown(f"**{player_info['short_name']}**")
                 st.write(f"**Name:** {player_info['short_name']}")
                 st.write(f"**Full Name:** {player_info['long_name']}")
@@ -91,40 +102,44 @@ elif st.session_state.page == "player_search":
 
 # Player Comparison Page
 elif st.session_state.page == "player_comparison":
-    st.title("Player Comparison")
-
-    # Dropdown for selecting players
-    player1 = st.selectbox("Select Player 1", df['short_name'].tolist())
-    player2 = st.selectbox("Select Player 2", df['short_name'].tolist())
+    import plotly.graph_objects as go
+    from player_picker import pick_players
+    from similarity import ATTRIBUTES
 
-    if st.button("Compare Players"):
-        # Get the data for the selected players
-        player1_data = df[df['short_name'] == player1].iloc[0]
-        player2_data = df[df['short_name'] == player2].iloc[0]
-
-        categories = ['overall', 'potential', 'pace', 'shooting', 'passing', 'dribbling', 'defending', 'physic']
+    st.title("Player Comparison")
+    dataset, df = players()
+
+    # Searchable picker for selecting up to MAX_COMPARED players (matches are looked up server-side)
+    compared = pick_players(f"Players to compare (up to {MAX_COMPARED})", dataset, key="compare",
+                            max_selections=MAX_COMPARED)
+    as_percentiles = st.toggle("Show attributes as percentiles within each player's position group")
+
+    if st.button("Compare Players", disabled=len(compared) < 2):
+        # Get the data for the selected players (O(1) row gather by id)
+        positions = dataset.players.positions(compared)
+        categories = ATTRIBUTES
+        if as_percentiles:
+            values = dataset.percentiles.rows(positions)
+        else:
+            values = df[categories].iloc[positions].to_numpy(dtype=float)
 
         # Create radar chart
         fig = go.Figure()
 
-        fig.add_trace(go.Scatterpolar(
-            r=player1_data[categories].values.tolist(),
-            theta=categories,
-            fill='toself',
-            name=player1_data['short_name']
-        ))
-        fig.add_trace(go.Scatterpolar(
-            r=player2_data[categories].values.tolist(),
-            theta=categories,
-            fill='toself',
-            name=player2_data['short_name']
-        ))
+        for player_id, player_values in zip(compared, values):
+            fig.add_trace(go.Scatterpolar(
+                r=player_values.tolist(),
+                theta=categories,
+                fill='toself',
+                name=dataset.players.label(player_id)
+            ))
 
         fig.update_layout(
             polar=dict(
                 radialaxis=dict(
                     showticklabels=True,
-                    tickfont=dict(size=10)
+                    tickfont=dict(size=10),
+                    range=[0, 100] if as_percentiles else None
                 ),
                 angularaxis=dict(
                     tickfont=dict(size=10)
@@ -142,22 +157,39 @@ elif st.session_state.page == "player_comparison":
 
 
 elif st.session_state.page == "market_value":
+    import plotly.graph_objects as go
+
     st.title("Market Value Analysis")
-    st.subheader("Explore the top-valued players and those with high potential but low market value.")
+    dataset, df = players()
+    st.subheader("Explore the top-valued players and those whose market value is below what their profile suggests.")
+
+    # Query settings
+    col1, col2 = st.columns(2)
+    with col1:
+        top_k = st.slider("Players to show", min_value=5, max_value=50, value=10)
+        value_ceiling = st.number_input("Undervalued: maximum value (EUR)", min_value=0,
+                                        value=20000000, step=1000000)
+    with col2:
+        min_age, max_age = int(df['age'].min()), int(df['age'].max())
+        age_range = st.slider("Age range", min_value=min_age, max_value=max_age, value=(min_age, max_age))
+        leagues = st.multiselect("Leagues (all if empty)", dataset.market.leagues.tolist())
+
+    query = dict(age_range=age_range, leagues=tuple(sorted(leagues)) or None)
 
     # Top-Valued Players
     st.write("### Top-Valued Players")
-    top_valued_players = df.sort_values(by='value_eur', ascending=False).head(10)
+    top_valued_players = df.iloc[dataset.market.top_valued(top_k, **query)]
 
     # Display Top-Valued Players in a table
     st.table(top_valued_players[['short_name', 'club_name', 'value_eur', 'wage_eur', 'overall', 'potential']])
 
-    # Undervalued High-Potential Players
-    st.write("### Undervalued High-Potential Players")
-    undervalued_players = df[(df['value_eur'] < 20000000) & (df['potential'] > df['overall'])].sort_values(by='potential', ascending=False).head(10)
+    # Undervalued Players (ranked by the fair-value model's score, computed once per dataset load)
+    st.write("### Undervalued Players")
+    st.caption("Fair value is estimated from overall, potential, age and position group.")
+    undervalued_players = df.iloc[dataset.market.undervalued(top_k, max_value=value_ceiling, **query)]
 
     # Display Undervalued Players in a table
-    st.table(undervalued_players[['short_name', 'club_name', 'value_eur','wage_eur', 'potential', 'overall']])
+    st.table(undervalued_players[['short_name', 'club_name', 'value_eur', 'fair_value_eur', 'undervaluation', 'potential', 'overall']])
 
     # Visualization: Bar Chart for Top-Valued Players
     st.write("### Visualization of Top-Valued Players")
@@ -176,9 +208,16 @@ elif st.session_state.page == "market_value":
     fig_undervalued.add_trace(go.Bar(
         x=undervalued_players['short_name'],
         y=undervalued_players['value_eur'],
+        name="Market value",
         marker_color='tomato'
     ))
-    fig_undervalued.update_layout(title="Undervalued High-Potential Players", xaxis_title="Players", yaxis_title="Market Value (EUR)", xaxis_tickangle=-45)
+    fig_undervalued.add_trace(go.Bar(
+        x=undervalued_players['short_name'],
+        y=undervalued_players['fair_value_eur'],
+        name="Fair value",
+        marker_color='seagreen'
+    ))
+    fig_undervalued.update_layout(title="Undervalued Players", xaxis_title="Players", yaxis_title="Market Value (EUR)", xaxis_tickangle=-45)
     st.plotly_chart(fig_undervalued)
 
     if st.button("Back to Main Page"):
@@ -186,24 +225,21 @@ elif st.session_state.page == "market_value":
 
 
 elif st.session_state.page == "best_players_position":
+    import plotly.graph_objects as go
+    from positions import POSITION_GROUPS
+
     st.title("Best Players by Position")
+    dataset, df = players()
     st.subheader("Explore the top players in each position, including goalkeepers.")
 
     # Position selection
-    position = st.selectbox("Select a position:", 
-                             ['Goalkeeper', 'Defender', 'Midfielder', 'Forward'])
-
-    # Filter players based on selected position
-    if position == 'Goalkeeper':
-        position_filter = df['player_positions'].str.contains('GK')
-    elif position == 'Defender':
-        position_filter = df['player_positions'].str.contains('CB|LB|RB|LWB|RWB')
-    elif position == 'Midfielder':
-        position_filter = df['player_positions'].str.contains('CM|CDM|CAM|LM|RM|LAM|RAM')
-    elif position == 'Forward':
-        position_filter = df['player_positions'].str.contains('ST|CF|LW|RW|LF|RF')
+    position = st.selectbox("Select a position:", list(POSITION_GROUPS))
 
-    top_players = df[position_filter].sort_values(by='overall', ascending=False).head(10)
+    # Filter players based on selected position (precomputed group mask over the presorted
+    # `overall` order, so only the 10 rows shown are copied out of the table)
+    position_filter = dataset.positions.group_mask(position)
+    by_overall = dataset.market.view('overall')
+    top_players = df.iloc[by_overall[position_filter[by_overall]][:10]]
 
     # Display Top Players in a table
     st.write(f"### Top {position}s")
@@ -221,4 +257,4 @@ elif st.session_state.page == "best_players_position":
     st.plotly_chart(fig_best_players)
 
     if st.button("Back to Main Page"):
-        goto_feature("main")  # Navigate back to main page
\ No newline at end of file
+        goto_feature("main")  # Navigate back to main page
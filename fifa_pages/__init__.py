@@ -0,0 +1,43 @@
+"""The pages of fifa.py, one module each, imported the first time they are shown.
+
+A page module imports what it draws with (Plotly, DuckDB, the goal cube)
+at its top, so a session on the main page never pays for those imports,
+and each page asks for the player table through `players()` instead of it
+being loaded before anything is drawn (the sidebar's dataset summary comes
+with it, so the main page never reads the table). Every module has a `render()`.
+"""
+import importlib
+
+import streamlit as st
+
+import metrics
+
+# Pages by their st.session_state.page key, which is also the module name
+PAGES = ('main', 'player_search', 'player_comparison', 'market_value', 'best_players_position',
+         'dream_team_creator', 'similar_players', 'advanced_filter', 'goal_statistics')
+
+
+def show(page):
+    """Import the page's module (once per process) and draw it."""
+    if page not in PAGES:
+        return
+    with metrics.timer('render', page):
+        importlib.import_module(f"{__name__}.{page}").render()
+
+
+def players():
+    """The shared PlayerDataset (read once per process, on the first page that needs it).
+
+    Also captions the sidebar with the dataset summary.
+    """
+    from player_data import load_players
+
+    with metrics.timer('load', 'players'):
+        dataset = load_players()
+    st.sidebar.caption(f"Dataset: {dataset.summary()}")
+    return dataset
+
+
+def back_to_main():
+    if st.button("Back to Main Page"):
+        st.session_state.page = "main"  # Navigate back to main page
@@ -0,0 +1,103 @@
+import streamlit as st
+
+import metrics
+from fifa_pages import back_to_main, players
+from player_filter import RANGE_COLUMNS
+from positions import POSITION_GROUPS
+
+# Matches shown per page of the results table
+PAGE_SIZE = 25
+
+# Attributes with a minimum-rating slider
+MIN_RATING_COLUMNS = ['overall', 'potential', 'pace', 'shooting', 'passing', 'dribbling', 'defending', 'physic']
+
+# Columns shown for every match
+RESULT_COLUMNS = ['short_name', 'age', 'nationality', 'club_name', 'league_name', 'player_positions',
+                  'overall', 'potential', 'value_eur', 'wage_eur'] + MIN_RATING_COLUMNS[2:]
+
+COLUMN_LABELS = {'value_eur': "Value (EUR)", 'wage_eur': "Wage (EUR)", 'physic': "Physicality"}
+
+
+def _label(column):
+    return COLUMN_LABELS.get(column, column.capitalize())
+
+
+def _change_page(step):
+    st.session_state.filter_page = max(0, st.session_state.get('filter_page', 0) + step)
+
+
+def render():
+    st.title("Advanced Filter")
+    st.subheader("Find players matching any mix of age, money, ratings, league, nationality and club.")
+    dataset = players()
+    df = dataset.df
+    filters = dataset.filters
+
+    # Conditions: a control left at its widest setting adds none
+    ranges, categories = [], []
+    col1, col2 = st.columns(2)
+    with col1:
+        min_age, max_age = filters.range_index('age').limits()
+        age_range = st.slider("Age", min_value=min_age, max_value=max_age, value=(min_age, max_age))
+        if age_range != (min_age, max_age):
+            ranges.append(('age', *age_range))
+    with col2:
+        groups = st.multiselect("Position groups (any of)", list(POSITION_GROUPS))
+
+    col1, col2 = st.columns(2)
+    for column, col in [('value_eur', col1), ('wage_eur', col2)]:
+        with col:
+            low = st.number_input(f"{_label(column)} from", min_value=0, value=0, step=100000, key=f"filter_{column}_low")
+            high = st.number_input(f"{_label(column)} up to (0 for no limit)", min_value=0, value=0, step=100000,
+                                   key=f"filter_{column}_high")
+            if low or high:
+                ranges.append((column, low or None, high or None))
+
+    with st.expander("Minimum ratings"):
+        cols = st.columns(4)
+        for index, column in enumerate(MIN_RATING_COLUMNS):
+            with cols[index % 4]:
+                minimum = st.slider(_label(column), min_value=0, max_value=99, value=0, key=f"filter_min_{column}")
+                if minimum:
+                    ranges.append((column, minimum, None))
+
+    for column, label in [('league_name', "Leagues"), ('nationality', "Nationalities"), ('club_name', "Clubs")]:
+        values = st.multiselect(f"{label} (any of)", filters.category_index(column).categories.tolist(),
+                                key=f"filter_{column}")
+        if values:
+            categories.append((column, tuple(sorted(values))))
+
+    col1, col2 = st.columns(2)
+    with col1:
+        sort_by = st.selectbox("Sort by", RANGE_COLUMNS, index=RANGE_COLUMNS.index('overall'), format_func=_label)
+    with col2:
+        descending = st.toggle("Highest first", value=True)
+
+    query = (tuple(ranges), tuple(categories), tuple(groups), sort_by, descending)
+    with metrics.timer('filter', 'advanced_filter'):
+        rows = filters.query(*query)
+
+    # Start again from the first page whenever the query changes
+    if st.session_state.get('filter_last_query') != query:
+        st.session_state.filter_last_query = query
+        st.session_state.filter_page = 0
+    pages = max(1, -(-len(rows) // PAGE_SIZE))
+    page = min(st.session_state.get('filter_page', 0), pages - 1)
+
+    st.write(f"### {len(rows):,} matching players")
+    if ranges or categories or groups:
+        plan = filters.predicates(*query[:3])
+        st.caption("Conditions checked from the most selective: "
+                   + ", ".join(f"{predicate.label} ({predicate.size:,})" for predicate in plan))
+    page_rows = rows[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+    st.dataframe(df.iloc[page_rows][RESULT_COLUMNS], hide_index=True)
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.button("Previous", key="filter_prev", disabled=page == 0, on_click=_change_page, args=(-1,))
+    with col2:
+        st.caption(f"Page {page + 1} of {pages:,}")
+    with col3:
+        st.button("Next", key="filter_next", disabled=page >= pages - 1, on_click=_change_page, args=(1,))
+
+    back_to_main()
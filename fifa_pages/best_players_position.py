@@ -0,0 +1,48 @@
+import plotly.graph_objects as go
+import streamlit as st
+
+import metrics
+from fifa_pages import back_to_main, players
+from fifa_pages.seasons import pick_season
+from figure_cache import cached_figure
+from positions import POSITION_GROUPS
+
+
+def render():
+    st.title("Best Players by Position")
+    st.subheader("Explore the top players in each position, including goalkeepers.")
+
+    # Season and position selection
+    dataset = players()
+    store, season = pick_season("position_season")
+    position = st.selectbox("Select a position:", list(POSITION_GROUPS))
+
+    with metrics.timer('position_filter', 'best_players_position'):
+        if season is None:
+            # Filter players based on selected position (precomputed group mask over the presorted
+            # `overall` order, so only the 10 rows shown are copied out of the table)
+            position_filter = dataset.positions.group_mask(position)
+            by_overall = dataset.market.view('overall')
+            top_players = dataset.df.iloc[by_overall[position_filter[by_overall]][:10]]
+        else:
+            top_players = store.best_in_group(season, position, 10)
+
+    # Display Top Players in a table
+    st.write(f"### Top {position}s")
+    st.table(top_players[['short_name', 'club_name', 'overall', 'value_eur', 'wage_eur']])
+
+    # Visualization: Bar Chart for Top Players
+    st.write(f"### Visualization of Top {position}s")
+    def build_best_players():
+        fig_best_players = go.Figure()
+        fig_best_players.add_trace(go.Bar(
+            x=top_players['short_name'],
+            y=top_players['overall'],
+            marker_color='green'
+        ))
+        fig_best_players.update_layout(title=f"Top {position}s", xaxis_title="Players", yaxis_title="Overall Rating", xaxis_tickangle=-45)
+        return fig_best_players
+    version = dataset.version if season is None else store.version(season)
+    st.plotly_chart(cached_figure("best_players_position", version, {'position': position}, build_best_players))
+
+    back_to_main()
@@ -0,0 +1,136 @@
+import plotly.graph_objects as go
+import streamlit as st
+
+import metrics
+from dream_team import FORMATION, build_dream_team
+from fifa_pages import back_to_main, players
+from figure_cache import cached_figure
+from player_picker import pick_players
+
+# Attributes the Dream Team auto-builder can maximize
+TEAM_ATTRIBUTES = ['overall', 'potential', 'pace', 'shooting', 'passing', 'dribbling', 'defending', 'physic']
+
+
+def render():
+    st.title("Dream Team Creator")
+    st.subheader("Select players to create your dream football team!")
+    dataset = players()
+    df = dataset.df
+
+    # Create a dictionary to store selected players by position
+    selected_players = {
+        "Goalkeeper": [],
+        "Defender": [],
+        "Midfielder": [],
+        "Forward": []
+    }
+
+    # Limitations for each position
+    position_limits = FORMATION
+
+    mode = st.radio("How do you want to build your team?", ["Pick players", "Auto-build within a budget"],
+                    horizontal=True)
+
+    if mode == "Pick players":
+        # Dropdowns for selecting players by position
+        for position, limit in position_limits.items():
+            # Select multiple players, searching only within the position group
+            selected = pick_players(f"Select up to {limit} {position}s", dataset, key=f"dream_{position}",
+                                    max_selections=limit, mask=dataset.positions.group_mask(position))
+
+            # Add selected player to the list
+            selected_players[position] += [dataset.players.row(player_id)['short_name'] for player_id in selected]
+    else:
+        # Let the optimizer pick the best XI that fits the budget
+        col1, col2 = st.columns(2)
+        with col1:
+            budget = st.number_input("Budget (EUR)", min_value=0, value=100000000, step=5000000)
+            cost_column = st.selectbox("Budget applies to", ['value_eur', 'wage_eur'],
+                                       format_func={'value_eur': "Market value", 'wage_eur': "Weekly wage"}.get)
+        with col2:
+            attributes = st.multiselect("Maximize the total of", TEAM_ATTRIBUTES, default=['overall'])
+
+        if st.button("Build Team", disabled=not attributes):
+            with metrics.timer('dream_team', 'dream_team_creator'):
+                team = build_dream_team(df, dataset.positions.group_masks, budget, cost_column,
+                                        weights={attribute: 1.0 for attribute in attributes})
+            if team is None:
+                st.session_state.dream_auto = None
+                st.write("No team fits this budget. Please try a bigger one.")
+            else:
+                st.session_state.dream_auto = {
+                    'version': dataset.version,
+                    'players': {group: dataset.players.ids[positions].tolist()
+                                for group, positions in team.players.items()},
+                    'score': team.score, 'bound': team.bound, 'cost': team.cost, 'cost_column': cost_column,
+                }
+
+        auto_team = st.session_state.get('dream_auto')
+        if auto_team and auto_team['version'] == dataset.version:
+            team_rows = df.iloc[dataset.players.positions(
+                [player_id for ids in auto_team['players'].values() for player_id in ids])]
+            st.table(team_rows[['short_name', 'club_name', 'player_positions', 'overall', auto_team['cost_column']]])
+            # the search only claims the best team when it proved no team within budget scores more
+            quality = ("the best possible" if auto_team['score'] >= auto_team['bound']
+                       else f"best possible at most {auto_team['bound']:,.0f}")
+            st.write(f"**Total score:** {auto_team['score']:,.0f} ({quality}) - "
+                     f"**Total cost:** {auto_team['cost']:,.0f} EUR")
+            for position, ids in auto_team['players'].items():
+                selected_players[position] += [dataset.players.row(player_id)['short_name'] for player_id in ids]
+
+    # Create a button to visualize the dream team
+    if st.button("Visualize Dream Team"):
+        def build_pitch():
+            # Prepare player positions for plotting
+            positions_on_pitch = {
+                "Goalkeeper": [(0.5, 0.9)],
+                "Defender": [(0.2, 0.7), (0.4, 0.7), (0.6, 0.7), (0.8, 0.7)],
+                "Midfielder": [(0.3, 0.5), (0.5, 0.5), (0.7, 0.5)],
+                "Forward": [(0.3, 0.3), (0.5, 0.3),(0.7,0.3)]
+            }
+
+            # Set up the pitch with a green background
+            fig = go.Figure()
+
+            # Add a green rectangle to represent the pitch
+            fig.add_shape(type="rect", x0=0, x1=1, y0=0, y1=1,
+                          line=dict(color="green"),fillcolor="rgba(144, 238, 144, 0.3)")
+
+            # Plot players based on their positions
+            colors = {
+                "Goalkeeper": "blue",
+                "Defender": "green",
+                "Midfielder": "orange",
+                "Forward": "red"
+            }
+            dot_size = 20  # Adjusted size for visibility
+            opacity = 1  # Increased opacity
+
+            for position, players in selected_players.items():
+                for i, player in enumerate(players):
+                    if i < len(positions_on_pitch[position]):  # Ensure there's a position for the player
+                        x, y = positions_on_pitch[position][i]
+                        fig.add_trace(go.Scatter(
+                            x=[x], y=[y],
+                            mode='markers+text',
+                            marker=dict(size=dot_size, color=colors[position], opacity=opacity),
+                            text=[player],
+                            textposition="bottom center",
+                            name=player
+                        ))
+
+            # Pitch layout
+            fig.update_layout(
+                title="Your Dream Team",
+                xaxis=dict(range=[0, 1], showgrid=False, zeroline=False, visible=False),
+                yaxis=dict(range=[0, 1], showgrid=False, zeroline=False, visible=False),
+                showlegend=True
+            )
+            return fig
+
+        st.plotly_chart(cached_figure("dream_team_pitch", dataset.version, selected_players, build_pitch))
+
+        st.write("📸 Don't forget to download a picture of your dream team and share it with your friends!")
+
+
+    back_to_main()
@@ -0,0 +1,56 @@
+import plotly.graph_objects as go
+import streamlit as st
+
+import metrics
+from fifa_pages import back_to_main
+from goal_cube import DIMENSIONS
+from goal_data import load_goals
+
+
+def render():
+    st.title("Goal Statistics")
+    st.subheader("Slice a career of goals by season, club, competition, position and goal type.")
+
+    # Goals are aggregated into a cube once per load, every chart below is a roll-up of it
+    try:
+        with metrics.timer('load', 'goals'):
+            goals = load_goals()
+    except FileNotFoundError as e:
+        st.error(str(e))
+        st.stop()
+    cube = goals.cube
+    st.sidebar.caption(f"Goals: {goals.summary()}")
+
+    # Filters: an empty selection keeps every value
+    where = {}
+    with st.expander("Filters"):
+        cols = st.columns(2)
+        for index, dimension in enumerate(DIMENSIONS):
+            with cols[index % 2]:
+                where[dimension] = st.multiselect(dimension.replace("_", " "), list(cube.counts[dimension].cat.categories),
+                                                  key=f"goal_filter_{dimension}")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        by = st.selectbox("Goals per", DIMENSIONS)
+    with col2:
+        split = st.selectbox("Split by", ["None"] + [dimension for dimension in DIMENSIONS if dimension != by])
+
+    st.metric("Goals", f"{cube.total(where):,}")
+    fig_goals = go.Figure()
+    if split == "None":
+        goals_per = cube.rollup(by, where)
+        fig_goals.add_trace(go.Bar(x=goals_per.index.astype(str), y=goals_per.values))
+        table = goals_per.to_frame()
+    else:
+        table = cube.crosstab(by, split, where)
+        for column in table.columns:
+            fig_goals.add_trace(go.Bar(name=str(column), x=table.index.astype(str), y=table[column]))
+        fig_goals.update_layout(barmode="stack", legend_title=split.replace("_", " "))
+    title = f"Goals per {by.replace('_', ' ')}" + ("" if split == "None" else f" by {split.replace('_', ' ')}")
+    fig_goals.update_layout(title=title, xaxis_title=by.replace("_", " "), yaxis_title="Number of Goals", xaxis_tickangle=-45)
+    st.plotly_chart(fig_goals)
+    table.index, table.columns = table.index.astype(str), table.columns.astype(str)
+    st.dataframe(table)
+
+    back_to_main()
@@ -0,0 +1,90 @@
+"""Landing page: the feature cards and the about section. Draws no data."""
+import streamlit as st
+
+
+def render():
+    # Set the title and description
+    st.title("Ultimate FIFA Player Analysis")
+    st.subheader("Dive into the world of football stats and create your dream team!")
+
+    # Welcome banner (you can use images or text)
+    st.image("https://i.imgur.com/y2il3yk.jpeg", use_column_width=True)  # Replace with your image
+
+
+    st.markdown(
+    """
+    <style>
+    .feature-card {
+        background-color: #4c496f;
+        border-radius: 10px;
+        padding: 20px;
+        margin: 10px;
+        transition: transform 0.2s;
+    }
+    .feature-card:hover {
+        transform: scale(1.05);
+    }
+    </style>
+    """,
+    unsafe_allow_html=True
+    )
+
+    # Feature Cards
+    st.write("### Explore Our Features")
+    features = {
+        "Player Search": "Search and view detailed stats of football players.",
+        "Player Comparison": "Compare players using radar charts.",
+        "Market Value": "Discover top-valued and undervalued players.",
+        "Dream Team Creator": "Build and visualize your dream team.",
+        "Similar Players": "Find players who play like your favourite, for less.",
+        "Advanced Filter": "Filter players on any mix of age, money, ratings, league, nationality and club.",
+        "Goal Statistics": "Break down a career of goals by season, club, competition and more."
+    }
+
+    # Create columns for the feature cards
+    cols = st.columns(2)  # Create 2 columns for the cards
+
+    # Loop through features and create cards
+    for index, (feature, description) in enumerate(features.items()):
+        with cols[index % 2]:  # Use modulo to rotate columns
+            st.markdown(
+               f"""
+            <div class="feature-card">
+                <h4>{feature}</h4>
+                <p>{description}</p>
+                
+            </div>
+            """,
+            unsafe_allow_html=True
+            )
+            st.write(description)
+            if st.button(f"Go to {feature}", key=index):
+                st.session_state.page = feature.lower().replace(" ", "_")  # Navigate to the selected feature
+
+    # About Me Section
+    st.markdown("<h2 style='text-align: center;'>About Me</h2>", unsafe_allow_html=True)
+    st.markdown("""
+    <p style='text-align: center;'>
+        Hey there! This is my first project, and I'm super excited to share it with you all. 
+        I'm currently exploring the world of data science and machine learning. 
+        Your feedback would mean a lot to me, as I'm constantly looking to improve and grow. 
+        Feel free to reach out and connect!
+    </p>
+    """, unsafe_allow_html=True)
+
+    # Social Media Links
+    st.markdown("<h3 style='text-align: center;'>Connect with Me</h3>", unsafe_allow_html=True)
+    col1, col2, col3 = st.columns(3)
+
+    with col1:
+        st.markdown("<a href='https://www.instagram.com/omkarrharyan/' target='_blank'>Instagram</a>", unsafe_allow_html=True)
+    with col2:
+        st.markdown("<a href='https://github.com/Meanwhile-omkar' target='_blank'>GitHub</a>", unsafe_allow_html=True)
+    with col3:
+        st.markdown("<a href='https://www.linkedin.com/in/omkar-haryan-596a33280/' target='_blank'>LinkedIn</a>", unsafe_allow_html=True)
+
+    st.markdown("""
+    <p style='text-align: center;'>
+        Thanks for visiting! 🌟
+    </p>
+    """, unsafe_allow_html=True)
@@ -0,0 +1,112 @@
+import plotly.graph_objects as go
+import streamlit as st
+
+import metrics
+from fifa_pages import back_to_main, players
+from fifa_pages.seasons import pick_season
+from figure_cache import cached_figure
+
+
+def render():
+    st.title("Market Value Analysis")
+    st.subheader("Explore the top-valued players and those whose market value is below what their profile suggests.")
+    dataset = players()
+    df = dataset.df
+    store, season = pick_season("market_season")
+    version = dataset.version if season is None else store.version(season)
+
+    # Query settings
+    col1, col2 = st.columns(2)
+    with col1:
+        top_k = st.slider("Players to show", min_value=5, max_value=50, value=10)
+        value_ceiling = st.number_input("Undervalued: maximum value (EUR)", min_value=0,
+                                        value=20000000, step=1000000)
+    with col2:
+        if season is None:
+            min_age, max_age = int(df['age'].min()), int(df['age'].max())
+            league_options = dataset.market.leagues.tolist()
+        else:
+            min_age, max_age = store.age_range(season)
+            league_options = store.leagues(season)
+        age_range = st.slider("Age range", min_value=min_age, max_value=max_age, value=(min_age, max_age))
+        leagues = st.multiselect("Leagues (all if empty)", league_options)
+
+    query = dict(age_range=age_range, leagues=tuple(sorted(leagues)) or None)
+
+    # Top-Valued Players
+    st.write("### Top-Valued Players")
+    with metrics.timer('top_k', 'top_valued'):
+        if season is None:
+            top_valued_players = df.iloc[dataset.market.top_valued(top_k, **query)]
+        else:
+            top_valued_players = store.top_valued(season, top_k, **query)
+
+    # Display Top-Valued Players in a table
+    st.table(top_valued_players[['short_name', 'club_name', 'value_eur', 'wage_eur', 'overall', 'potential']])
+
+    # The fair-value model and the all-player chart need the loaded dataset
+    if season is None:
+        # Undervalued Players (ranked by the fair-value model's score, computed once per dataset load)
+        st.write("### Undervalued Players")
+        st.caption("Fair value is estimated from overall, potential, age and position group.")
+        with metrics.timer('top_k', 'undervalued'):
+            undervalued_players = df.iloc[dataset.market.undervalued(top_k, max_value=value_ceiling, **query)]
+
+        # Display Undervalued Players in a table
+        st.table(undervalued_players[['short_name', 'club_name', 'value_eur', 'fair_value_eur', 'undervaluation', 'potential', 'overall']])
+
+    # Visualization: Bar Chart for Top-Valued Players
+    st.write("### Visualization of Top-Valued Players")
+    def build_top_value():
+        fig_top_value = go.Figure()
+        fig_top_value.add_trace(go.Bar(
+            x=top_valued_players['short_name'],
+            y=top_valued_players['value_eur'],
+            marker_color='royalblue'
+        ))
+        fig_top_value.update_layout(title="Top-Valued Players", xaxis_title="Players", yaxis_title="Market Value (EUR)", xaxis_tickangle=-45)
+        return fig_top_value
+    st.plotly_chart(cached_figure("top_valued", version, {'k': top_k, **query}, build_top_value))
+
+    if season is None:
+        # Visualization: Bar Chart for Undervalued Players
+        st.write("### Visualization of Undervalued Players")
+        def build_undervalued():
+            fig_undervalued = go.Figure()
+            fig_undervalued.add_trace(go.Bar(
+                x=undervalued_players['short_name'],
+                y=undervalued_players['value_eur'],
+                name="Market value",
+                marker_color='tomato'
+            ))
+            fig_undervalued.add_trace(go.Bar(
+                x=undervalued_players['short_name'],
+                y=undervalued_players['fair_value_eur'],
+                name="Fair value",
+                marker_color='seagreen'
+            ))
+            fig_undervalued.update_layout(title="Undervalued Players", xaxis_title="Players", yaxis_title="Market Value (EUR)", xaxis_tickangle=-45)
+            return fig_undervalued
+        st.plotly_chart(cached_figure("undervalued", dataset.version,
+                                      {'k': top_k, 'max_value': value_ceiling, **query}, build_undervalued))
+
+        # Visualization: every player at once, drawn with WebGL so the full dataset stays interactive
+        st.write("### Market Value vs Overall Rating")
+        def build_value_scatter():
+            fig_scatter = go.Figure()
+            fig_scatter.add_trace(go.Scattergl(
+                x=df['overall'].to_numpy(),
+                y=df['value_eur'].to_numpy(),
+                mode='markers',
+                marker=dict(size=4, opacity=0.5, color=df['age'].to_numpy(), colorscale='Viridis',
+                            colorbar=dict(title="Age")),
+                text=df['short_name'].to_numpy(),
+                hovertemplate="%{text}<br>Overall %{x}<br>Value %{y:,.0f} EUR<extra></extra>"
+            ))
+            fig_scatter.update_layout(title=f"All {len(df):,} Players", xaxis_title="Overall Rating", yaxis_title="Market Value (EUR)")
+            return fig_scatter
+        st.plotly_chart(cached_figure("value_vs_overall", dataset.version, {}, build_value_scatter))
+    else:
+        st.info("Undervalued players and the all-player chart are available for the current dataset.")
+
+    back_to_main()
@@ -0,0 +1,65 @@
+import plotly.graph_objects as go
+import streamlit as st
+
+import metrics
+from fifa_pages import back_to_main, players
+from figure_cache import cached_figure
+from player_picker import pick_players
+from similarity import ATTRIBUTES
+
+# Most players shown together on the Player Comparison radar
+MAX_COMPARED = 10
+
+
+def render():
+    st.title("Player Comparison")
+    dataset = players()
+
+    # Searchable picker for selecting up to MAX_COMPARED players (matches are looked up server-side)
+    compared = pick_players(f"Players to compare (up to {MAX_COMPARED})", dataset, key="compare",
+                            max_selections=MAX_COMPARED)
+    as_percentiles = st.toggle("Show attributes as percentiles within each player's position group")
+
+    if st.button("Compare Players", disabled=len(compared) < 2):
+        # Get the data for the selected players (O(1) row gather by id)
+        with metrics.timer('comparison_lookup', 'player_comparison'):
+            positions = dataset.players.positions(compared)
+            categories = ATTRIBUTES
+            if as_percentiles:
+                values = dataset.percentiles.rows(positions)
+            else:
+                values = dataset.df[categories].iloc[positions].to_numpy(dtype=float)
+
+        # Create radar chart
+        def build_radar():
+            fig = go.Figure()
+
+            for player_id, player_values in zip(compared, values):
+                fig.add_trace(go.Scatterpolar(
+                    r=player_values.tolist(),
+                    theta=categories,
+                    fill='toself',
+                    name=dataset.players.label(player_id)
+                ))
+
+            fig.update_layout(
+                polar=dict(
+                    radialaxis=dict(
+                        showticklabels=True,
+                        tickfont=dict(size=10),
+                        range=[0, 100] if as_percentiles else None
+                    ),
+                    angularaxis=dict(
+                        tickfont=dict(size=10)
+                    )
+                ),
+                showlegend=True,
+                title="Player Comparison Radar Chart"
+            )
+            return fig
+
+        # Display the radar chart (serialized once per set of players and dataset version)
+        st.plotly_chart(cached_figure("comparison_radar", dataset.version,
+                                      {'players': compared, 'percentiles': as_percentiles}, build_radar))
+
+    back_to_main()
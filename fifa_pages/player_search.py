@@ -0,0 +1,100 @@
+import plotly.graph_objects as go
+import streamlit as st
+
+import metrics
+from fifa_pages import back_to_main, players
+from fifa_pages.seasons import pick_season, result_lookup
+from figure_cache import cached_figure
+
+# Number of suggestions shown on the Player Search page
+SEARCH_RESULTS = 50
+
+
+def render():
+    st.title("Player Search")
+    store, season = pick_season("search_season")
+    search_query = st.text_input("Enter the player name:")
+
+    if search_query:
+        if season is None:
+            dataset = players()
+            # Look up the best matches in the search index (accent-insensitive, ranked)
+            with metrics.timer('search', 'player_search'):
+                filtered_df = dataset.df.iloc[dataset.search_index.search(search_query, k=SEARCH_RESULTS)]
+            player_label, player_row = dataset.players.label, dataset.players.row
+            # row-number ids would pick up other players' seasons from the store
+            stable_ids = dataset.id_column is not None
+        else:
+            # Earlier seasons are searched on disk, reading only the names and ratings
+            with metrics.timer('search', 'player_search_season'):
+                filtered_df = store.search(season, search_query, k=SEARCH_RESULTS)
+            player_label, player_row = result_lookup(filtered_df)
+            stable_ids = True
+
+        if not filtered_df.empty:
+            st.write(f"### Results for '{search_query}':")
+
+            # Dropdown menu for selecting a player
+            player_ids = filtered_df['player_id'].tolist()
+            selected_player = st.selectbox("Select a player from the suggestions:", player_ids,
+                                           format_func=player_label)
+
+            # Display player details for the selected player
+            if selected_player is not None:
+                player_info = player_row(selected_player)
+                st.markdown(
+                    f"<h2 style='color: #2E8B57;'>{player_info['short_name']}</h2>", unsafe_allow_html=True
+                )
+                col1, col2 = st.columns(2)
+                with col1:
+                    st.markdown(f"**Full Name:** {player_info['long_name']}")
+                    st.markdown(f"**Age:** {player_info['age']}")
+                    st.markdown(f"**Nationality:** {player_info['nationality']}")
+                    st.markdown(f"**Club:** {player_info['club_name']}")
+                    st.markdown(f"**League:** {player_info['league_name']}")
+    
+                with col2:
+                    st.markdown(f"**Overall Rating:** :star: {player_info['overall']}")
+                    st.markdown(f"**Potential Rating:** :star2: {player_info['potential']}")
+                    st.markdown(f"**Value (EUR):** :moneybag: {player_info['value_eur']:,}")
+                    st.markdown(f"**Wage (EUR):** :dollar: {player_info['wage_eur']:,}")
+                    st.markdown(f"**Positions:** {player_info['player_positions']}")
+
+                st.write("---")
+
+                # Display attributes in a horizontal layout
+                st.markdown("<h4 style='color: #FFA07A;'>Player Attributes:</h4>", unsafe_allow_html=True)
+                
+                col1, col2, col3 = st.columns(3)
+                with col1:
+                    st.markdown(f"**Pace:** {player_info['pace']} :dash:")
+                    st.markdown(f"**Shooting:** {player_info['shooting']} :soccer:")
+                with col2:
+                    st.markdown(f"**Passing:** {player_info['passing']} :dart:")
+                    st.markdown(f"**Dribbling:** {player_info['dribbling']} :basketball:")
+                with col3:
+                    st.markdown(f"**Defending:** {player_info['defending']} :shield:")
+                    st.markdown(f"**Physicality:** {player_info['physic']} :muscle:")
+
+                # Rating and value in every stored season (a lookup by id reads one row group per season)
+                if store is not None and stable_ids:
+                    with metrics.timer('trajectory', 'player_search'):
+                        history = store.trajectory(selected_player)
+                    if len(history) > 1:
+                        st.markdown("<h4 style='color: #FFA07A;'>Rating and Value over Time:</h4>", unsafe_allow_html=True)
+                        def build_history():
+                            seasons = [f"FIFA {season}" for season in history['season']]
+                            fig_history = go.Figure()
+                            fig_history.add_trace(go.Scatter(x=seasons, y=history['overall'], name="Overall", mode='lines+markers'))
+                            fig_history.add_trace(go.Scatter(x=seasons, y=history['potential'], name="Potential", mode='lines+markers'))
+                            fig_history.add_trace(go.Bar(x=seasons, y=history['value_eur'], name="Value (EUR)", yaxis='y2', opacity=0.4))
+                            fig_history.update_layout(title=f"{player_info['short_name']} by Season", yaxis_title="Rating",
+                                                      yaxis2=dict(title="Value (EUR)", overlaying='y', side='right'))
+                            return fig_history
+                        st.plotly_chart(cached_figure("player_history", store.version(), {'player': selected_player}, build_history))
+
+
+        else:
+            st.write("No players found. Please try another search.")
+
+    back_to_main()
@@ -0,0 +1,30 @@
+"""Season selection for the pages that can show an earlier FIFA edition."""
+import pandas as pd
+import streamlit as st
+
+from season_store import load_store
+
+
+def pick_season(key):
+    """The season store (None until a season has been stored) and the chosen season.
+
+    The season is None for the loaded dataset.
+    """
+    store = load_store()
+    if store is None:
+        return None, None
+    season = st.selectbox("Season", [None] + store.seasons()[::-1], key=key,
+                          format_func=lambda season: "Current dataset" if season is None else f"FIFA {season}")
+    return store, season
+
+
+def result_lookup(results):
+    """Label and row lookups by player_id over a frame of season query results."""
+    rows = results.set_index('player_id', drop=False)
+
+    def label(player_id):
+        row = rows.loc[player_id]
+        club = row['club_name'] if pd.notna(row['club_name']) else "No club"
+        return f"{row['short_name']} ({club}, {row['age']})"
+
+    return label, rows.loc.__getitem__
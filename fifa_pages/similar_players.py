@@ -0,0 +1,46 @@
+import streamlit as st
+
+import metrics
+from fifa_pages import back_to_main, players
+from player_picker import pick_player
+from positions import POSITION_GROUPS
+from similarity import ATTRIBUTES
+
+
+def render():
+    st.title("Similar Players")
+    st.subheader("Find players with a similar profile, optionally in a position group and under a price.")
+    dataset = players()
+    df = dataset.df
+
+    # Reference player and filters
+    reference = pick_player("Find players similar to", dataset, key="similar_reference")
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        group = st.selectbox("Position group", ["Any"] + list(POSITION_GROUPS))
+    with col2:
+        max_value = st.number_input("Maximum value (EUR, 0 for no limit)", min_value=0, value=0, step=1000000)
+    with col3:
+        count = st.slider("Players to show", min_value=5, max_value=50, value=10)
+
+    if reference is not None:
+        # Candidate filter as a boolean mask over all players
+        mask = None
+        if group != "Any":
+            mask = dataset.positions.group_mask(group)
+        if max_value:
+            below = df['value_eur'].to_numpy() <= max_value
+            mask = below if mask is None else mask & below
+
+        with metrics.timer('similar', 'similar_players'):
+            positions, distances = dataset.similarity.similar(dataset.players.position(reference), k=count, mask=mask)
+        similar_players = df.iloc[positions][['short_name', 'club_name', 'player_positions', 'overall', 'value_eur'] + ATTRIBUTES[2:]]
+        similar_players.insert(0, 'distance', distances.round(2))
+
+        st.write(f"### Players most similar to {dataset.players.label(reference)}")
+        if similar_players.empty:
+            st.write("No players match these filters.")
+        else:
+            st.table(similar_players)
+
+    back_to_main()
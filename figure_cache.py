@@ -0,0 +1,81 @@
+import collections
+import threading
+
+import plotly.io as pio
+
+import metrics
+
+# Figures kept per process, by count and by total JSON size
+FIGURE_CACHE_SIZE = 256
+FIGURE_CACHE_BYTES = 64 << 20
+
+CacheInfo = collections.namedtuple('CacheInfo', 'hits misses currsize nbytes')
+
+
+class FigureCache:
+    """Thread-safe LRU of built figures, bounded by entries and by their JSON size."""
+
+    def __init__(self, maxsize=FIGURE_CACHE_SIZE, maxbytes=FIGURE_CACHE_BYTES):
+        self.maxsize = maxsize
+        self.maxbytes = maxbytes
+        self.nbytes = 0
+        self.hits = self.misses = 0
+        self._lock = threading.Lock()
+        self._figures = collections.OrderedDict()  # key -> (figure, JSON size)
+
+    def get(self, key):
+        with self._lock:
+            entry = self._figures.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            self._figures.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def put(self, key, fig, nbytes):
+        with self._lock:
+            if key in self._figures:
+                self.nbytes -= self._figures.pop(key)[1]
+            self._figures[key] = (fig, nbytes)
+            self.nbytes += nbytes
+            while len(self._figures) > 1 and (len(self._figures) > self.maxsize or self.nbytes > self.maxbytes):
+                self.nbytes -= self._figures.popitem(last=False)[1][1]
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, len(self._figures), self.nbytes)
+
+
+figures = FigureCache()
+
+
+def _freeze(value):
+    """A hashable version of page parameters (dicts, lists and arrays included)."""
+    if hasattr(value, 'tolist'):  # NumPy arrays and scalars
+        value = value.tolist()
+    if isinstance(value, dict):
+        return tuple(sorted((key, _freeze(item)) for key, item in value.items()))
+    if isinstance(value, set):
+        return tuple(sorted(_freeze(item) for item in value))
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    return value
+
+
+def cached_figure(name, version, params, build):
+    """The figure `build()` returns for these page parameters, built once per dataset version.
+
+    `params` must include everything the figure depends on besides the
+    dataset. The same go.Figure is handed to every session, so pass it
+    straight to `st.plotly_chart` (which only reads it through `to_dict()`,
+    without validating it again) and don't modify it.
+    """
+    key = (name, version, _freeze(params))
+    fig = figures.get(key)
+    if fig is None:
+        with metrics.timer('chart_build', name):
+            fig = build()
+        with metrics.timer('chart_serialize', name):
+            nbytes = len(pio.to_json(fig, validate=False))
+        figures.put(key, fig, nbytes)
+    return fig
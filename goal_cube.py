@@ -0,0 +1,72 @@
+import pandas as pd
+
+# Dimensions of the goal cube, every chart on the Goal Statistics page is a roll-up of these
+DIMENSIONS = ['Season', 'Club', 'Competition', 'Venue', 'Playing_Position', 'Type', 'Goal_assist']
+
+
+def align_categories(left, right, columns):
+    """Give categorical `columns` of both frames the union of their categories.
+
+    Concatenating categoricals with different categories falls back to
+    object columns; with equal categories the result stays categorical.
+    """
+    left, right = left.copy(), right.copy()
+    for column in columns:
+        a, b = left[column].astype('category'), right[column].astype('category')
+        categories = a.cat.categories.union(b.cat.categories)
+        ordered = a.cat.ordered
+        left[column] = a.cat.set_categories(categories, ordered=ordered)
+        right[column] = b.cat.set_categories(categories, ordered=ordered)
+    return left, right
+
+
+class GoalCube:
+    """Goal counts for every combination of DIMENSIONS that occurs.
+
+    Built with one groupby over the goal events; any slice or roll-up is
+    then a filter and groupby over this much smaller table. New events are
+    folded in by aggregating just them and adding the counts.
+    """
+
+    def __init__(self, counts):
+        self.counts = counts
+
+    @staticmethod
+    def _aggregate(events):
+        counts = events.groupby(DIMENSIONS, observed=True).size()
+        return counts.rename('Goals').reset_index()
+
+    @classmethod
+    def from_events(cls, events):
+        return cls(cls._aggregate(events))
+
+    def add(self, events):
+        """Count newly appended goal events (same columns as the cleaned data)."""
+        current, new = align_categories(self.counts, self._aggregate(events), DIMENSIONS)
+        combined = pd.concat([current, new], ignore_index=True)
+        self.counts = combined.groupby(DIMENSIONS, observed=True, as_index=False)['Goals'].sum()
+
+    def __len__(self):
+        return len(self.counts)
+
+    def _slice(self, where):
+        counts = self.counts
+        for column, values in (where or {}).items():
+            if values:
+                counts = counts[counts[column].isin(values if isinstance(values, (list, tuple, set)) else [values])]
+        return counts
+
+    def total(self, where=None):
+        return int(self._slice(where)['Goals'].sum())
+
+    def rollup(self, by, where=None):
+        """Goals per value of the `by` dimension(s), within the `where` slice.
+
+        `where` maps a dimension to the value or list of values to keep.
+        """
+        by = [by] if isinstance(by, str) else list(by)
+        return self._slice(where).groupby(by, observed=True)['Goals'].sum()
+
+    def crosstab(self, rows, columns, where=None):
+        """Goals with `rows` values down and `columns` values across, zeros filled in."""
+        return self.rollup([rows, columns], where).unstack(fill_value=0)
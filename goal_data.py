@@ -0,0 +1,253 @@
+"""Goal events of the workbook analysed in S4DS_task_2_.ipynb, cleaned once into Parquet.
+
+    python goal_data.py append new_goals.xlsx      # add goal rows exported the same way
+
+The workbook is converted again only when its contents change. Appended
+rows are kept in their own file, so a reconversion doesn't drop them, and
+the goal cube is cached next to the events, rebuilt only when either changes.
+"""
+import argparse
+import hashlib
+import logging
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from goal_cube import GoalCube, align_categories
+
+logger = logging.getLogger(__name__)
+
+# The goal workbook analysed in S4DS_task_2_.ipynb, and the cleaned, typed copy
+SOURCE_PATH = "TASK2- DATA.xlsx"
+PARQUET_PATH = "goal_data.parquet"
+
+# Goal rows added after the workbook was converted, and the cube over all events
+APPENDED_PATH = "goal_data_appended.parquet"
+CUBE_PATH = "goal_cube.parquet"
+
+# Parquet metadata key holding the hash of the workbook the file was built from
+SOURCE_HASH_KEY = b"source_sha256"
+
+# Parquet metadata key holding the version of the events the cube counts
+EVENTS_VERSION_KEY = b"events_version"
+
+DROP_COLUMNS = ['Matchday', 'Date', 'At_score']
+REQUIRED_COLUMNS = ['Result', 'Season', 'Competition', 'Venue', 'Club', 'Opponent', 'Minute',
+                    'Playing_Position', 'Type']
+CATEGORY_COLUMNS = ['Season', 'Competition', 'Venue', 'Club', 'Playing_Position', 'Type', 'Goal_assist']
+
+# Columns that tell goal events apart once cleaned (all of them), for skipping rows appended twice
+EVENT_KEY = REQUIRED_COLUMNS + ['Goal_assist']
+
+
+def _repair_digits(values):
+    # the workbook has the letter O in place of zeros ('1O/11', '9O+2')
+    return values.str.replace('O', '0', regex=False)
+
+
+def clean_goals(raw):
+    """The notebook's cleaning steps, vectorized.
+
+    Drops duplicate rows and rows missing any required column, reduces
+    Goal_assist to 'Assisted'/'Not Assisted', repairs seasons Excel read as
+    dates ('2024-12-11 00:00:00' -> '11/12') and the letter O typed for zero
+    in seasons and minutes, and stores the grouping columns as categoricals.
+    """
+    df = raw.drop_duplicates().copy()
+    df['Goal_assist'] = np.where(df['Goal_assist'].notna(), 'Assisted', 'Not Assisted')
+    df = df.drop(columns=DROP_COLUMNS).dropna(subset=REQUIRED_COLUMNS)
+
+    season = df['Season'].astype(str)
+    # Excel turned seasons into dates of the year it was opened in, as day/month where it
+    # could ('11/12' -> 2024-12-11) and month/day otherwise ('12/13' -> 2024-12-13)
+    dates = pd.to_datetime(season, format='%Y-%m-%d %H:%M:%S', errors='coerce')
+    start = np.minimum(dates.dt.day, dates.dt.month)
+    repaired = start.map('{:02.0f}'.format) + '/' + (start + 1).map('{:02.0f}'.format)
+    season = season.where(dates.isna(), repaired)
+    df['Season'] = _repair_digits(season)
+    df['Minute'] = _repair_digits(df['Minute'].astype(str))
+    for column in ['Opponent', 'Result']:
+        df[column] = df[column].astype(str)
+
+    for column in CATEGORY_COLUMNS:
+        df[column] = df[column].astype('category')
+    # '02/03' < '22/23' as strings, so sorted categories are in season order
+    df['Season'] = df['Season'].cat.as_ordered().cat.reorder_categories(
+        sorted(df['Season'].cat.categories))
+    return df.reset_index(drop=True)
+
+
+class GoalDataset:
+    """The cleaned goal events, shared by all sessions."""
+
+    def __init__(self, df, path, version, load_seconds):
+        self.df = df
+        self.path = path
+        self.version = version
+        self.load_seconds = load_seconds
+
+    def summary(self):
+        return (f"{len(self.df):,} goals in {len(self.cube):,} cube cells, "
+                f"loaded in {self.load_seconds * 1000:.1f} ms")
+
+
+_lock = threading.Lock()
+_datasets = {}
+_hashes = {}
+
+
+def source_hash(path):
+    """SHA-256 of the file contents, recomputed only when its size or mtime changes."""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+    if key not in _hashes:
+        with open(path, 'rb') as f:
+            _hashes[key] = hashlib.sha256(f.read()).hexdigest()
+    return _hashes[key]
+
+
+def _parquet_metadata(path, key):
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+    except (FileNotFoundError, pa.ArrowInvalid):
+        return None
+    value = metadata.get(key)
+    return value.decode() if value else None
+
+
+def _write_parquet(df, path, metadata=None):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    if metadata:
+        table = table.replace_schema_metadata({**table.schema.metadata, **metadata})
+    tmp_path = f"{path}.tmp"
+    pq.write_table(table, tmp_path)
+    os.replace(tmp_path, path)
+
+
+def convert_to_parquet(source=SOURCE_PATH, target=PARQUET_PATH, digest=None):
+    """Read and clean the workbook, and write it out as Parquet tagged with the workbook's hash."""
+    digest = digest or source_hash(source)
+    df = clean_goals(pd.read_excel(source))
+    _write_parquet(df, target, {SOURCE_HASH_KEY: digest.encode()})
+    logger.info("Converted %s to %s (%d goals)", source, target, len(df))
+
+
+def _events_version(digest, appended_path):
+    """Changes with the workbook's hash and with every write of the appended rows."""
+    appended = ""
+    if os.path.exists(appended_path):
+        stat = os.stat(appended_path)
+        appended = f"{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(f"{digest}:{appended}".encode()).hexdigest()[:12]
+
+
+def _concat_events(current, new):
+    current, new = align_categories(current, new, CATEGORY_COLUMNS)
+    return pd.concat([current, new], ignore_index=True)
+
+
+def _new_events(current, events):
+    """Rows of `events` that aren't already among the `current` events."""
+    current, events = align_categories(current, events, CATEGORY_COLUMNS)
+    known = pd.MultiIndex.from_frame(current[EVENT_KEY])
+    return events[~pd.MultiIndex.from_frame(events[EVENT_KEY]).isin(known)]
+
+
+def _cached_cube(df, cube_path, version):
+    """The cube saved for this version of the events, or one built from them and saved."""
+    if _parquet_metadata(cube_path, EVENTS_VERSION_KEY) == version:
+        return GoalCube(pq.read_table(cube_path).to_pandas())
+    cube = GoalCube.from_events(df)
+    _write_parquet(cube.counts, cube_path, {EVENTS_VERSION_KEY: version.encode()})
+    return cube
+
+
+def _load_goals(source, parquet_path, appended_path, cube_path):
+    # callers hold _lock
+    if os.path.exists(source):
+        digest = source_hash(source)
+        if _parquet_metadata(parquet_path, SOURCE_HASH_KEY) != digest:
+            convert_to_parquet(source, parquet_path, digest)
+    elif not os.path.exists(parquet_path):
+        raise FileNotFoundError(f"Goal dataset not found: {source}")
+    else:
+        digest = _parquet_metadata(parquet_path, SOURCE_HASH_KEY) or ""
+
+    version = _events_version(digest, appended_path)
+    dataset = _datasets.get(parquet_path)
+    if dataset is not None and dataset.version == version:
+        return dataset
+
+    start = time.perf_counter()
+    df = pq.read_table(parquet_path, memory_map=True).to_pandas()
+    if os.path.exists(appended_path):
+        df = _concat_events(df, pq.read_table(appended_path).to_pandas())
+    dataset = GoalDataset(df, parquet_path, version, 0.0)
+    # Aggregated once per version of the events, so charts roll up the cube instead of the events
+    dataset.cube = _cached_cube(df, cube_path, version)
+    dataset.load_seconds = time.perf_counter() - start
+    _datasets[parquet_path] = dataset
+    logger.info("Loaded %s: %s", parquet_path, dataset.summary())
+    return dataset
+
+
+def load_goals(source=SOURCE_PATH, parquet_path=PARQUET_PATH, appended_path=APPENDED_PATH, cube_path=CUBE_PATH):
+    """Return the shared GoalDataset, converting the workbook only when its contents change."""
+    with _lock:
+        return _load_goals(source, parquet_path, appended_path, cube_path)
+
+
+def append_goals(raw, source=SOURCE_PATH, parquet_path=PARQUET_PATH, appended_path=APPENDED_PATH,
+                 cube_path=CUBE_PATH):
+    """Clean new goal rows (workbook columns), store them and count them into the cube.
+
+    Rows already among the events (say, the same file appended twice) are
+    skipped, and only the rest are aggregated. Sessions holding the previous
+    GoalDataset keep it unchanged; the next `load_goals` returns the new one.
+    """
+    cleaned = clean_goals(raw)
+    with _lock:
+        dataset = _load_goals(source, parquet_path, appended_path, cube_path)
+        events = _new_events(dataset.df, cleaned)
+        if len(events) < len(cleaned):
+            logger.info("Skipped %d goals already in the dataset", len(cleaned) - len(events))
+        if not len(events):
+            return dataset
+        appended = events
+        if os.path.exists(appended_path):
+            appended = _concat_events(pq.read_table(appended_path).to_pandas(), events)
+        _write_parquet(appended, appended_path)
+
+        digest = _parquet_metadata(parquet_path, SOURCE_HASH_KEY) or ""
+        version = _events_version(digest, appended_path)
+        cube = GoalCube(dataset.cube.counts)
+        cube.add(events)
+        _write_parquet(cube.counts, cube_path, {EVENTS_VERSION_KEY: version.encode()})
+        updated = GoalDataset(_concat_events(dataset.df, events), parquet_path, version, dataset.load_seconds)
+        updated.cube = cube
+        _datasets[parquet_path] = updated
+        logger.info("Appended %d goals to %s", len(events), appended_path)
+        return updated
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest='command', required=True)
+    append = commands.add_parser('append', help="add the goal rows of a workbook or CSV with the workbook's columns")
+    append.add_argument('source')
+    args = parser.parse_args(argv)
+
+    raw = pd.read_csv(args.source) if args.source.endswith('.csv') else pd.read_excel(args.source)
+    dataset = append_goals(raw)
+    print(f"Appended {args.source}: {dataset.summary()}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
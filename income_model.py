@@ -1,19 +1,22 @@
 import streamlit as st
-import pandas as pd
-import joblib 
-import numpy as np
-# Load your trained model using joblib
-# Load your trained model using joblib
+
+from income_pipeline import load_income_pipeline, workclass_mapping, occ_mapping
+
+# Model and fitted preprocessing are loaded once per process and shared by all sessions
+# (without a preprocessing file, inputs are preprocessed per prediction as before)
 try:
-    model = joblib.load('income_xgb_model.pkl')
-    st.write("Model loaded successfully!")
+    pipeline = load_income_pipeline(fallback=True)
 except Exception as e:
     st.write(f"Error loading model: {e}")
+    st.write("Train the model and its preprocessing together with "
+             "`python income_pipeline.py fit <census training csv>`.")
     st.stop()
 
 # Define the Streamlit app
 def main():
     st.title('Income Prediction')
+    for warning in pipeline.warnings:
+        st.warning(warning)
 
     # Create inputs for numerical columns
     age = st.number_input('Age', min_value=0, value=25)
@@ -22,78 +25,35 @@ def main():
     hours_per_week = st.number_input('Hours per Week', min_value=0, value=40)
 
     # Create inputs for categorical columns
-    workclass = st.selectbox('Workclass', ['Federal-gov', 'State-gov', 'Local-gov', 'Self-emp-inc', 'Self-emp-not-inc', 'Private', '?', 'Without-pay', 'Never-worked'])
-    occupation = st.selectbox('Occupation', ['Prof-specialty', 'Craft-repair', 'Exec-managerial', 'Machine-op-inspct', 'Tech-support', 'Transport-moving', 'Other-service', 'Handlers-cleaners', 'Sales', 'Protective-serv', 'Priv-house-serv', 'Farming-fishing', 'Adm-clerical', 'Armed-Forces', '?'])
+    workclass = st.selectbox('Workclass', list(workclass_mapping))
+    occupation = st.selectbox('Occupation', list(occ_mapping))
     relationship = st.selectbox('Relationship', ['Not-in-family', 'Husband', 'Wife', 'Own-child', 'Unmarried', 'Other-relative'])
 
     # Prepare the input data
-    data = pd.DataFrame({
-        'age': [age],
-        'capital.gain': [capital_gain],
-        'capital.loss': [capital_loss],
-        'hours.per.week': [hours_per_week],
-        'workclass': [workclass],
-        'occupation': [occupation],
-        'relationship': [relationship]
-    })
-
-    # Define mappings and encodings
-    workclass_mapping = {
-        'Federal-gov': 'Government',
-        'State-gov': 'Government',
-        'Local-gov': 'Government',
-        'Self-emp-inc': 'Self-Employed',
-        'Self-emp-not-inc': 'Self-Employed',
-        'Private': 'Private',
-        '?': '?',
-        'Without-pay': 'Unemployed',
-        'Never-worked': 'Unemployed'
-    }
-
-    occ_mapping = {
-        'Prof-specialty': 'Management & Professional',
-        'Craft-repair': 'Technical & skilled trades',
-        'Exec-managerial': 'Management & Professional',
-        'Machine-op-inspct': 'Technical & skilled trades',
-        'Tech-support': 'Technical & skilled trades',
-        'Transport-moving' : 'Technical & skilled trades',
-        'Other-service' : 'Services & Sales',
-        'Handlers-cleaners' : 'Services & Sales',
-        'Sales' : 'Services & Sales',
-        'Protective-serv' : 'Services & Sales',
-        'Priv-house-serv' : 'Services & Sales',
-        'Farming-fishing' : 'Agriculture',
-        'Adm-clerical' : 'Management & Professional',
-        'Armed-Forces' : 'Defence Service',
-        '?': '?'
+    record = {
+        'age': age,
+        'capital.gain': capital_gain,
+        'capital.loss': capital_loss,
+        'hours.per.week': hours_per_week,
+        'workclass': workclass,
+        'occupation': occupation,
+        'relationship': relationship
     }
 
-    # Map and encode
-    data['workclass'] = data['workclass'].map(workclass_mapping)
-    data['occupation'] = data['occupation'].map(occ_mapping)
-
-    le_workclass = LabelEncoder()
-    data['workclass_encoded'] = le_workclass.fit_transform(data['workclass'])
-    le_occupation = LabelEncoder()
-    data['occupation_encoded'] = le_occupation.fit_transform(data['occupation'])
-    le_relationship = LabelEncoder()
-    data['relationship_encoded'] = le_relationship.fit_transform(data['relationship'])
-
-    data = data.drop(['workclass', 'occupation', 'relationship'], axis=1)
-
-    # Scale the features
-    scaler = StandardScaler()
-    data_scaled = scaler.fit_transform(data)
-
     # Create a button to trigger prediction
     if st.button('Predict'):
         try:
-            # Make prediction
-            prediction = model.predict(data_scaled)
-            income_category = 'High Income' if prediction[0] == 1 else 'Low Income'
+            # Repeated inputs are answered from the cache, new ones transformed and predicted
+            prediction, seconds, hit = pipeline.predict_one(record)
+            income_category = 'High Income' if prediction == 1 else 'Low Income'
             st.write(f'Predicted Income Category: {income_category}')
+            st.caption(f"Predicted in {seconds * 1000:.2f} ms ({'cached' if hit else 'computed'})")
         except Exception as e:
             st.write(f"Error during prediction: {e}")
 
+    info = pipeline.cache_info()
+    st.sidebar.caption(f"Prediction cache: {info.hits:,} hits, {info.misses:,} misses, "
+                       f"{info.evictions:,} evictions, {info.currsize:,}/{info.maxsize:,} entries")
+
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,346 @@
+"""Preprocessing and model loading shared by the income prediction app and scripts.
+
+The preprocessing is fitted once on the training data and the model trained
+on its output, and both are saved side by side, so prediction only has to
+transform:
+
+    python income_pipeline.py fit adult.csv
+
+`adult.csv` is the UCI Adult census training file (adult.data) with the
+dotted column names of NUMERIC_COLUMNS/CATEGORICAL_COLUMNS and `income`.
+The shipped income_xgb_model.pkl and income_preprocessor.pkl were made this
+way. Without a preprocessing file the app falls back to
+`RowFittedPreprocessor`, the per-prediction fitting it always did, and says
+so on the page.
+"""
+import argparse
+import collections
+import os
+import threading
+import time
+
+import joblib
+import numpy as np
+import pandas as pd
+
+from compiled_trees import CompiledTrees
+
+MODEL_PATH = "income_xgb_model.pkl"
+PREPROCESSOR_PATH = "income_preprocessor.pkl"
+
+# Distinct input rows whose prediction is kept per loaded model
+PREDICTION_CACHE_SIZE = 4096
+
+# Training label: rows whose income column starts with this are the high-income class (1)
+TARGET_COLUMN = 'income'
+HIGH_INCOME = '>50K'
+
+# Gradient-boosted trees fitted by `train_income_model`
+MODEL_PARAMS = {'n_estimators': 100, 'max_depth': 6, 'learning_rate': 0.1}
+
+# Batches up to this size are scored with the compiled trees, larger ones by XGBoost itself
+# (see benchmarks/bench_income_predict.py for the crossover)
+COMPILED_MAX_ROWS = 32
+
+NUMERIC_COLUMNS = ['age', 'capital.gain', 'capital.loss', 'hours.per.week']
+CATEGORICAL_COLUMNS = ['workclass', 'occupation', 'relationship']
+
+workclass_mapping = {
+    'Federal-gov': 'Government',
+    'State-gov': 'Government',
+    'Local-gov': 'Government',
+    'Self-emp-inc': 'Self-Employed',
+    'Self-emp-not-inc': 'Self-Employed',
+    'Private': 'Private',
+    '?': '?',
+    'Without-pay': 'Unemployed',
+    'Never-worked': 'Unemployed'
+}
+
+occ_mapping = {
+    'Prof-specialty': 'Management & Professional',
+    'Craft-repair': 'Technical & skilled trades',
+    'Exec-managerial': 'Management & Professional',
+    'Machine-op-inspct': 'Technical & skilled trades',
+    'Tech-support': 'Technical & skilled trades',
+    'Transport-moving': 'Technical & skilled trades',
+    'Other-service': 'Services & Sales',
+    'Handlers-cleaners': 'Services & Sales',
+    'Sales': 'Services & Sales',
+    'Protective-serv': 'Services & Sales',
+    'Priv-house-serv': 'Services & Sales',
+    'Farming-fishing': 'Agriculture',
+    'Adm-clerical': 'Management & Professional',
+    'Armed-Forces': 'Defence Service',
+    '?': '?'
+}
+
+# Raw census values are grouped before encoding
+CATEGORY_MAPPINGS = {
+    'workclass': workclass_mapping,
+    'occupation': occ_mapping,
+}
+
+
+def map_categories(data):
+    """Group workclass/occupation the way the model was trained (works on any number of rows)."""
+    data = data.copy()
+    for column, mapping in CATEGORY_MAPPINGS.items():
+        data[column] = data[column].map(mapping)
+    return data
+
+
+class IncomePreprocessor:
+    """Label encoding plus standard scaling, fitted once on the training data.
+
+    Same results as fitting a LabelEncoder per categorical column (classes in
+    sorted order) followed by a StandardScaler over all feature columns.
+    """
+
+    fitted = True
+
+    def __init__(self, categories, mean, scale,
+                 numeric_columns=NUMERIC_COLUMNS, categorical_columns=CATEGORICAL_COLUMNS):
+        self.categories = categories
+        self.mean = np.asarray(mean, dtype=np.float64)
+        self.scale = np.asarray(scale, dtype=np.float64)
+        self.numeric_columns = list(numeric_columns)
+        self.categorical_columns = list(categorical_columns)
+
+    @property
+    def feature_names(self):
+        return self.numeric_columns + [f"{column}_encoded" for column in self.categorical_columns]
+
+    @classmethod
+    def fit(cls, train, numeric_columns=NUMERIC_COLUMNS, categorical_columns=CATEGORICAL_COLUMNS):
+        train = map_categories(train)
+        categories = {column: sorted(train[column].dropna().unique().tolist())
+                      for column in categorical_columns}
+        preprocessor = cls(categories, np.zeros(0), np.ones(0), numeric_columns, categorical_columns)
+        features = preprocessor.encode(train)
+        scale = features.std(axis=0)
+        scale[scale == 0] = 1.0
+        preprocessor.mean, preprocessor.scale = features.mean(axis=0), scale
+        return preprocessor
+
+    def encode(self, data):
+        """Numeric columns plus category codes, as a float matrix (data already mapped)."""
+        columns = [data[column].to_numpy(dtype=np.float64) for column in self.numeric_columns]
+        for column in self.categorical_columns:
+            codes = pd.Categorical(data[column], categories=self.categories[column]).codes
+            if (codes < 0).any():
+                unknown = sorted(set(data[column][codes < 0].astype(str)))
+                raise ValueError(f"Unknown {column} values: {', '.join(unknown)}")
+            columns.append(codes.astype(np.float64))
+        return np.column_stack(columns)
+
+    def known_rows(self, data):
+        """Rows whose categorical values are all known after mapping; `transform` raises on any other."""
+        data = map_categories(data)
+        known = np.ones(len(data), dtype=bool)
+        for column in self.categorical_columns:
+            known &= pd.Categorical(data[column], categories=self.categories[column]).codes >= 0
+        return known
+
+    def transform(self, data):
+        """Map, encode and scale raw input rows into model features."""
+        return (self.encode(map_categories(data)) - self.mean) / self.scale
+
+    def save(self, path=PREPROCESSOR_PATH):
+        joblib.dump(self, path)
+
+
+class RowFittedPreprocessor(IncomePreprocessor):
+    """Fallback for a missing preprocessing file: fitted on the rows it transforms.
+
+    This is what the app did before the preprocessing was saved, so a single
+    row always encodes and scales to zeros; predictions only become
+    meaningful once `python income_pipeline.py fit` has been run.
+    """
+
+    fitted = False
+
+    def __init__(self, numeric_columns=NUMERIC_COLUMNS, categorical_columns=CATEGORICAL_COLUMNS):
+        super().__init__({column: [] for column in categorical_columns}, np.zeros(0), np.ones(0),
+                         numeric_columns, categorical_columns)
+
+    def known_rows(self, data):
+        return map_categories(data)[self.categorical_columns].notna().all(axis=1).to_numpy()
+
+    def transform(self, data):
+        return IncomePreprocessor.fit(data, self.numeric_columns, self.categorical_columns).transform(data)
+
+
+CacheInfo = collections.namedtuple('CacheInfo', 'hits misses evictions maxsize currsize')
+
+
+class PredictionCache:
+    """Thread-safe LRU of predictions keyed on normalized input rows."""
+
+    def __init__(self, maxsize=PREDICTION_CACHE_SIZE):
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._items = collections.OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def get(self, key):
+        with self._lock:
+            if key in self._items:
+                self._items.move_to_end(key)
+                self.hits += 1
+                return self._items[key]
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.maxsize:
+                self._items.popitem(last=False)
+                self.evictions += 1
+
+    def info(self):
+        return CacheInfo(self.hits, self.misses, self.evictions, self.maxsize, len(self._items))
+
+
+class IncomePipeline:
+    """The trained model with its preprocessing, loaded once per process.
+
+    Single-row predictions are cached per pipeline, so a new model or
+    preprocessing file (which loads a new pipeline) starts with an empty cache.
+    With the `RowFittedPreprocessor` fallback, problems that would stop a
+    fitted pipeline from loading are listed in `warnings` instead, and
+    predictions report them when they fail.
+    """
+
+    def __init__(self, model, preprocessor, version, cache_size=PREDICTION_CACHE_SIZE):
+        self.warnings = []
+        if not preprocessor.fitted:
+            self.warnings.append(f"No fitted preprocessing ({PREPROCESSOR_PATH}): inputs are encoded and scaled "
+                                 f"on their own, so predictions are not meaningful. Train both with "
+                                 f"`python income_pipeline.py fit <census training csv>`.")
+        expected = getattr(model, 'n_features_in_', None)
+        names = getattr(model, 'feature_names_in_', None)
+        message = None
+        if expected is not None and expected != len(preprocessor.feature_names):
+            message = (f"The model expects {expected} features but the preprocessor "
+                       f"produces {len(preprocessor.feature_names)}: {preprocessor.feature_names}")
+        elif names is not None and list(names) != preprocessor.feature_names:
+            message = (f"The model was trained on {list(names)} but the preprocessor "
+                       f"produces {preprocessor.feature_names}")
+        if message is not None:
+            if preprocessor.fitted:
+                raise ValueError(message)
+            self.warnings.append(message)
+        self.model = model
+        self.preprocessor = preprocessor
+        self.version = version
+        self.cache = PredictionCache(cache_size)
+        try:
+            self.trees = CompiledTrees.from_model(model)
+        except (AttributeError, ValueError):
+            self.trees = None  # not an XGBoost tree model we can compile, use predict()
+
+    def predict_features(self, X):
+        if self.trees is not None and len(X) <= COMPILED_MAX_ROWS:
+            prediction = self.trees.predict(X)
+            classes = getattr(self.model, 'classes_', None)
+            return prediction if classes is None else np.asarray(classes)[prediction]
+        return self.model.predict(X)
+
+    def predict(self, data):
+        """Predicted income class (1 = high income) per input row, with the time it took."""
+        start = time.perf_counter()
+        prediction = self.predict_features(self.preprocessor.transform(data))
+        return prediction, time.perf_counter() - start
+
+    def cache_key(self, record):
+        """Input row as a hashable tuple: numbers as floats, categories as stripped strings."""
+        return (tuple(float(record[column]) for column in self.preprocessor.numeric_columns)
+                + tuple(str(record[column]).strip() for column in self.preprocessor.categorical_columns))
+
+    def predict_one(self, record):
+        """Prediction for one input row (a dict of raw column values) via the cache.
+
+        Returns (prediction, seconds, cache hit).
+        """
+        start = time.perf_counter()
+        key = self.cache_key(record)
+        prediction = self.cache.get(key)
+        hit = prediction is not None
+        if not hit:
+            columns = self.preprocessor.numeric_columns + self.preprocessor.categorical_columns
+            data = pd.DataFrame([key], columns=columns)
+            prediction = self.predict_features(self.preprocessor.transform(data))[0]
+            self.cache.put(key, prediction)
+        return prediction, time.perf_counter() - start, hit
+
+    def cache_info(self):
+        return self.cache.info()
+
+
+_lock = threading.Lock()
+_pipelines = {}
+
+
+def _file_version(*paths):
+    return tuple(os.stat(path).st_mtime_ns if os.path.exists(path) else None for path in paths)
+
+
+def load_income_pipeline(model_path=MODEL_PATH, preprocessor_path=PREPROCESSOR_PATH, fallback=False):
+    """Return the shared IncomePipeline, reloading it only when a file changes.
+
+    A missing preprocessing file raises FileNotFoundError, or with `fallback`
+    loads the model with a `RowFittedPreprocessor` (until the file appears).
+    """
+    with _lock:
+        version = _file_version(model_path, preprocessor_path)
+        key = (os.path.abspath(model_path), os.path.abspath(preprocessor_path), fallback)
+        pipeline = _pipelines.get(key)
+        if pipeline is None or pipeline.version != version:
+            if fallback and not os.path.exists(preprocessor_path):
+                preprocessor = RowFittedPreprocessor()
+            else:
+                preprocessor = joblib.load(preprocessor_path)
+            pipeline = IncomePipeline(joblib.load(model_path), preprocessor, version)
+            _pipelines[key] = pipeline
+        return pipeline
+
+
+def train_income_model(train, params=MODEL_PARAMS):
+    """Fit the preprocessing on `train` and an XGBoost classifier on its output.
+
+    Returns (model, preprocessor), a matching pair for IncomePipeline.
+    """
+    import xgboost as xgb
+
+    train = train.dropna(subset=NUMERIC_COLUMNS + CATEGORICAL_COLUMNS + [TARGET_COLUMN])
+    preprocessor = IncomePreprocessor.fit(train)
+    labels = train[TARGET_COLUMN].astype(str).str.strip().str.startswith(HIGH_INCOME).astype(int)
+    model = xgb.XGBClassifier(**params, random_state=0).fit(preprocessor.transform(train), labels)
+    return model, preprocessor
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fit and save the income model and its preprocessing.")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    fit = subparsers.add_parser('fit', help="train on a census CSV with the model's columns and `income`")
+    fit.add_argument('train_csv')
+    fit.add_argument('--model-output', default=MODEL_PATH)
+    fit.add_argument('--output', default=PREPROCESSOR_PATH, help="where the preprocessing is saved")
+    args = parser.parse_args(argv)
+
+    train = pd.read_csv(args.train_csv, skipinitialspace=True)
+    model, preprocessor = train_income_model(train)
+    joblib.dump(model, args.model_output)
+    preprocessor.save(args.output)
+    print(f"Trained on {len(train):,} rows: model in {args.model_output}, "
+          f"preprocessing in {args.output}: {preprocessor.feature_names}")
+
+
+if __name__ == '__main__':
+    # run from the importable module, so the saved preprocessor pickles as income_pipeline.IncomePreprocessor
+    import income_pipeline
+
+    income_pipeline.main()
@@ -0,0 +1,80 @@
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Rows of a presorted view checked per step while collecting the top k
+CHUNK_SIZE = 4096
+
+
+class TopKQueries:
+    """Top-k player queries over presorted column views.
+
+    Each sort column is argsorted once per dataset. A query walks that order
+    in chunks, applies the filters to the chunk only and stops as soon as it
+    has k players, so small k with loose filters touches a few thousand rows
+    regardless of dataset size. Results are memoized per parameter set in a
+    bounded LRU.
+    """
+
+    def __init__(self, df, cache_size=256):
+        self.df = df
+        self._views = {}
+        self.value = df['value_eur'].to_numpy()
+        self.age = df['age'].to_numpy()
+        self.league_codes, self.leagues = pd.factorize(df['league_name'], sort=True)
+        self.top_k = lru_cache(maxsize=cache_size)(self._top_k)
+
+    def view(self, column):
+        """Row positions sorted by `column`, highest first (built on first use).
+
+        Rows with a missing or infinite value are left out, so a player
+        without an undervaluation score never pads out a short result.
+        """
+        if column not in self._views:
+            values = self.df[column].to_numpy(dtype=np.float64, na_value=np.nan)
+            rows = np.flatnonzero(np.isfinite(values))
+            self._views[column] = rows[np.argsort(-values[rows], kind='stable')]
+        return self._views[column]
+
+    def _chunk_mask(self, rows, max_value, age_range, league_codes):
+        mask = np.ones(len(rows), dtype=bool)
+        if max_value is not None:
+            mask &= self.value[rows] < max_value
+        if age_range is not None:
+            age = self.age[rows]
+            mask &= (age >= age_range[0]) & (age <= age_range[1])
+        if league_codes is not None:
+            mask &= np.isin(self.league_codes[rows], league_codes)
+        return mask
+
+    def _top_k(self, column, k=10, max_value=None, age_range=None, leagues=None):
+        league_codes = None
+        if leagues is not None:
+            league_codes = np.flatnonzero(np.isin(self.leagues, list(leagues)))
+
+        order = self.view(column)
+        found = []
+        remaining = k
+        for start in range(0, len(order), CHUNK_SIZE):
+            rows = order[start:start + CHUNK_SIZE]
+            rows = rows[self._chunk_mask(rows, max_value, age_range, league_codes)]
+            found.append(rows[:remaining])
+            remaining -= len(found[-1])
+            if remaining <= 0:
+                break
+        result = np.concatenate(found) if found else np.empty(0, dtype=np.int64)
+        # cached results are shared between sessions, so hand out read-only arrays
+        result.setflags(write=False)
+        return result
+
+    def top_valued(self, k=10, age_range=None, leagues=None):
+        """The k most valuable players."""
+        return self.top_k('value_eur', k, age_range=age_range, leagues=leagues)
+
+    def undervalued(self, k=10, max_value=20_000_000, age_range=None, leagues=None):
+        """The k players most undervalued by the fair-value model, valued under `max_value`."""
+        return self.top_k('undervaluation', k, max_value=max_value, age_range=age_range, leagues=leagues)
+
+    def cache_info(self):
+        return self.top_k.cache_info()
@@ -0,0 +1,180 @@
+"""Hot-path timers and session memory snapshots for the Streamlit apps.
+
+Off unless the FIFA_METRICS environment variable is set, to one of
+
+    FIFA_METRICS=jsonl:metrics.jsonl     one JSON object per line, rotated by size
+    FIFA_METRICS=prometheus:9464         Prometheus text format on http://<host>:9464/metrics
+
+While it is off, `timer()` hands back one shared no-op context manager and
+`snapshot_session()` returns straight away, so instrumented code costs a
+function call.
+"""
+import json
+import logging
+import logging.handlers
+import os
+import sys
+import threading
+import time
+
+ENV_VAR = "FIFA_METRICS"
+
+# Size at which the JSON-lines file is rotated, and how many old files are kept
+JSONL_MAX_BYTES = 10 << 20
+JSONL_BACKUPS = 5
+
+# Histogram buckets for timed operations (seconds) and session state sizes (bytes)
+SECONDS_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+BYTES_BUCKETS = tuple(2 ** power for power in range(10, 33, 2))
+
+logger = logging.getLogger(__name__)
+
+
+class _NullTimer:
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+NULL_TIMER = _NullTimer()
+
+
+class Timer:
+    """Times a `with` block and reports it to the sink, also when the block raises."""
+
+    __slots__ = ('sink', 'operation', 'name', 'start')
+
+    def __init__(self, sink, operation, name):
+        self.sink = sink
+        self.operation = operation
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.sink.observe(self.operation, self.name, time.perf_counter() - self.start, exc_type is not None)
+        return False
+
+
+class JsonLinesSink:
+    """Appends events to a size-rotated JSON-lines file."""
+
+    def __init__(self, path, max_bytes=JSONL_MAX_BYTES, backups=JSONL_BACKUPS):
+        self.path = path
+        self._log = logging.getLogger(f"{__name__}.jsonl")
+        self._log.propagate = False
+        self._log.setLevel(logging.INFO)
+        handler = logging.handlers.RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups,
+                                                       encoding='utf-8')
+        handler.setFormatter(logging.Formatter('%(message)s'))
+        self._log.addHandler(handler)
+
+    def _write(self, event):
+        self._log.info(json.dumps({'time': round(time.time(), 3), 'pid': os.getpid(), **event}))
+
+    def observe(self, operation, name, seconds, failed):
+        self._write({'event': 'timer', 'operation': operation, 'name': name,
+                     'seconds': round(seconds, 6), 'failed': failed})
+
+    def memory(self, session, page, rss_bytes, state_bytes):
+        self._write({'event': 'memory', 'session': session, 'page': page,
+                     'rss_bytes': rss_bytes, 'state_bytes': state_bytes})
+
+
+class PrometheusSink:
+    """Histograms and gauges served in the Prometheus text format."""
+
+    def __init__(self, port, addr='0.0.0.0'):
+        import prometheus_client
+
+        self.port = port
+        self.seconds = prometheus_client.Histogram(
+            'fifa_operation_seconds', "Time spent in instrumented operations",
+            ['operation', 'name'], buckets=SECONDS_BUCKETS)
+        self.failures = prometheus_client.Counter(
+            'fifa_operation_failures', "Instrumented operations that raised", ['operation', 'name'])
+        self.rss = prometheus_client.Gauge('fifa_process_rss_bytes', "Resident memory of the app process")
+        # one series per session would grow without bound, so sessions feed a distribution
+        self.state = prometheus_client.Histogram(
+            'fifa_session_state_bytes', "Approximate size of a session's state, per snapshot",
+            ['page'], buckets=BYTES_BUCKETS)
+        prometheus_client.start_http_server(port, addr=addr)
+
+    def observe(self, operation, name, seconds, failed):
+        self.seconds.labels(operation, name).observe(seconds)
+        if failed:
+            self.failures.labels(operation, name).inc()
+
+    def memory(self, session, page, rss_bytes, state_bytes):
+        self.rss.set(rss_bytes)
+        self.state.labels(page).observe(state_bytes)
+
+
+def create_sink(spec):
+    """The sink a FIFA_METRICS value asks for, or None when it is empty."""
+    if not spec:
+        return None
+    kind, _, target = spec.partition(':')
+    if kind == 'jsonl':
+        return JsonLinesSink(target or 'metrics.jsonl')
+    if kind == 'prometheus':
+        return PrometheusSink(int(target or 9464))
+    raise ValueError(f"{ENV_VAR} must be 'jsonl:<path>' or 'prometheus:<port>', got {spec!r}")
+
+
+_lock = threading.Lock()
+_sink = None
+_configured = False
+
+
+def configure(spec=None):
+    """Set up the sink from `spec` (default: the environment). Once per process; returns the sink."""
+    global _sink, _configured
+    with _lock:
+        if not _configured:
+            _sink = create_sink(os.environ.get(ENV_VAR) if spec is None else spec)
+            _configured = True
+            if _sink is not None:
+                logger.info("Metrics enabled: %s", type(_sink).__name__)
+        return _sink
+
+
+def enabled():
+    return _sink is not None
+
+
+def timer(operation, name=''):
+    """Context manager timing the block as `operation` (e.g. 'search') on `name` (e.g. a page)."""
+    if _sink is None:
+        return NULL_TIMER
+    return Timer(_sink, operation, name)
+
+
+def _approx_size(value):
+    if hasattr(value, 'memory_usage'):  # DataFrames and Series
+        usage = value.memory_usage(index=True)
+        return int(usage.sum() if hasattr(usage, 'sum') else usage)
+    if hasattr(value, 'nbytes'):  # NumPy arrays
+        return int(value.nbytes)
+    if isinstance(value, dict):
+        return sys.getsizeof(value) + sum(_approx_size(key) + _approx_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple, set)):
+        return sys.getsizeof(value) + sum(_approx_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+def snapshot_session(session, state, page=''):
+    """Record process RSS and the approximate size of one session's state (a mapping)."""
+    if _sink is None:
+        return
+    import psutil
+
+    state_bytes = sum(_approx_size(key) + _approx_size(value) for key, value in dict(state).items())
+    _sink.memory(session, page, psutil.Process().memory_info().rss, state_bytes)
+
+
+configure()
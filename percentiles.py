@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+
+from similarity import ATTRIBUTES
+
+
+class PercentileMatrix:
+    """Percentile of every attribute within each player's main position group.
+
+    Ranked once per dataset load with a single grouped rank, so looking up
+    any set of players is a row gather. Missing attributes stay NaN.
+    """
+
+    def __init__(self, df, primary_group, columns=ATTRIBUTES):
+        self.columns = list(columns)
+        ranks = df[self.columns].groupby(np.asarray(primary_group)).rank(pct=True)
+        self.values = (ranks.to_numpy(dtype=np.float64) * 100).astype(np.float32)
+
+    def rows(self, positions):
+        """Percentiles (players x attributes) for the given row positions."""
+        return self.values[np.asarray(positions)]
+
+    def frame(self, positions):
+        return pd.DataFrame(self.rows(positions), columns=self.columns)
@@ -0,0 +1,142 @@
+import hashlib
+import logging
+import os
+import threading
+import time
+from functools import cached_property
+
+import pandas as pd
+import pyarrow.parquet as pq
+
+from compaction import CATEGORY_COLUMNS, compact_players
+from fair_value import add_fair_value
+from market_queries import TopKQueries
+from percentiles import PercentileMatrix
+from player_filter import FilterIndex
+from player_index import PlayerIdIndex, ensure_player_id, stable_id_column
+from positions import PositionIndex
+from search_index import SearchIndex
+from similarity import SimilarityIndex
+
+logger = logging.getLogger(__name__)
+
+# The cleaned dataset as exported from the notebook, and the columnar copy
+# every session actually reads from
+SOURCE_PATH = "fifa_data.pkl"
+PARQUET_PATH = "fifa_data.parquet"
+
+# Columns shown for a player in result lists (the API, and pages that can switch seasons)
+PLAYER_COLUMNS = ['player_id', 'short_name', 'long_name', 'age', 'nationality', 'club_name', 'league_name',
+                  'overall', 'potential', 'value_eur', 'wage_eur', 'player_positions',
+                  'pace', 'shooting', 'passing', 'dribbling', 'defending', 'physic']
+
+
+class PlayerDataset:
+    """One loaded snapshot of the player table, shared by all sessions.
+
+    `id_column` is the export's own id column `player_id` was taken from, or
+    None when the ids are row numbers that mean nothing outside this file.
+    """
+
+    def __init__(self, df, path, version, load_seconds, id_column=None):
+        self.df = df
+        self.path = path
+        self.version = version
+        self.load_seconds = load_seconds
+        self.id_column = id_column
+
+    @cached_property
+    def players(self):
+        return PlayerIdIndex(self.df)
+
+    @cached_property
+    def positions(self):
+        return PositionIndex(self.df['player_positions'])
+
+    @cached_property
+    def percentiles(self):
+        return PercentileMatrix(self.df, self.positions.primary_group)
+
+    @cached_property
+    def market(self):
+        return TopKQueries(self.df)
+
+    @cached_property
+    def search_index(self):
+        return SearchIndex(self.df)
+
+    @cached_property
+    def similarity(self):
+        return SimilarityIndex(self.df)
+
+    @cached_property
+    def filters(self):
+        return FilterIndex(self.df, self.positions)
+
+    @property
+    def nbytes(self):
+        return int(self.df.memory_usage(deep=True).sum())
+
+    def summary(self):
+        nbytes = self.nbytes
+        return (f"{len(self.df):,} players, {nbytes / 1e6:.1f} MB in memory "
+                f"({nbytes / max(len(self.df), 1):.0f} B/row), "
+                f"loaded in {self.load_seconds:.2f}s")
+
+
+_lock = threading.Lock()
+_datasets = {}
+
+
+def _file_version(path):
+    stat = os.stat(path)
+    key = f"{os.path.abspath(path)}:{stat.st_size}:{stat.st_mtime_ns}"
+    return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+
+def convert_to_parquet(source=SOURCE_PATH, target=PARQUET_PATH):
+    """Write the pickled DataFrame out as Parquet (done once per source change)."""
+    df = pd.read_pickle(source)
+    tmp_path = f"{target}.tmp"
+    df.reset_index(drop=True).to_parquet(tmp_path, engine="pyarrow", index=False)
+    os.replace(tmp_path, target)
+    logger.info("Converted %s to %s (%d rows)", source, target, len(df))
+
+
+def _ensure_parquet(source, target):
+    if not os.path.exists(source):
+        if os.path.exists(target):
+            return
+        raise FileNotFoundError(f"Player dataset not found: {source}")
+    if not os.path.exists(target) or os.path.getmtime(target) < os.path.getmtime(source):
+        convert_to_parquet(source, target)
+
+
+def load_players(source=SOURCE_PATH, parquet_path=PARQUET_PATH):
+    """Return the shared PlayerDataset, loading it on first use.
+
+    The Parquet file is memory-mapped, and the result is kept for the whole
+    process so Streamlit reruns and new sessions only pay for a stat() call.
+    A changed file on disk is picked up as a new dataset version.
+    """
+    with _lock:
+        _ensure_parquet(source, parquet_path)
+        version = _file_version(parquet_path)
+        dataset = _datasets.get(parquet_path)
+        if dataset is not None and dataset.version == version:
+            return dataset
+
+        start = time.perf_counter()
+        # Low-cardinality text comes back dictionary-encoded, straight into categoricals
+        columns = pq.read_schema(parquet_path).names
+        table = pq.read_table(parquet_path, memory_map=True,
+                              read_dictionary=[column for column in CATEGORY_COLUMNS if column in columns])
+        df = compact_players(table.to_pandas())
+        id_column = stable_id_column(df)
+        dataset = PlayerDataset(ensure_player_id(df), parquet_path, version, 0.0, id_column)
+        # Batch-score every player once per load so pages only rank by the stored score
+        dataset.fair_value_model = add_fair_value(df, dataset.positions.primary_group)
+        dataset.load_seconds = time.perf_counter() - start
+        _datasets[parquet_path] = dataset
+        logger.info("Loaded %s: %s", parquet_path, dataset.summary())
+        return dataset
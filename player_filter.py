@@ -0,0 +1,221 @@
+import collections
+import math
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+
+# Numeric columns a filter can bound, each with a presorted index
+RANGE_COLUMNS = ['age', 'overall', 'potential', 'value_eur', 'wage_eur',
+                 'pace', 'shooting', 'passing', 'dribbling', 'defending', 'physic']
+
+# Text columns a filter can restrict to a set of values, each with per-value bitmaps
+CATEGORY_COLUMNS = ['league_name', 'nationality', 'club_name']
+
+# Packed per-value bitmaps kept per category column (n/8 bytes each)
+BITMAP_CACHE_SIZE = 256
+
+# One condition of a query: how many rows it keeps, the rows themselves,
+# and a test of given rows (a boolean array over them)
+Predicate = collections.namedtuple('Predicate', 'label size rows test')
+
+
+class RangeIndex:
+    """Row positions of one numeric column in ascending order, missing values last.
+
+    A range is a binary search on the sorted values, so its size is known
+    before any row is touched and its rows are one contiguous slice.
+    """
+
+    def __init__(self, values):
+        self.values = values
+        self.order = np.argsort(values, kind='stable').astype(np.int32)
+        self.sorted = values[self.order]
+        self.valid = int(np.searchsorted(self.sorted, np.nan)) if values.dtype.kind == 'f' else len(values)
+        self._ranks = {}
+
+    def ranking(self, descending=False):
+        """Rows in sort order and the position of every row in it, ties by row, missing values last.
+
+        Built on first use per direction, for sorting by this column.
+        """
+        if descending not in self._ranks:
+            order = np.argsort(-self.values.astype(np.float64), kind='stable').astype(np.int32) if descending \
+                else self.order
+            rank = np.empty(len(order), dtype=np.int32)
+            rank[order] = np.arange(len(order), dtype=np.int32)
+            self._ranks[descending] = order, rank
+        return self._ranks[descending]
+
+    def sort(self, rows, descending=False):
+        """`rows` sorted by this column.
+
+        Ranks are distinct, so one unstable integer sort gives the same order
+        as a stable sort of the values.
+        """
+        order, rank = self.ranking(descending)
+        return order[np.sort(rank[rows])]
+
+    def _search(self, key, side):
+        # searched as the column's own type; a Python number would first cast every value
+        dtype = self.sorted.dtype
+        if dtype.kind in 'iu':
+            key = math.ceil(key) if side == 'left' else math.floor(key)
+            info = np.iinfo(dtype)
+            if key > info.max:
+                return self.valid
+            if key < info.min:
+                return 0
+        return int(np.searchsorted(self.sorted[:self.valid], dtype.type(key), side=side))
+
+    def bounds(self, low=None, high=None):
+        """Start and stop in `order` of the rows with low <= value <= high."""
+        start = 0 if low is None else self._search(low, 'left')
+        stop = self.valid if high is None else self._search(high, 'right')
+        return start, max(start, stop)
+
+    def limits(self):
+        """Smallest and largest value, or None for a column without values."""
+        if not self.valid:
+            return None
+        return self.sorted[0].item(), self.sorted[self.valid - 1].item()
+
+    def predicate(self, column, low=None, high=None):
+        start, stop = self.bounds(low, high)
+        conditions = []
+        if low is not None:
+            conditions.append(f"{column} >= {low}")
+        if high is not None:
+            conditions.append(f"{column} <= {high}")
+        # the slice is in value order; in row order the other conditions read memory sequentially
+        return Predicate(' and '.join(conditions) or f"{column} known", stop - start,
+                         lambda: np.sort(self.order[start:stop]), lambda rows: self.test(rows, low, high))
+
+    def test(self, rows, low=None, high=None):
+        values = self.values[rows]
+        keep = ~np.isnan(values) if self.values.dtype.kind == 'f' else np.ones(len(rows), dtype=bool)
+        if low is not None:
+            keep &= values >= low
+        if high is not None:
+            keep &= values <= high
+        return keep
+
+
+class CategoryIndex:
+    """Posting lists and packed bitmaps per value of one text column.
+
+    The posting lists (rows of each value, one argsort of the codes) give a
+    value set's size and rows without a scan; a bitmap answers membership
+    for any rows in O(1) each.
+    """
+
+    def __init__(self, series):
+        values = series if isinstance(series.dtype, pd.CategoricalDtype) else series.astype('category')
+        self.categories = values.cat.categories
+        self.code_of = {value: code for code, value in enumerate(self.categories)}
+        self.codes = values.cat.codes.to_numpy()
+        self.order = np.argsort(self.codes, kind='stable').astype(np.int32)
+        # slot 0 counts missing values (code -1), value i lives in slot i + 1
+        self.offsets = np.concatenate([[0], np.cumsum(np.bincount(self.codes + 1,
+                                                                  minlength=len(self.categories) + 1))])
+        self.bitmap = lru_cache(maxsize=BITMAP_CACHE_SIZE)(self._bitmap)
+
+    def value_codes(self, values):
+        """Codes of `values`, skipping any that don't occur in the column."""
+        return np.array(sorted({self.code_of[value] for value in values if value in self.code_of}), dtype=np.intp)
+
+    def count(self, codes):
+        return int((self.offsets[codes + 2] - self.offsets[codes + 1]).sum())
+
+    def rows(self, codes):
+        return np.concatenate([self.order[self.offsets[code + 1]:self.offsets[code + 2]] for code in codes] or
+                              [np.empty(0, dtype=np.int32)])
+
+    def predicate(self, column, values):
+        codes = self.value_codes(values)
+        return Predicate(f"{column} in {', '.join(map(str, values))}", self.count(codes),
+                         lambda: self.rows(codes), lambda rows: self.test(rows, codes))
+
+    def _bitmap(self, code):
+        bits = np.zeros(len(self.codes), dtype=bool)
+        bits[self.order[self.offsets[code + 1]:self.offsets[code + 2]]] = True
+        bitmap = np.packbits(bits)
+        bitmap.setflags(write=False)
+        return bitmap
+
+    def test(self, rows, codes):
+        if not len(codes):
+            return np.zeros(len(rows), dtype=bool)
+        bitmap = self.bitmap(int(codes[0]))
+        for code in codes[1:]:
+            bitmap = bitmap | self.bitmap(int(code))
+        return (bitmap[rows >> 3] & (np.uint8(128) >> (rows & 7).astype(np.uint8))) != 0
+
+
+class FilterIndex:
+    """Multi-column player filters answered from per-column indexes.
+
+    Every condition first reports how many rows it keeps (a binary search or
+    a posting-list length, no scan); the smallest one produces the candidate
+    rows and the others only test those candidates, smallest first, so the
+    work follows the most selective condition rather than the dataset size.
+    Indexes are built per column on first use. Sorted results are memoized
+    per query in a bounded LRU, pages are slices of them.
+    """
+
+    def __init__(self, df, positions, cache_size=64):
+        self.df = df
+        self.positions = positions
+        self._ranges = {}
+        self._categories = {}
+        self._group_rows = {}
+        self.query = lru_cache(maxsize=cache_size)(self._query)
+
+    def range_index(self, column):
+        if column not in self._ranges:
+            self._ranges[column] = RangeIndex(self.df[column].to_numpy())
+        return self._ranges[column]
+
+    def category_index(self, column):
+        if column not in self._categories:
+            self._categories[column] = CategoryIndex(self.df[column])
+        return self._categories[column]
+
+    def _group_predicate(self, groups):
+        masks = [self.positions.group_mask(group) for group in groups]
+        mask = masks[0] if len(masks) == 1 else np.logical_or.reduce(masks)
+        if groups not in self._group_rows:
+            self._group_rows[groups] = np.flatnonzero(mask).astype(np.int32)
+        rows = self._group_rows[groups]
+        return Predicate(f"position in {', '.join(groups)}", len(rows), lambda: rows, lambda r: mask[r])
+
+    def predicates(self, ranges=(), categories=(), groups=()):
+        """The query's conditions, smallest first."""
+        predicates = [self.range_index(column).predicate(column, low, high) for column, low, high in ranges]
+        predicates += [self.category_index(column).predicate(column, values) for column, values in categories]
+        if groups:
+            predicates.append(self._group_predicate(tuple(groups)))
+        return sorted(predicates, key=lambda predicate: predicate.size)
+
+    def match(self, ranges=(), categories=(), groups=()):
+        """Row positions (in no particular order) of the players meeting every condition."""
+        predicates = self.predicates(ranges, categories, groups)
+        if not predicates:
+            return np.arange(len(self.df))
+        # intp rows index without a conversion, and np.compress beats a boolean index
+        # on the scattered masks the tests give
+        rows = predicates[0].rows().astype(np.intp)
+        for predicate in predicates[1:]:
+            if not len(rows):
+                break
+            rows = np.compress(predicate.test(rows), rows)
+        return rows
+
+    def _query(self, ranges=(), categories=(), groups=(), sort_by='overall', descending=True):
+        result = self.range_index(sort_by).sort(self.match(ranges, categories, groups), descending)
+        # cached results are shared between sessions, so hand out read-only arrays
+        result.setflags(write=False)
+        return result
+
+    def cache_info(self):
+        return self.query.cache_info()
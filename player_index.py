@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+# Columns that already hold a stable player id in the FIFA exports, in order of preference
+ID_COLUMNS = ('player_id', 'sofifa_id')
+
+
+def stable_id_column(df):
+    """The column of `df` holding the export's own player id, or None when it has none."""
+    for column in ID_COLUMNS:
+        if column in df.columns:
+            return column
+    return None
+
+
+def ensure_player_id(df):
+    """Make sure `df` has a unique `player_id` column.
+
+    Uses the export's own id when there is one, otherwise the row number of
+    the cleaned dataset (stable for as long as that file doesn't change, but
+    not across editions: check `stable_id_column` before matching by id).
+    """
+    column = stable_id_column(df)
+    if column == 'player_id':
+        return df
+    df['player_id'] = df[column] if column is not None else np.arange(len(df), dtype=np.int64)
+    return df
+
+
+class PlayerIdIndex:
+    """Hash index from `player_id` to row position, with O(1) row access."""
+
+    def __init__(self, df):
+        self.df = df
+        self.ids = df['player_id'].to_numpy()
+        self._positions = pd.Index(self.ids)
+        if not self._positions.is_unique:
+            raise ValueError("player_id values must be unique")
+        # the column arrays themselves, to_numpy() would make a Python string per player
+        self._short_name = df['short_name'].array
+        self._club_name = df['club_name'].array
+        self._age = df['age'].to_numpy()
+
+    def __len__(self):
+        return len(self.ids)
+
+    def __contains__(self, player_id):
+        return player_id in self._positions
+
+    def position(self, player_id):
+        return self._positions.get_loc(player_id)
+
+    def positions(self, player_ids):
+        positions = self._positions.get_indexer(player_ids)
+        if (positions < 0).any():
+            raise KeyError([pid for pid, pos in zip(player_ids, positions) if pos < 0])
+        return positions
+
+    def row(self, player_id):
+        return self.df.iloc[self.position(player_id)]
+
+    def label(self, player_id):
+        """Name, club and age, enough to tell players with the same short name apart."""
+        pos = self.position(player_id)
+        club = self._club_name[pos]
+        if pd.isna(club):
+            club = "No club"
+        return f"{self._short_name[pos]} ({club}, {self._age[pos]})"
@@ -0,0 +1,74 @@
+import streamlit as st
+
+import metrics
+
+# Options sent to the browser per page of matches
+PAGE_SIZE = 20
+
+
+def _change_page(page_key, step):
+    st.session_state[page_key] = max(0, st.session_state.get(page_key, 0) + step)
+
+
+def pick_player(label, dataset, key, mask=None, page_size=PAGE_SIZE):
+    """Searchable single-player picker that only ships one page of options.
+
+    Matches come from the dataset's search index on the server (the best
+    players by `overall` while the query is empty). `mask` limits the choice,
+    e.g. to one position group. Returns the selected `player_id` or None.
+    """
+    query = st.text_input(f"{label}: search by name", key=f"{key}_query")
+
+    # Start again from the first page whenever the query changes
+    page_key = f"{key}_page"
+    if st.session_state.get(f"{key}_last_query") != query:
+        st.session_state[f"{key}_last_query"] = query
+        st.session_state[page_key] = 0
+    page = st.session_state.get(page_key, 0)
+
+    # One extra match tells us whether there is a next page
+    k = (page + 1) * page_size + 1
+    index = dataset.search_index
+    with metrics.timer('search', key):
+        positions = index.search(query, k=k, mask=mask) if query.strip() else index.best(k=k, mask=mask)
+    page_positions = positions[page * page_size:(page + 1) * page_size]
+    player_ids = dataset.players.ids[page_positions].tolist()
+
+    if not player_ids:
+        st.write("No players found. Please try another search.")
+        return None
+
+    choice = st.selectbox(label, player_ids, format_func=dataset.players.label, key=f"{key}_choice")
+
+    col1, col2, col3 = st.columns([1, 2, 1])
+    with col1:
+        st.button("Previous", key=f"{key}_prev", disabled=page == 0,
+                  on_click=_change_page, args=(page_key, -1))
+    with col2:
+        st.caption(f"Page {page + 1}")
+    with col3:
+        st.button("Next", key=f"{key}_next", disabled=len(positions) <= (page + 1) * page_size,
+                  on_click=_change_page, args=(page_key, 1))
+    return choice
+
+
+def _add_player(selected_key, player_id, max_selections):
+    selected = st.session_state[selected_key]
+    if player_id is not None and player_id not in selected and len(selected) < max_selections:
+        selected.append(player_id)
+
+
+def pick_players(label, dataset, key, max_selections, mask=None, page_size=PAGE_SIZE):
+    """Multi-player version of `pick_player`, keeping the chosen ids in session state."""
+    selected_key = f"{key}_selected"
+    selected = st.session_state.setdefault(selected_key, [])
+
+    # Only the already chosen players are sent as options here, so they can be removed
+    kept = st.multiselect(label, selected, default=selected, format_func=dataset.players.label)
+    st.session_state[selected_key] = selected = list(kept)
+
+    if len(selected) < max_selections:
+        choice = pick_player(f"Add to {label.lower()}", dataset, key, mask=mask, page_size=page_size)
+        st.button("Add", key=f"{key}_add", disabled=choice is None,
+                  on_click=_add_player, args=(selected_key, choice, max_selections))
+    return selected
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+# Every position code that appears in `player_positions`, one bit each
+POSITIONS = ['GK', 'CB', 'LB', 'RB', 'LWB', 'RWB',
+             'CDM', 'CM', 'CAM', 'LM', 'RM', 'LAM', 'RAM',
+             'ST', 'CF', 'LW', 'RW', 'LF', 'RF']
+POSITION_BITS = {code: 1 << i for i, code in enumerate(POSITIONS)}
+
+# The position groups used across the app (best players, dream team, ...)
+POSITION_GROUPS = {
+    "Goalkeeper": ['GK'],
+    "Defender": ['CB', 'LB', 'RB', 'LWB', 'RWB'],
+    "Midfielder": ['CDM', 'CM', 'CAM', 'LM', 'RM', 'LAM', 'RAM'],
+    "Forward": ['ST', 'CF', 'LW', 'RW', 'LF', 'RF'],
+}
+GROUP_NAMES = list(POSITION_GROUPS)
+
+
+def parse_positions(value):
+    """Split a 'ST, LW' style string into its exact position codes."""
+    if not isinstance(value, str):
+        return []
+    return [token.strip() for token in value.split(',') if token.strip()]
+
+
+def positions_to_bits(value):
+    bits = 0
+    for code in parse_positions(value):
+        bits |= POSITION_BITS.get(code, 0)
+    return bits
+
+
+def primary_group(value):
+    """Group of the first (main) listed position, or None."""
+    for code in parse_positions(value):
+        for group, codes in POSITION_GROUPS.items():
+            if code in codes:
+                return group
+    return None
+
+
+def group_bits(group):
+    bits = 0
+    for code in POSITION_GROUPS[group]:
+        bits |= POSITION_BITS[code]
+    return bits
+
+
+class PositionIndex:
+    """Per-player position bitmasks plus precomputed group masks.
+
+    Also records the group of each player's main (first listed) position.
+    Built once per dataset: the distinct position strings are tokenized (there
+    are only a few hundred of them), then broadcast back to every player.
+    """
+
+    def __init__(self, player_positions):
+        codes, uniques = pd.factorize(pd.Series(player_positions), use_na_sentinel=True)
+        unique_bits = np.array([positions_to_bits(value) for value in uniques] + [0], dtype=np.uint32)
+        # factorize marks missing values with -1, which picks the trailing 0 above
+        self.bits = unique_bits[codes]
+        # index into GROUP_NAMES of each player's main position, -1 when unknown
+        group_codes = {group: i for i, group in enumerate(GROUP_NAMES)}
+        unique_groups = np.array([group_codes.get(primary_group(value), -1) for value in uniques] + [-1],
+                                 dtype=np.int8)
+        self.primary_group = unique_groups[codes]
+        self.group_masks = {
+            group: (self.bits & group_bits(group)) != 0 for group in POSITION_GROUPS
+        }
+
+    def __len__(self):
+        return len(self.bits)
+
+    def group_mask(self, group):
+        return self.group_masks[group]
+
+    def position_mask(self, code):
+        return (self.bits & POSITION_BITS[code]) != 0
@@ -0,0 +1,187 @@
+"""Score census-style CSV or Parquet files with the income model, in bounded memory.
+
+    python score_income.py adult_full.csv predictions.csv [--workers 4] [--resume]
+
+The input is read in chunks of --chunk-size rows and the chunks are scored
+across a process pool, each worker loading the model and preprocessing once.
+Predictions are appended to the output CSV in input order as chunks finish.
+Rows with a missing or unknown workclass, occupation or relationship are
+written with an empty prediction and counted, instead of stopping the run.
+A `<output>.progress` file records how far the output got, so an interrupted
+run continues from the last written chunk with --resume. It is removed once
+the run completes.
+"""
+import argparse
+import collections
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+import pyarrow.parquet as pq
+
+from income_pipeline import (CATEGORICAL_COLUMNS, MODEL_PATH, NUMERIC_COLUMNS, PREPROCESSOR_PATH,
+                             load_income_pipeline)
+
+CHUNK_SIZE = 100_000
+
+
+def read_chunks(path, chunk_size, columns):
+    """DataFrames of at most `chunk_size` rows with the given columns."""
+    if path.endswith('.parquet'):
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size, columns=columns):
+            yield batch.to_pandas()
+    else:
+        # the categoricals repeat a handful of values: mapping their categories is enough
+        dtype = {column: 'category' for column in CATEGORICAL_COLUMNS}
+        yield from pd.read_csv(path, usecols=columns, dtype=dtype, chunksize=chunk_size)
+
+
+_model_paths = (MODEL_PATH, PREPROCESSOR_PATH)
+
+
+def _init_worker(model_path, preprocessor_path, threads=None):
+    global _model_paths
+    _model_paths = (model_path, preprocessor_path)
+    model = load_income_pipeline(*_model_paths).model
+    if threads:
+        # parallelism comes from the processes, not from threads inside each one
+        model.get_booster().set_param('nthread', threads)
+
+
+def score_chunk(chunk):
+    """Predictions for the chunk's rows, <NA> for rows the preprocessing can't encode."""
+    pipeline = load_income_pipeline(*_model_paths)
+    known = pipeline.preprocessor.known_rows(chunk)
+    prediction = pd.array(np.zeros(len(chunk), dtype=np.int8), dtype='Int8')
+    if known.any():
+        prediction[known] = np.asarray(pipeline.predict(chunk[known])[0], dtype=np.int8)
+    prediction[~known] = pd.NA
+    return prediction
+
+
+def scored_chunks(chunks, workers, model_path=MODEL_PATH, preprocessor_path=PREPROCESSOR_PATH):
+    """(chunk, predictions) pairs in input order, scored across `workers` processes."""
+    if workers == 1:
+        _init_worker(model_path, preprocessor_path)
+        for chunk in chunks:
+            yield chunk, score_chunk(chunk)
+        return
+    with ProcessPoolExecutor(workers, initializer=_init_worker,
+                             initargs=(model_path, preprocessor_path, 1)) as pool:
+        # at most two chunks per worker in flight keeps memory bounded
+        pending = collections.deque()
+        for chunk in chunks:
+            pending.append((chunk, pool.submit(score_chunk, chunk)))
+            if len(pending) >= 2 * workers:
+                done, future = pending.popleft()
+                yield done, future.result()
+        while pending:
+            done, future = pending.popleft()
+            yield done, future.result()
+
+
+class Progress:
+    """Rows and bytes of the output written so far, for resuming a run."""
+
+    def __init__(self, output, input_path, chunk_size):
+        self.path = output + '.progress'
+        stat = os.stat(input_path)
+        self.key = {'input': os.path.abspath(input_path), 'size': stat.st_size,
+                    'mtime_ns': stat.st_mtime_ns, 'chunk_size': chunk_size}
+
+    def load(self):
+        """(rows, bytes) written by an earlier run of the same job, or None."""
+        try:
+            with open(self.path) as f:
+                state = json.load(f)
+        except FileNotFoundError:
+            return None
+        if state['job'] != self.key:
+            raise SystemExit(f"{self.path} belongs to a different input or chunk size; "
+                             "remove it or run without --resume")
+        return state['rows'], state['bytes']
+
+    def save(self, rows, nbytes):
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w') as f:
+            json.dump({'job': self.key, 'rows': rows, 'bytes': nbytes}, f)
+        os.replace(tmp, self.path)
+
+    def done(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+
+def score_file(input_path, output, chunk_size=CHUNK_SIZE, workers=None, id_column=None, resume=False,
+               model_path=MODEL_PATH, preprocessor_path=PREPROCESSOR_PATH, log=sys.stderr):
+    """Score `input_path` into the CSV `output`; returns the number of rows scored by this run."""
+    workers = workers or os.cpu_count() or 1
+    columns = NUMERIC_COLUMNS + CATEGORICAL_COLUMNS + ([id_column] if id_column else [])
+    progress = Progress(output, input_path, chunk_size)
+    state = progress.load() if resume else None
+    rows_done, bytes_done = state or (0, 0)
+    if state:
+        print(f"Resuming after {rows_done:,} rows", file=log)
+
+    out = open(output, 'r+b' if state else 'wb')
+    out.truncate(bytes_done)  # drop anything written after the last recorded chunk
+    out.seek(bytes_done)
+
+    chunks = read_chunks(input_path, chunk_size, columns)
+    skipped = 0
+    while skipped < rows_done:
+        skipped += len(next(chunks))
+
+    def write(chunk, prediction, start_row):
+        ids = chunk[id_column].to_numpy() if id_column else np.arange(start_row, start_row + len(chunk))
+        frame = pd.DataFrame({id_column or 'row': ids, 'prediction': prediction})
+        out.write(frame.to_csv(index=False, header=start_row == 0).encode())
+        out.flush()
+        os.fsync(out.fileno())
+        progress.save(start_row + len(chunk), out.tell())
+
+    start = time.perf_counter()
+    scored = unscored = 0
+    try:
+        for chunk, prediction in scored_chunks(chunks, workers, model_path, preprocessor_path):
+            write(chunk, prediction, rows_done + scored)
+            scored += len(chunk)
+            unscored += int(prediction.isna().sum())
+            seconds = time.perf_counter() - start
+            print(f"{rows_done + scored:>12,} rows written, {scored / max(seconds, 1e-9):>10,.0f} rows/s",
+                  file=log)
+    finally:
+        out.close()
+    progress.done()
+    seconds = time.perf_counter() - start
+    print(f"Scored {scored:,} rows in {seconds:.1f}s ({scored / max(seconds, 1e-9):,.0f} rows/s) "
+          f"into {output}", file=log)
+    if unscored:
+        print(f"{unscored:,} rows with missing or unknown categories have an empty prediction", file=log)
+    return scored
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('input', help="CSV or Parquet file with the census columns")
+    parser.add_argument('output', help="CSV file for the predictions")
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    parser.add_argument('--workers', type=int, default=None, help="processes (default: one per CPU)")
+    parser.add_argument('--id-column', help="input column to copy next to each prediction "
+                                            "(default: the input row number)")
+    parser.add_argument('--resume', action='store_true', help="continue an interrupted run")
+    parser.add_argument('--model', default=MODEL_PATH)
+    parser.add_argument('--preprocessor', default=PREPROCESSOR_PATH)
+    args = parser.parse_args(argv)
+
+    score_file(args.input, args.output, args.chunk_size, args.workers, args.id_column, args.resume,
+               args.model, args.preprocessor)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
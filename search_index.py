@@ -0,0 +1,173 @@
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+# Match quality of a query word against a name token
+EXACT, PREFIX, INFIX = 3, 2, 1
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+def fold(text):
+    """Lowercase and strip accents, so 'Mbappé' and 'mbappe' compare equal."""
+    decomposed = unicodedata.normalize('NFKD', str(text))
+    return ''.join(ch for ch in decomposed if not unicodedata.combining(ch)).casefold()
+
+
+def tokenize(text):
+    return _TOKEN_RE.findall(fold(text))
+
+
+def trigrams(token):
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+class SearchIndex:
+    """Accent-folded token index over `short_name` and `long_name`.
+
+    Every name token gets a posting list of players, ordered best `overall`
+    first. Query words are matched against the sorted token vocabulary by
+    exact/prefix lookup (binary search) and by trigrams for infix matches, so
+    a query never touches the rows that cannot match it.
+    """
+
+    def __init__(self, df, columns=('short_name', 'long_name'), rank_by='overall'):
+        n = len(df)
+        # rank 0 is the best player; postings store ranks so they are pre-sorted
+        self.order = np.argsort(-df[rank_by].to_numpy(), kind='stable').astype(np.int64)
+        rank = np.empty(n, dtype=np.int64)
+        rank[self.order] = np.arange(n)
+
+        names = pd.concat([df[column] for column in columns], ignore_index=True)
+        name_codes, unique_names = pd.factorize(names)
+        name_rows = np.tile(np.arange(n), len(columns))
+        valid = name_codes >= 0
+        name_codes, name_rows = name_codes[valid], name_rows[valid]
+
+        # tokenize each distinct name once
+        name_tokens = [tokenize(name) for name in unique_names]
+        vocab = sorted({token for tokens in name_tokens for token in tokens})
+        self.vocab = np.array(vocab, dtype=str)
+        token_ids = {token: i for i, token in enumerate(vocab)}
+        name_lengths = np.array([len(tokens) for tokens in name_tokens], dtype=np.int64)
+        name_start = np.concatenate([[0], np.cumsum(name_lengths)[:-1]])
+        flat_tokens = np.array([token_ids[t] for tokens in name_tokens for t in tokens], dtype=np.int64)
+
+        # expand (row, name) pairs into (token, rank) pairs without a Python loop
+        counts = name_lengths[name_codes]
+        total = int(counts.sum())
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        pair_tokens = flat_tokens[np.repeat(name_start[name_codes], counts) + offsets]
+        pair_ranks = np.repeat(rank[name_rows], counts)
+
+        pairs = np.unique(pair_tokens * n + pair_ranks)
+        self.postings = (pairs % max(n, 1)).astype(np.int64)
+        self.indptr = np.concatenate([[0], np.cumsum(np.bincount(pairs // max(n, 1), minlength=len(vocab)))])
+
+        self.trigram_tokens = {}
+        for i, token in enumerate(vocab):
+            for gram in trigrams(token):
+                self.trigram_tokens.setdefault(gram, []).append(i)
+        self.trigram_tokens = {gram: np.array(ids, dtype=np.int64) for gram, ids in self.trigram_tokens.items()}
+
+    def __len__(self):
+        return len(self.order)
+
+    def _posting(self, token_id, limit=None):
+        start, end = self.indptr[token_id], self.indptr[token_id + 1]
+        if limit is not None:
+            end = min(end, start + limit)
+        return self.postings[start:end]
+
+    def _match_tokens(self, word):
+        """Return (token ids, quality) for every vocabulary token matching `word`."""
+        lo = np.searchsorted(self.vocab, word, side='left')
+        hi = np.searchsorted(self.vocab, word + '\U0010ffff', side='left')
+        ids = np.arange(lo, hi)
+        quality = np.full(len(ids), PREFIX)
+        if len(ids) and self.vocab[lo] == word:
+            quality[0] = EXACT
+
+        if len(word) >= 3:
+            candidates = None
+            for gram in sorted(trigrams(word), key=lambda g: len(self.trigram_tokens.get(g, ()))):
+                gram_ids = self.trigram_tokens.get(gram)
+                if gram_ids is None:
+                    candidates = None
+                    break
+                candidates = gram_ids if candidates is None else np.intersect1d(candidates, gram_ids, assume_unique=True)
+                if not len(candidates):
+                    break
+            if candidates is not None and len(candidates):
+                infix = [i for i in candidates if not lo <= i < hi and word in self.vocab[i]]
+                ids = np.concatenate([ids, np.array(infix, dtype=np.int64)])
+                quality = np.concatenate([quality, np.full(len(infix), INFIX)])
+        return ids, quality
+
+    def _word_matches(self, word_match, limit=None, rank_mask=None):
+        """Return (ranks, quality) of every player matching a word, best quality per player."""
+        token_ids, token_quality = word_match
+        if not len(token_ids):
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+        if rank_mask is None:
+            postings = [self._posting(t, limit) for t in token_ids]
+        else:
+            postings = [posting[rank_mask[posting]][:limit]
+                        for posting in (self._posting(t) for t in token_ids)]
+        ranks = np.concatenate(postings)
+        quality = np.repeat(token_quality, [len(p) for p in postings])
+        order = np.lexsort((-quality, ranks))
+        ranks, quality = ranks[order], quality[order]
+        first = np.ones(len(ranks), dtype=bool)  # ranks is empty when `rank_mask` excludes every match
+        first[1:] = ranks[1:] != ranks[:-1]
+        return ranks[first], quality[first]
+
+    def _probe(self, ranks, word_match):
+        """Best quality with which each of `ranks` matches a word (0 = no match)."""
+        quality = np.zeros(len(ranks), dtype=np.int64)
+        for token_id, token_quality in zip(*word_match):
+            posting = self._posting(token_id)
+            pos = np.minimum(np.searchsorted(posting, ranks), len(posting) - 1)
+            hit = posting[pos] == ranks
+            quality[hit] = np.maximum(quality[hit], token_quality)
+        return quality
+
+    def _rank_mask(self, mask):
+        return None if mask is None else np.asarray(mask, dtype=bool)[self.order]
+
+    def best(self, k=20, mask=None):
+        """Row positions of the k best players by `overall`, optionally within `mask`."""
+        if mask is None:
+            return self.order[:k]
+        return self.order[np.flatnonzero(self._rank_mask(mask))[:k]]
+
+    def search(self, query, k=20, mask=None):
+        """Return the row positions of the top-k players matching `query`.
+
+        Every query word has to match some name token (exact, prefix or
+        infix). Players are ranked by the summed match quality, then by
+        `overall`. `mask` (a boolean array over rows) restricts the
+        candidates, e.g. to one position group.
+        """
+        words = tokenize(query)
+        if not words or k <= 0:
+            return np.empty(0, dtype=np.int64)
+
+        matches = [self._match_tokens(word) for word in words]
+        sizes = [int(np.sum(self.indptr[ids + 1] - self.indptr[ids])) for ids, _ in matches]
+        # start from the rarest word and probe the others' sorted postings
+        by_size = np.argsort(sizes, kind='stable')
+        # with a single word the first k players of each posting are enough
+        limit = k if len(words) == 1 else None
+        ranks, score = self._word_matches(matches[by_size[0]], limit, self._rank_mask(mask))
+        for i in by_size[1:]:
+            if not len(ranks):
+                break
+            quality = self._probe(ranks, matches[i])
+            keep = quality > 0
+            ranks, score = ranks[keep], score[keep] + quality[keep]
+
+        top = np.lexsort((ranks, -score))[:k]
+        return self.order[ranks[top]]
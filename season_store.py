@@ -0,0 +1,223 @@
+"""Player tables of several FIFA editions, stored and queried out of core.
+
+    python season_store.py add 22 fifa_data.pkl      # store an edition's player table
+    python season_store.py list
+
+Each edition is one Parquet file under `<store>/season=<n>/`, sorted by
+`player_id`, the export's own id (`player_id` or `sofifa_id`), which is
+what links a player across editions; a table without one is refused, as
+its row numbers would match unrelated players. Queries run in an
+embedded DuckDB over those files instead of loading them: a query on one
+season opens only that season's file, only the columns it names are read,
+and per-player lookups skip every row group whose `player_id` range can't
+match. Nothing of the history stays in the Streamlit process between runs.
+"""
+import argparse
+import glob
+import hashlib
+import logging
+import os
+import sys
+import threading
+
+import duckdb
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from compaction import compact_players
+from player_data import PLAYER_COLUMNS
+from player_index import ID_COLUMNS, ensure_player_id, stable_id_column
+from positions import POSITION_GROUPS
+from search_index import fold
+
+logger = logging.getLogger(__name__)
+
+STORE_PATH = "player_seasons"
+
+# Rows per Parquet row group; files are sorted by player_id, so a player lookup reads one
+ROW_GROUP_SIZE = 50_000
+
+# Memory DuckDB may use for a query before spilling
+DUCKDB_MEMORY_LIMIT = "1GB"
+
+# Columns of the per-player history
+TRAJECTORY_COLUMNS = ['overall', 'potential', 'value_eur', 'wage_eur']
+
+
+def _quote(text):
+    return "'" + text.replace("'", "''") + "'"
+
+
+def _escape_like(text):
+    """`text` matched literally inside a LIKE pattern with ESCAPE '\\'."""
+    return text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+def partition_path(store, season):
+    return os.path.join(store, f"season={int(season)}", "players.parquet")
+
+
+def search_names(df):
+    """Accent-folded 'short_name long_name' per player, folded once per distinct name."""
+    # through object, as '' is no category of categorical names
+    names = (df['short_name'].astype(object).fillna('').astype(str) + ' '
+             + df['long_name'].astype(object).fillna('').astype(str))
+    codes, uniques = pd.factorize(names)
+    return np.array([fold(name) for name in uniques], dtype=object)[codes]
+
+
+def add_season(df, season, store=STORE_PATH):
+    """Write one edition's player table into the store, replacing that season if present.
+
+    Raises ValueError when the table has no stable id column (see `player_index.ID_COLUMNS`).
+    """
+    if stable_id_column(df) is None:
+        raise ValueError(f"season {season} has no {' or '.join(ID_COLUMNS)} column to match players "
+                         f"across editions by")
+    df = compact_players(ensure_player_id(df.reset_index(drop=True)))
+    df = df.sort_values('player_id', kind='stable').drop(columns=['season'], errors='ignore')
+    # matched with LIKE by name searches, so queries never fold names themselves
+    df['search_name'] = search_names(df)
+    path = partition_path(store, season)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    pq.write_table(pa.Table.from_pandas(df, preserve_index=False), tmp_path, row_group_size=ROW_GROUP_SIZE)
+    os.replace(tmp_path, path)
+    logger.info("Stored season %s: %d players in %s", season, len(df), path)
+    return path
+
+
+class SeasonStore:
+    """Queries over a season-partitioned store, each in its own DuckDB cursor (thread-safe)."""
+
+    def __init__(self, path=STORE_PATH):
+        self.path = path
+        self._con = duckdb.connect(config={'memory_limit': DUCKDB_MEMORY_LIMIT})
+
+    def seasons(self):
+        """Stored seasons, oldest first (from the directory names, no data is read)."""
+        paths = glob.glob(os.path.join(self.path, 'season=*', 'players.parquet'))
+        return sorted(int(os.path.basename(os.path.dirname(path)).split('=', 1)[1]) for path in paths)
+
+    def version(self, season=None):
+        """Changes whenever the season's file (or any file, without a season) is rewritten."""
+        paths = [partition_path(self.path, season)] if season is not None else sorted(
+            glob.glob(os.path.join(self.path, 'season=*', 'players.parquet')))
+        key = ':'.join(f"{path}:{os.stat(path).st_mtime_ns}" for path in paths)
+        return hashlib.sha1(key.encode()).hexdigest()[:12]
+
+    def _source(self, season=None):
+        """The FROM clause for one season's file, or every season with a `season` column."""
+        if season is not None:
+            return f"read_parquet({_quote(partition_path(self.path, season))})"
+        pattern = os.path.join(self.path, 'season=*', 'players.parquet')
+        return f"read_parquet({_quote(pattern)}, hive_partitioning = true, union_by_name = true)"
+
+    def query(self, sql, params=()):
+        cursor = self._con.cursor()
+        try:
+            return cursor.execute(sql, list(params)).df()
+        finally:
+            cursor.close()
+
+    def _players(self, season, player_ids, order_by):
+        """Display columns of `player_ids` in one season, in `order_by` order."""
+        if not len(player_ids):
+            return pd.DataFrame(columns=PLAYER_COLUMNS)
+        ids = ', '.join(str(int(player_id)) for player_id in player_ids)
+        return self.query(f"SELECT {', '.join(PLAYER_COLUMNS)} FROM {self._source(season)} "
+                          f"WHERE player_id IN ({ids}) ORDER BY {order_by}")
+
+    def search(self, season, text, k=50):
+        """Players of `season` whose names contain every word of `text`, best `overall` first.
+
+        Matching only reads the stored folded names and the ratings; the
+        other columns are fetched for the k matches.
+        """
+        words = fold(text).split()
+        if not words:
+            return pd.DataFrame(columns=PLAYER_COLUMNS)
+        where = ' AND '.join("search_name LIKE ? ESCAPE '\\'" for _ in words)
+        ids = self.query(f"SELECT player_id FROM {self._source(season)} WHERE {where} "
+                         f"ORDER BY overall DESC, player_id LIMIT {int(k)}",
+                         [f"%{_escape_like(word)}%" for word in words])['player_id']
+        return self._players(season, ids, 'overall DESC, player_id')
+
+    def top_valued(self, season, k=10, age_range=None, leagues=None):
+        """The k most valuable players of `season`, optionally within an age range and leagues."""
+        where, params = ['value_eur IS NOT NULL'], []
+        if age_range is not None:
+            where.append('age BETWEEN ? AND ?')
+            params += [int(age_range[0]), int(age_range[1])]
+        if leagues:
+            where.append(f"league_name IN ({', '.join('?' for _ in leagues)})")
+            params += list(leagues)
+        ids = self.query(f"SELECT player_id FROM {self._source(season)} WHERE {' AND '.join(where)} "
+                         f"ORDER BY value_eur DESC, player_id LIMIT {int(k)}", params)['player_id']
+        return self._players(season, ids, 'value_eur DESC, player_id')
+
+    def best_in_group(self, season, group, k=10):
+        """The k best players of `season` with any position of the position group."""
+        codes = ', '.join(_quote(code) for code in POSITION_GROUPS[group])
+        ids = self.query(f"SELECT player_id FROM {self._source(season)} "
+                         f"WHERE list_has_any(string_split(player_positions, ', '), [{codes}]) "
+                         f"ORDER BY overall DESC, player_id LIMIT {int(k)}")['player_id']
+        return self._players(season, ids, 'overall DESC, player_id')
+
+    def leagues(self, season):
+        return self.query(f"SELECT DISTINCT league_name FROM {self._source(season)} "
+                          f"WHERE league_name IS NOT NULL ORDER BY league_name")['league_name'].tolist()
+
+    def age_range(self, season):
+        ages = self.query(f"SELECT min(age) AS low, max(age) AS high FROM {self._source(season)}")
+        return int(ages['low'].iloc[0]), int(ages['high'].iloc[0])
+
+    def trajectory(self, player_id, columns=TRAJECTORY_COLUMNS):
+        """One row per season the player appears in, oldest first."""
+        return self.query(f"SELECT season, {', '.join(columns)} FROM {self._source()} "
+                          f"WHERE player_id = ? ORDER BY season", [int(player_id)])
+
+
+_lock = threading.Lock()
+_stores = {}
+
+
+def load_store(path=STORE_PATH):
+    """The shared SeasonStore for `path`, or None when no season has been stored there."""
+    with _lock:
+        if not glob.glob(os.path.join(path, 'season=*', 'players.parquet')):
+            return None
+        if path not in _stores:
+            _stores[path] = SeasonStore(path)
+        return _stores[path]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--store', default=STORE_PATH)
+    commands = parser.add_subparsers(dest='command', required=True)
+    add = commands.add_parser('add', help="store a pickled or Parquet player table as one season")
+    add.add_argument('season', type=int, help="edition number, e.g. 22 for FIFA 22")
+    add.add_argument('source')
+    commands.add_parser('list', help="list the stored seasons")
+    args = parser.parse_args(argv)
+
+    if args.command == 'add':
+        read = pd.read_parquet if args.source.endswith('.parquet') else pd.read_pickle
+        try:
+            path = add_season(read(args.source), args.season, args.store)
+        except ValueError as error:
+            parser.error(str(error))
+        print(f"Stored season {args.season} in {path}")
+    else:
+        store = SeasonStore(args.store)
+        for season in store.seasons():
+            rows = pq.ParquetFile(partition_path(args.store, season)).metadata.num_rows
+            print(f"season {season}: {rows:,} players")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,250 @@
+"""Generate synthetic FIFA player datasets with the columns the apps use.
+
+    python synthetic_players.py 10000000 players_10m.parquet [players_10m.pkl] [--seed 0]
+
+Rows are generated vectorized in chunks of --chunk-size, each from its own
+seeded generator, so the output depends only on the seed and chunk size.
+Parquet output is streamed a row group per chunk in bounded memory; a
+pickle holds one DataFrame, so it is assembled from the Parquet file at
+the end and needs the whole table in memory, like loading it in the app.
+
+The distributions follow the real data's shape: ratings around 66 with
+younger players having more potential, log-normal values and wages that
+grow with rating, goalkeepers without outfield attributes, one to three
+distinct positions per outfield player, and names drawn from skewed pools
+so short names repeat (with accents, as in the real data).
+
+`synthetic_goals` makes goal events with the columns of the goal workbook,
+for benchmarking the Goal Statistics page.
+"""
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+CHUNK_SIZE = 250_000
+
+FACE_ATTRIBUTES = ['pace', 'shooting', 'passing', 'dribbling', 'defending', 'physic']
+COLUMNS = (['sofifa_id', 'short_name', 'long_name', 'age', 'nationality', 'club_name', 'league_name',
+            'overall', 'potential', 'value_eur', 'wage_eur', 'player_positions'] + FACE_ATTRIBUTES)
+
+# Position codes with their share of primary positions and their group (GK, DEF, MID, FWD)
+POSITIONS = ['GK', 'CB', 'LB', 'RB', 'LWB', 'RWB', 'CDM', 'CM', 'CAM', 'LM', 'RM', 'LW', 'RW', 'ST', 'CF']
+POSITION_SHARES = [0.11, 0.18, 0.06, 0.06, 0.01, 0.01, 0.07, 0.13, 0.07, 0.05, 0.05, 0.02, 0.02, 0.15, 0.01]
+POSITION_GROUP = np.array([0, 1, 1, 1, 1, 1, 2, 2, 2, 2, 2, 3, 3, 3, 3])
+
+# Attribute offsets from the overall rating per position group (rows) and face attribute (columns)
+ATTRIBUTE_OFFSETS = np.array([
+    [0, 0, 0, 0, 0, 0],         # goalkeepers have no outfield attributes
+    [-4, -22, -10, -12, 2, 4],  # defenders
+    [-2, -6, 4, 2, -10, -4],    # midfielders
+    [6, 2, -6, 2, -35, -6],     # forwards
+])
+
+FIRST_NAMES = ['Lionel', 'Kylian', 'Cristiano', 'Erling', 'Kevin', 'Mohamed', 'Harry', 'Robert', 'Luka', 'Virgil',
+               'Sergio', 'Thomas', 'Joshua', 'Bruno', 'Bernardo', 'Rúben', 'João', 'Antoine', 'Olivier', 'Karim',
+               'Neymar', 'Vinícius', 'Rodrigo', 'Ángel', 'Marc', 'Jordi', 'Pedro', 'Pablo', 'Jesús', 'Iñaki',
+               'Luis', 'José', 'Raphaël', 'Théo', 'Ousmane', 'Kingsley', 'Leroy', 'Jamal', 'Florian', 'İlkay',
+               'Jan', 'Wojciech', 'Mateo', 'Dušan', 'Martin', 'Kai', 'Son', 'Takumi', 'Achraf', 'Sadio']
+SURNAME_STEMS = ['Silv', 'Sant', 'Fernand', 'Rodrígu', 'Gonzál', 'Pér', 'Sánch', 'Martín', 'Lóp', 'Góm',
+                 'Müll', 'Schmidt', 'Schneid', 'Fisch', 'Wagn', 'Bec', 'Hoff', 'Kovač', 'Petrov', 'Ivan',
+                 'Nowak', 'Kowalsk', 'Dubo', 'Mart', 'Bern', 'Ross', 'Ferr', 'Esposit', 'Bianc', 'Roman',
+                 'Jans', 'de Jong', 'Bakk', 'Pedersen', 'Ødeg', 'Yılmaz', 'Kaya', 'Diall', 'Traor', 'Koné']
+SURNAME_ENDINGS = ['a', 'o', 'os', 'es', 'ez', 'er', 'i', 'ini', 'ić', 'ov', 'sen', 'son', 'é', 'ard', '']
+NATIONALITIES = ['England', 'Germany', 'Spain', 'France', 'Argentina', 'Brazil', 'Italy', 'Colombia', 'Japan',
+                 'Netherlands', 'United States', 'Portugal', 'Poland', 'Sweden', 'Norway', 'Denmark', 'Belgium',
+                 'Mexico', 'Turkey', 'Croatia', 'Serbia', 'Nigeria', 'Senegal', "Côte d'Ivoire", 'Korea Republic']
+
+LEAGUES = 50
+
+# Values of the goal workbook's columns, for synthetic goal events
+GOAL_SEASONS = [f'{year:02d}/{year + 1:02d}' for year in range(2, 25)]
+GOAL_CLUBS = ['Sporting CP', 'Manchester United', 'Real Madrid', 'Juventus FC', 'Al-Nassr FC']
+GOAL_COMPETITIONS = ['LaLiga', 'UEFA Champions League', 'Premier League', 'Serie A', 'Copa del Rey', 'Ligue 1',
+                     'FA Cup', 'Saudi Pro League', 'Supercopa', 'Coppa Italia']
+GOAL_POSITIONS = ['CF', 'RW', 'LW', 'SS', 'AM']
+GOAL_TYPES = ['Left-footed shot', 'Right-footed shot', 'Penalty', 'Header', 'Direct free kick', 'Tap-in',
+              'Long distance kick', 'Solo run', 'Counter attack goal', 'Deflected shot on goal']
+CLUBS_PER_LEAGUE = 20
+
+
+def _zipf_choice(rng, size, n, exponent=1.1):
+    """Indices in [0, size) drawn with Zipf-like frequencies, so some values are very common."""
+    weights = 1.0 / np.arange(1, size + 1) ** exponent
+    return rng.choice(size, n, p=weights / weights.sum())
+
+
+def _positions(rng, n):
+    primary = rng.choice(len(POSITIONS), n, p=POSITION_SHARES)
+    # extra positions are distinct outfield codes: offsets into the 14 outfield positions
+    outfield = len(POSITIONS) - 1
+    second_offset = rng.integers(1, outfield, n)
+    third_offset = 1 + (second_offset - 1 + rng.integers(1, outfield - 1, n)) % (outfield - 1)
+    count = np.where(primary > 0, rng.choice([1, 2, 3], n, p=[0.45, 0.4, 0.15]), 1)
+
+    codes = np.array(POSITIONS, dtype=object)
+    positions = pd.Series(codes[primary])
+    for extra, offset in [(2, second_offset), (3, third_offset)]:
+        other = pd.Series(codes[1 + (primary - 1 + offset) % outfield])
+        positions = positions.where(count < extra, positions + ', ' + other)
+    return positions, POSITION_GROUP[primary]
+
+
+def _names(rng, n):
+    first = np.array(FIRST_NAMES, dtype=object)[_zipf_choice(rng, len(FIRST_NAMES), n)]
+    surnames = np.array([stem + ending for stem in SURNAME_STEMS for ending in SURNAME_ENDINGS], dtype=object)
+    last = surnames[_zipf_choice(rng, len(surnames), n, exponent=0.8)]
+    first, last = pd.Series(first), pd.Series(last)
+    short_name = first.str[0] + '. ' + last
+    # a few players are known by a single name, as in the real data
+    mononym = rng.random(n) < 0.03
+    short_name = short_name.where(~mononym, first)
+    middle = pd.Series(np.array(FIRST_NAMES, dtype=object)[rng.integers(0, len(FIRST_NAMES), n)])
+    long_name = (first + ' ' + middle.where(rng.random(n) < 0.3, '') + ' ' + last).str.replace('  ', ' ')
+    return short_name, long_name
+
+
+def generate_chunk(n, seed=0, chunk_index=0, first_id=0):
+    """`n` synthetic players (a DataFrame with COLUMNS) from the chunk's own seeded generator."""
+    rng = np.random.default_rng([seed, chunk_index])
+    short_name, long_name = _names(rng, n)
+    positions, group = _positions(rng, n)
+
+    age = np.clip(np.round(rng.normal(25.3, 4.7, n)), 16, 44).astype(np.int64)
+    overall = np.clip(np.round(rng.normal(65.8, 6.9, n) + rng.exponential(0.8, n)), 40, 94).astype(np.int64)
+    growth = np.clip(rng.normal((27 - age) * 1.6, 3.0), 0, None)
+    potential = np.minimum(overall + np.round(growth).astype(np.int64), 95)
+
+    club = rng.integers(0, LEAGUES * CLUBS_PER_LEAGUE, n)
+    league = club // CLUBS_PER_LEAGUE
+    free_agent = rng.random(n) < 0.005
+    club_name = pd.Series([f'FC {i:04d}' for i in range(LEAGUES * CLUBS_PER_LEAGUE)], dtype=object)[club]
+    league_name = pd.Series([f'League {i:02d}' for i in range(LEAGUES)], dtype=object)[league]
+    # stronger leagues pay more
+    league_strength = 1.0 - league / LEAGUES
+
+    log_value = (9.3 + 0.165 * (overall - 40) + 0.05 * (potential - overall) - 0.04 * np.maximum(age - 29, 0) ** 1.5
+                 + 0.5 * league_strength + rng.normal(0, 0.45, n))
+    value = np.maximum(np.round(np.exp(log_value) / 25_000) * 25_000, 25_000)
+    value[free_agent | (rng.random(n) < 0.01)] = 0.0
+    log_wage = 3.2 + 0.17 * (overall - 40) + 0.8 * league_strength + rng.normal(0, 0.4, n)
+    wage = np.maximum(np.round(np.exp(log_wage) / 500) * 500, 500)
+    wage[free_agent] = 0.0
+
+    df = pd.DataFrame({
+        'sofifa_id': np.arange(first_id, first_id + n, dtype=np.int64) + 100_000,
+        'short_name': short_name,
+        'long_name': long_name,
+        'age': age,
+        'nationality': np.array(NATIONALITIES, dtype=object)[_zipf_choice(rng, len(NATIONALITIES), n, 0.7)],
+        'club_name': club_name.to_numpy(),
+        'league_name': league_name.to_numpy(),
+        'overall': overall,
+        'potential': potential,
+        'value_eur': value,
+        'wage_eur': wage,
+        'player_positions': positions,
+    })
+    df.loc[free_agent, ['club_name', 'league_name']] = None
+
+    attributes = overall[:, None] + ATTRIBUTE_OFFSETS[group] + rng.normal(0, 6, (n, len(FACE_ATTRIBUTES)))
+    attributes = np.clip(np.round(attributes), 20, 97)
+    attributes[group == 0] = np.nan  # goalkeepers
+    for index, column in enumerate(FACE_ATTRIBUTES):
+        df[column] = attributes[:, index]
+    return df
+
+
+def generate_chunks(n, seed=0, chunk_size=CHUNK_SIZE):
+    """DataFrames of at most `chunk_size` players adding up to `n`."""
+    for index, start in enumerate(range(0, n, chunk_size)):
+        yield generate_chunk(min(chunk_size, n - start), seed, index, first_id=start)
+
+
+def synthetic_players(n, seed=0, chunk_size=CHUNK_SIZE):
+    """`n` synthetic players as one DataFrame."""
+    return pd.concat(generate_chunks(n, seed, chunk_size), ignore_index=True)
+
+
+def synthetic_goals(n, seed=0):
+    """`n` goal events shaped like the rows of the goal workbook (see goal_data.clean_goals).
+
+    A career of seasons and clubs, one to a season, with the workbook's
+    competitions, positions and goal types in skewed proportions.
+    """
+    rng = np.random.default_rng([seed, 1])
+    season = np.sort(_zipf_choice(rng, len(GOAL_SEASONS), n, exponent=0.3))
+    competition = _zipf_choice(rng, len(GOAL_COMPETITIONS), n, exponent=1.5)
+    goals_for = rng.integers(1, 7, n)
+    return pd.DataFrame({
+        'Season': np.array(GOAL_SEASONS, dtype=object)[season],
+        'Competition': np.array(GOAL_COMPETITIONS, dtype=object)[competition],
+        'Matchday': rng.integers(1, 39, n).astype(str).astype(object),
+        'Date': None,
+        'Venue': np.where(rng.random(n) < 0.58, 'H', 'A').astype(object),
+        'Club': np.array(GOAL_CLUBS, dtype=object)[season * len(GOAL_CLUBS) // len(GOAL_SEASONS)],
+        'Opponent': np.array([f'FC {i:04d}' for i in range(200)], dtype=object)[_zipf_choice(rng, 200, n, 0.8)],
+        'Result': [f"{a}:{b}" for a, b in zip(goals_for, rng.integers(0, 4, n))],
+        'Playing_Position': np.array(GOAL_POSITIONS, dtype=object)[_zipf_choice(rng, len(GOAL_POSITIONS), n)],
+        'Minute': rng.integers(1, 91, n).astype(str).astype(object),
+        'At_score': None,
+        'Type': np.array(GOAL_TYPES, dtype=object)[_zipf_choice(rng, len(GOAL_TYPES), n)],
+        'Goal_assist': np.where(rng.random(n) < 0.63, 'Assisted by someone', None).astype(object),
+    })
+
+
+def write_parquet(n, path, seed=0, chunk_size=CHUNK_SIZE):
+    """Stream `n` players into a Parquet file, one row group per chunk."""
+    tmp_path = f"{path}.tmp"
+    writer = None
+    try:
+        for chunk in generate_chunks(n, seed, chunk_size):
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                schema = table.schema
+                writer = pq.ParquetWriter(tmp_path, schema)
+            writer.write_table(table.cast(schema))
+    finally:
+        if writer is not None:
+            writer.close()
+    os.replace(tmp_path, path)
+
+
+def write_dataset(n, paths, seed=0, chunk_size=CHUNK_SIZE):
+    """Write `n` players to every path in `paths` (.parquet or .pkl)."""
+    paths = [paths] if isinstance(paths, str) else list(paths)
+    parquet_paths = [path for path in paths if path.endswith('.parquet')]
+    source = parquet_paths[0] if parquet_paths else f"{paths[0]}.parquet.tmp"
+    write_parquet(n, source, seed, chunk_size)
+    for path in parquet_paths[1:]:
+        pq.write_table(pq.read_table(source), path)
+    pickle_paths = [path for path in paths if not path.endswith('.parquet')]
+    if pickle_paths:
+        df = pq.read_table(source).to_pandas()
+        for path in pickle_paths:
+            df.to_pickle(path)
+    if not parquet_paths:
+        os.remove(source)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('rows', type=int)
+    parser.add_argument('outputs', nargs='+', help=".parquet and/or .pkl files to write")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--chunk-size', type=int, default=CHUNK_SIZE)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    write_dataset(args.rows, args.outputs, args.seed, args.chunk_size)
+    print(f"Wrote {args.rows:,} players to {', '.join(args.outputs)} in {time.perf_counter() - start:.1f}s")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from compaction import CATEGORY_COLUMNS, STRING_COLUMNS, compact_players
+
+
+def players(n=200):
+    rng = np.random.default_rng(0)
+    first, last = rng.choice(['Adam', 'Rui', 'Tom'], n), rng.choice(['Silva', 'Jones'], n)
+    return pd.DataFrame({
+        'short_name': pd.Series(np.char.add(np.char.add(first, ' '), last)),
+        'long_name': pd.Series(np.char.add(np.char.add(first, ' Middle '), last)),
+        'nationality': pd.Series(rng.choice(['Brazil', 'England'], n)),
+        'club_name': pd.Series(rng.choice(['FC A', 'FC B', None], n)),
+        'league_name': pd.Series(rng.choice(['League 1', 'League 2'], n)),
+        'player_positions': pd.Series(rng.choice(['ST', 'CB, CDM'], n)),
+        'overall': rng.integers(40, 95, n),
+        'value_eur': rng.integers(0, 100_000_000, n),
+    })
+
+
+def test_default_string_columns_become_category():
+    df = players().astype({column: str for column in CATEGORY_COLUMNS + STRING_COLUMNS})
+    assert all(pd.api.types.is_string_dtype(df[column]) for column in CATEGORY_COLUMNS + STRING_COLUMNS)
+    expected = df.astype(object)
+
+    compact = compact_players(df.copy())
+
+    for column in CATEGORY_COLUMNS + STRING_COLUMNS:
+        assert isinstance(compact[column].dtype, pd.CategoricalDtype), column
+        assert compact[column].astype(object).equals(expected[column]), column
+
+
+def test_object_string_columns_become_category():
+    df = players().astype({column: object for column in CATEGORY_COLUMNS + STRING_COLUMNS})
+
+    compact = compact_players(df)
+
+    for column in CATEGORY_COLUMNS + STRING_COLUMNS:
+        assert isinstance(compact[column].dtype, pd.CategoricalDtype), column
+
+
+def test_unique_names_stay_strings():
+    df = players()
+    df['long_name'] = [f"Player {i}" for i in range(len(df))]
+
+    compact = compact_players(df)
+
+    assert pd.api.types.is_string_dtype(compact['long_name'])
+    assert not isinstance(compact['long_name'].dtype, pd.CategoricalDtype)
+
+
+def test_ratings_and_money_downcast():
+    compact = compact_players(players())
+
+    assert compact['overall'].dtype == np.int8
+    assert compact['value_eur'].dtype == np.int32
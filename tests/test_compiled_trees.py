@@ -0,0 +1,56 @@
+import numpy as np
+import pytest
+import xgboost as xgb
+
+from compiled_trees import BLOCK_ROWS, CompiledTrees
+
+
+def data(n=2_000, features=6, seed=0):
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n, features)).astype(np.float32)
+    y = (X[:, 0] + X[:, 1] * X[:, 2] + rng.normal(scale=0.5, size=n) > 0).astype(int)
+    X[rng.random(X.shape) < 0.05] = np.nan
+    return X, y
+
+
+def test_classifier_matches_xgboost():
+    X, y = data()
+    model = xgb.XGBClassifier(n_estimators=40, max_depth=5, learning_rate=0.3, random_state=0).fit(X, y)
+    trees = CompiledTrees.from_model(model)
+
+    rows = np.concatenate([X, data(BLOCK_ROWS + 10, seed=1)[0]])
+    margin = model.get_booster().predict(xgb.DMatrix(rows), output_margin=True)
+    np.testing.assert_allclose(trees.margin(rows), margin, rtol=1e-5, atol=1e-5)
+    np.testing.assert_allclose(trees.predict_proba(rows), model.predict_proba(rows), atol=1e-6)
+    np.testing.assert_array_equal(trees.predict(rows), model.predict(rows))
+    np.testing.assert_array_equal(trees.predict(rows[:1]), model.predict(rows[:1]))
+
+
+def test_regressor_matches_xgboost():
+    X, y = data(seed=2)
+    target = np.nan_to_num(X[:, 0]) * 3 + np.nan_to_num(X[:, 3])
+    model = xgb.XGBRegressor(n_estimators=30, max_depth=4, random_state=0).fit(X, target)
+
+    np.testing.assert_allclose(CompiledTrees.from_model(model).predict(X), model.predict(X), rtol=1e-5, atol=1e-5)
+
+
+def test_early_stopping_uses_best_iteration():
+    X, y = data(seed=3)
+    model = xgb.XGBClassifier(n_estimators=200, max_depth=6, learning_rate=0.5, early_stopping_rounds=3,
+                              random_state=0).fit(X[:1_500], y[:1_500], eval_set=[(X[1_500:], y[1_500:])],
+                                                  verbose=False)
+    assert model.best_iteration < 199
+
+    np.testing.assert_allclose(CompiledTrees.from_model(model).predict_proba(X), model.predict_proba(X), atol=1e-6)
+
+
+def test_unsupported_models_are_refused():
+    X, y = data(n=200)
+    linear = xgb.XGBClassifier(booster='gblinear', n_estimators=5).fit(X, y)
+    multiclass = xgb.XGBClassifier(n_estimators=5).fit(X, np.arange(len(y)) % 3)
+
+    for model in (linear, multiclass):
+        with pytest.raises(ValueError):
+            CompiledTrees.from_model(model)
+    with pytest.raises(ValueError, match="features"):
+        CompiledTrees.from_model(xgb.XGBClassifier(n_estimators=5).fit(X, y)).margin(X[:, :3])
@@ -0,0 +1,63 @@
+import itertools
+
+import numpy as np
+import pandas as pd
+
+from dream_team import FORMATION, build_dream_team
+
+GROUPS = list(FORMATION)
+
+
+def players(n=24, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({'overall': rng.integers(50, 95, n),
+                       'value_eur': rng.integers(1, 40, n) * 1_000_000.0})
+    group = np.arange(n) % len(GROUPS)
+    masks = {name: group == i for i, name in enumerate(GROUPS)}
+    # a few players fit two groups
+    masks['Midfielder'][[1, 9]] = True
+    masks['Forward'][[6, 10]] = True
+    return df, masks
+
+
+def brute_force(df, masks, budget):
+    score, cost = df['overall'].to_numpy(), df['value_eur'].to_numpy()
+    best = None
+    choices = [itertools.combinations(np.flatnonzero(masks[group]), FORMATION[group]) for group in GROUPS]
+    for team in itertools.product(*map(list, choices)):
+        positions = [pos for group in team for pos in group]
+        if len(set(positions)) == len(positions) and cost[positions].sum() <= budget:
+            total = score[positions].sum()
+            best = total if best is None else max(best, total)
+    return best
+
+
+def test_matches_brute_force():
+    for seed in range(2):
+        df, masks = players(seed=seed)
+        for budget in (60_000_000, 150_000_000):
+            team = build_dream_team(df, masks, budget)
+            expected = brute_force(df, masks, budget)
+
+            if expected is None:
+                assert team is None
+                continue
+            positions = team.positions()
+            assert len(set(positions)) == len(positions) == sum(FORMATION.values())
+            assert all(pos in np.flatnonzero(masks[group])
+                       for group, members in team.players.items() for pos in members)
+            assert team.cost == df['value_eur'].iloc[positions].sum() <= budget
+            assert team.score == expected
+            assert team.bound >= expected
+
+
+def test_team_found_when_rounding_costs_up_leaves_none():
+    df, masks = players()
+    df['value_eur'] = 9.0
+    # every cost rounds up to a whole step of 100 / 8, so 11 players need 11 of 8 steps
+    team = build_dream_team(df, masks, 100, budget_steps=8)
+
+    assert team is not None
+    assert team.cost == 99.0
+    assert team.score == brute_force(df, masks, 100)
+    assert team.bound == team.score
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+
+import goal_data
+from goal_cube import DIMENSIONS, GoalCube
+from goal_data import append_goals, clean_goals, load_goals
+from synthetic_players import synthetic_goals
+
+
+def paths(tmp_path):
+    return dict(source=str(tmp_path / 'missing.xlsx'), parquet_path=str(tmp_path / 'goals.parquet'),
+                appended_path=str(tmp_path / 'appended.parquet'), cube_path=str(tmp_path / 'cube.parquet'))
+
+
+def goals(tmp_path, n=2_000):
+    files = paths(tmp_path)
+    clean_goals(synthetic_goals(n)).to_parquet(files['parquet_path'])
+    return files
+
+
+def naive_counts(events, by):
+    return events.astype({column: object for column in by}).groupby(by).size()
+
+
+def assert_cube_counts(cube, events):
+    for by in (['Season'], ['Club', 'Type'], DIMENSIONS):
+        rollup = cube.rollup(by)
+        expected = naive_counts(events, by)
+        assert rollup.sum() == len(events)
+        assert dict(zip(rollup.index.to_flat_index(), rollup)) == dict(zip(expected.index.to_flat_index(), expected))
+
+
+def test_cube_matches_groupby(tmp_path):
+    dataset = load_goals(**goals(tmp_path))
+
+    assert_cube_counts(dataset.cube, dataset.df)
+    where = {'Venue': 'H', 'Competition': ['LaLiga', 'UEFA Champions League']}
+    assert dataset.cube.total(where) == int((dataset.df['Venue'].eq('H')
+                                             & dataset.df['Competition'].isin(where['Competition'])).sum())
+
+
+def test_append_counts_new_goals_once(tmp_path):
+    files = goals(tmp_path)
+    before = load_goals(**files)
+    raw = synthetic_goals(300, seed=1)
+
+    appended = append_goals(raw, **files)
+    again = append_goals(raw, **files)
+
+    added = len(clean_goals(raw))
+    assert len(appended.df) == len(before.df) + added
+    assert again is appended
+    assert_cube_counts(appended.cube, appended.df)
+    assert appended.cube.counts.equals(GoalCube.from_events(appended.df).counts)
+
+    # a new process reads the appended rows and the saved cube back from disk
+    goal_data._datasets.clear()
+    reloaded = load_goals(**files)
+    assert reloaded.version == appended.version
+    assert len(reloaded.df) == len(appended.df)
+    assert_cube_counts(reloaded.cube, reloaded.df)
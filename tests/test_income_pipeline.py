@@ -0,0 +1,101 @@
+import os
+
+import joblib
+import numpy as np
+import pandas as pd
+import pytest
+
+from income_pipeline import (MODEL_PATH, PREPROCESSOR_PATH, IncomePipeline, IncomePreprocessor, PredictionCache,
+                             load_income_pipeline)
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RECORD = {'age': 45, 'capital.gain': 15000, 'capital.loss': 0, 'hours.per.week': 50,
+          'workclass': 'Private', 'occupation': 'Exec-managerial', 'relationship': 'Husband'}
+
+
+def census(n=300):
+    rng = np.random.default_rng(0)
+    return pd.DataFrame({
+        'age': rng.integers(17, 90, n), 'capital.gain': rng.integers(0, 10_000, n),
+        'capital.loss': rng.integers(0, 500, n), 'hours.per.week': rng.integers(5, 80, n),
+        'workclass': rng.choice(['Private', 'State-gov', 'Self-emp-inc', '?'], n),
+        'occupation': rng.choice(['Sales', 'Exec-managerial', 'Craft-repair'], n),
+        'relationship': rng.choice(['Husband', 'Wife', 'Own-child'], n),
+    })
+
+
+def test_shipped_model_predicts_one_row():
+    pipeline = load_income_pipeline(os.path.join(ROOT, MODEL_PATH), os.path.join(ROOT, PREPROCESSOR_PATH))
+
+    assert pipeline.model.n_features_in_ == len(pipeline.preprocessor.feature_names)
+    assert not pipeline.warnings
+    prediction, _, hit = pipeline.predict_one(RECORD)
+    assert prediction in (0, 1)
+    assert not hit
+    assert pipeline.predict_one(RECORD)[::2] == (prediction, True)
+
+
+def test_preprocessor_matches_label_encoding_and_scaling():
+    train = census()
+    preprocessor = IncomePreprocessor.fit(train)
+
+    features = preprocessor.transform(train)
+
+    mapped = train.assign(workclass=train['workclass'].map({'Private': 'Private', 'State-gov': 'Government',
+                                                            'Self-emp-inc': 'Self-Employed', '?': '?'}),
+                          occupation=train['occupation'].map({'Sales': 'Services & Sales',
+                                                              'Exec-managerial': 'Management & Professional',
+                                                              'Craft-repair': 'Technical & skilled trades'}))
+    expected = np.column_stack(
+        [train[column].to_numpy(dtype=float) for column in ['age', 'capital.gain', 'capital.loss', 'hours.per.week']]
+        + [np.searchsorted(sorted(set(mapped[column])), mapped[column]).astype(float)
+           for column in ['workclass', 'occupation', 'relationship']])
+    expected = (expected - expected.mean(axis=0)) / expected.std(axis=0)
+    np.testing.assert_allclose(features, expected)
+
+
+def test_mismatched_model_is_refused():
+    model = joblib.load(os.path.join(ROOT, MODEL_PATH))
+    preprocessor = IncomePreprocessor.fit(census(), numeric_columns=['age', 'hours.per.week'])
+
+    with pytest.raises(ValueError, match="expects"):
+        IncomePipeline(model, preprocessor, version=None)
+
+
+def test_prediction_cache_evicts_least_recently_used():
+    cache = PredictionCache(maxsize=3)
+    for key in 'abc':
+        cache.put(key, key.upper())
+
+    assert cache.get('a') == 'A'  # now the most recently used
+    cache.put('d', 'D')
+    cache.put('e', 'E')
+
+    assert cache.get('b') is None and cache.get('c') is None
+    assert [cache.get(key) for key in 'ade'] == ['A', 'D', 'E']
+    assert cache.info() == (4, 2, 2, 3, 3)
+
+
+def test_prediction_cache_matches_reference_lru():
+    rng = np.random.default_rng(0)
+    cache, reference = PredictionCache(maxsize=16), []
+    for key in rng.integers(0, 40, 2_000).tolist():
+        expected = key if key in reference else None
+        if expected is not None:
+            reference.remove(key)
+        reference.append(key)
+        del reference[:-16]
+
+        value = cache.get(key)
+        assert value == expected
+        if value is None:
+            cache.put(key, key)
+    assert cache.info().currsize == 16
+
+
+def test_pipeline_cache_key_normalizes_input():
+    pipeline = load_income_pipeline(os.path.join(ROOT, MODEL_PATH), os.path.join(ROOT, PREPROCESSOR_PATH))
+    padded = dict(RECORD, age='45', workclass=' Private ')
+
+    assert pipeline.cache_key(padded) == pipeline.cache_key(RECORD)
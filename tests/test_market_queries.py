@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+
+from market_queries import TopKQueries
+
+
+def players(n=10_000):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'value_eur': rng.integers(0, 50, n) * 500_000,
+        'age': rng.integers(16, 40, n),
+        'league_name': rng.choice(['League A', 'League B', 'League C', None], n),
+        'undervaluation': rng.normal(size=n).round(1),
+    })
+    df.loc[df['value_eur'] == 0, 'undervaluation'] = np.nan
+    df.loc[[5, 50], 'undervaluation'] = [np.inf, -np.inf]
+    return df
+
+
+def naive_top_k(df, column, k, max_value=None, age_range=None, leagues=None):
+    mask = np.isfinite(df[column].to_numpy(dtype=float))
+    if max_value is not None:
+        mask &= df['value_eur'] < max_value
+    if age_range is not None:
+        mask &= df['age'].between(*age_range)
+    if leagues is not None:
+        mask &= df['league_name'].isin(leagues)
+    return df[mask].sort_values(column, ascending=False, kind='stable').index[:k].to_numpy()
+
+
+def test_top_valued_matches_sort_and_filter():
+    df = players()
+    queries = TopKQueries(df)
+
+    for k, age_range, leagues in [(10, None, None), (50, (18, 21), None), (30, None, ('League B',)),
+                                  (5_000, (30, 39), ('League A', 'League C'))]:
+        expected = naive_top_k(df, 'value_eur', k, age_range=age_range, leagues=leagues)
+        np.testing.assert_array_equal(queries.top_valued(k, age_range=age_range, leagues=leagues), expected)
+
+
+def test_undervalued_skips_missing_and_infinite_scores():
+    df = players()
+    queries = TopKQueries(df)
+
+    for k, max_value in [(10, 20_000_000), (len(df), None), (len(df), 2_000_000)]:
+        result = queries.undervalued(k, max_value=max_value)
+        np.testing.assert_array_equal(result, naive_top_k(df, 'undervaluation', k, max_value=max_value))
+        assert np.isfinite(df['undervaluation'].to_numpy()[result]).all()
+
+
+def test_results_are_cached_and_read_only():
+    queries = TopKQueries(players())
+
+    first = queries.top_valued(10, age_range=(20, 30))
+    assert queries.top_valued(10, age_range=(20, 30)) is first
+    assert queries.cache_info().hits == 1
+    assert not first.flags.writeable
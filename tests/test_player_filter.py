@@ -0,0 +1,74 @@
+import numpy as np
+import pandas as pd
+
+from player_filter import FilterIndex
+from positions import PositionIndex
+from synthetic_players import synthetic_players
+
+QUERIES = [
+    dict(),
+    dict(ranges=(('age', 18, 23),)),
+    dict(ranges=(('overall', 75.5, None), ('pace', None, 70))),
+    dict(ranges=(('value_eur', 1e6, 5e7), ('wage_eur', 0, 20_000.5)), groups=('Forward',)),
+    dict(categories=(('nationality', ('England', 'France', 'Atlantis')),), groups=('Defender', 'Goalkeeper')),
+    dict(ranges=(('age', 30, 45),), categories=(('league_name', ('League 18', 'League 19')),)),
+    dict(categories=(('club_name', ('Atlantis FC',)),)),
+    dict(ranges=(('overall', 99, 200), ('age', -1_000, 10_000_000_000))),
+]
+
+
+def players(n=5_000):
+    df = synthetic_players(n)
+    return df, PositionIndex(df['player_positions'])
+
+
+def naive_query(df, positions, ranges=(), categories=(), groups=(), sort_by='overall', descending=True):
+    """Boolean scan of every row, then a stable sort with missing values last."""
+    mask = np.ones(len(df), dtype=bool)
+    for column, low, high in ranges:
+        values = df[column].to_numpy(dtype=float)
+        mask &= ~np.isnan(values)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+    for column, values in categories:
+        mask &= df[column].isin(values).to_numpy()
+    if groups:
+        mask &= np.logical_or.reduce([positions.group_mask(group) for group in groups])
+    key = df[sort_by].to_numpy(dtype=float)
+    return sorted(np.flatnonzero(mask), key=lambda row: (np.isnan(key[row]),
+                                                         -key[row] if descending else key[row], row))
+
+
+def test_queries_match_boolean_scan():
+    df, positions = players()
+    index = FilterIndex(df, positions)
+
+    for query in QUERIES:
+        for sort_by, descending in [('overall', True), ('pace', False), ('value_eur', True)]:
+            result = index.query(**query, sort_by=sort_by, descending=descending)
+            assert result.tolist() == naive_query(df, positions, **query, sort_by=sort_by,
+                                                  descending=descending), (query, sort_by)
+
+
+def test_match_on_categorical_columns():
+    df, positions = players()
+    df = df.astype({'league_name': 'category', 'nationality': 'category'})
+    index = FilterIndex(df, positions)
+    query = dict(categories=(('league_name', ('League 18',)), ('nationality', ('England', 'Germany'))),
+                 ranges=(('overall', 60, None),))
+
+    assert sorted(index.match(**query).tolist()) == sorted(naive_query(df, positions, **query))
+
+
+def test_results_are_cached_and_read_only():
+    df, positions = players(500)
+    index = FilterIndex(df, positions)
+
+    first = index.query(ranges=(('age', 20, 25),))
+    assert index.query(ranges=(('age', 20, 25),)) is first
+    assert index.cache_info().hits == 1
+    assert not first.flags.writeable
+    assert index.range_index('pace').limits() == (df['pace'].min(), df['pace'].max())
+    assert pd.isna(df['pace']).any()
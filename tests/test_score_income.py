@@ -0,0 +1,67 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from income_pipeline import MODEL_PATH, PREPROCESSOR_PATH, load_income_pipeline
+from score_income import Progress, score_file
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PATHS = (os.path.join(ROOT, MODEL_PATH), os.path.join(ROOT, PREPROCESSOR_PATH))
+
+
+def census(n=50):
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame({
+        'id': np.arange(1000, 1000 + n), 'age': rng.integers(17, 90, n),
+        'capital.gain': rng.integers(0, 20_000, n), 'capital.loss': rng.integers(0, 500, n),
+        'hours.per.week': rng.integers(5, 80, n),
+        'workclass': rng.choice(['Private', 'State-gov', 'Self-emp-inc'], n),
+        'occupation': rng.choice(['Sales', 'Exec-managerial', 'Craft-repair'], n),
+        'relationship': rng.choice(['Husband', 'Wife', 'Own-child'], n),
+    })
+    df.loc[3, 'workclass'] = 'Astronaut'
+    df.loc[17, 'occupation'] = None
+    return df
+
+
+def test_bad_rows_are_left_unscored(tmp_path):
+    df = census()
+    df.to_csv(tmp_path / 'input.csv', index=False)
+    pipeline = load_income_pipeline(*PATHS)
+    good = df.drop(index=[3, 17])
+    expected = pd.Series(np.asarray(pipeline.predict(good)[0]), index=good.index)
+
+    for workers in (1, 2):
+        output = str(tmp_path / f'scored_{workers}.csv')
+        assert score_file(str(tmp_path / 'input.csv'), output, chunk_size=8, workers=workers,
+                          id_column='id', model_path=PATHS[0], preprocessor_path=PATHS[1]) == len(df)
+
+        scored = pd.read_csv(output)
+        assert scored['id'].tolist() == df['id'].tolist()
+        assert scored['prediction'].isna().tolist() == [i in (3, 17) for i in range(len(df))]
+        assert scored['prediction'].drop(index=[3, 17]).astype(int).equals(expected)
+        assert not os.path.exists(output + '.progress')
+
+
+def test_resume_continues_after_written_rows(tmp_path):
+    df = census()
+    df.to_csv(tmp_path / 'input.csv', index=False)
+    output = str(tmp_path / 'scored.csv')
+    score_file(str(tmp_path / 'input.csv'), output, chunk_size=8, workers=1,
+               model_path=PATHS[0], preprocessor_path=PATHS[1])
+    complete = pd.read_csv(output)
+
+    # an interrupted run: two chunks written, then the progress file left behind
+    with open(output, 'rb') as f:
+        head = b''.join(f.readline() for _ in range(17))
+    with open(output, 'wb') as f:
+        f.write(head + b'garbage')
+    with open(output + '.progress', 'w') as f:
+        json.dump({'job': Progress(output, str(tmp_path / 'input.csv'), 8).key, 'rows': 16,
+                   'bytes': len(head)}, f)
+
+    assert score_file(str(tmp_path / 'input.csv'), output, chunk_size=8, workers=1, resume=True,
+                      model_path=PATHS[0], preprocessor_path=PATHS[1]) == len(df) - 16
+    assert pd.read_csv(output).equals(complete)
@@ -0,0 +1,62 @@
+import numpy as np
+
+from search_index import EXACT, INFIX, PREFIX, SearchIndex, fold, tokenize
+from synthetic_players import synthetic_players
+
+
+def players(n=3_000):
+    df = synthetic_players(n)
+    df.loc[0, ['short_name', 'long_name']] = ['Kylian Mbappé', 'Kylian Mbappé Lottin']
+    df.loc[1, ['short_name', 'long_name']] = ['Mbappe', None]
+    return df
+
+
+def naive_search(df, query, k, mask=None):
+    """Scan every player: summed best match quality per query word, then overall."""
+    words = tokenize(query)
+    rank = np.empty(len(df), dtype=np.int64)
+    rank[np.argsort(-df['overall'].to_numpy(), kind='stable')] = np.arange(len(df))
+    scored = []
+    for row, (short, long) in enumerate(zip(df['short_name'], df['long_name'])):
+        if mask is not None and not mask[row]:
+            continue
+        tokens = tokenize(short) + (tokenize(long) if long is not None else [])
+        qualities = [max([EXACT if token == word else PREFIX if token.startswith(word)
+                          else INFIX if len(word) >= 3 and word in token else 0 for token in tokens], default=0)
+                     for word in words]
+        if words and min(qualities) > 0:
+            scored.append((-sum(qualities), rank[row], row))
+    return [row for _, _, row in sorted(scored)[:k]]
+
+
+def test_search_matches_scan():
+    df = players()
+    index = SearchIndex(df)
+
+    for query in ['silva', 'Silv', 'ilv', 'L. Silva', 'mbappe', 'MBAPPÉ lot', 'son', 'k s', 'zzz', '']:
+        for k in (1, 20, len(df)):
+            assert index.search(query, k=k).tolist() == naive_search(df, query, k), (query, k)
+
+
+def test_search_within_mask():
+    df = players()
+    index = SearchIndex(df)
+    mask = df['overall'].to_numpy() % 3 == 0
+
+    for query in ['silva', 'ar', 'kylian mb']:
+        assert index.search(query, k=30, mask=mask).tolist() == naive_search(df, query, 30, mask), query
+
+
+def test_best_is_overall_order():
+    df = players()
+    index = SearchIndex(df)
+    mask = df['age'].to_numpy() < 25
+
+    expected = df.sort_values('overall', ascending=False, kind='stable').index
+    assert index.best(k=50).tolist() == expected[:50].tolist()
+    assert index.best(k=50, mask=mask).tolist() == [row for row in expected if mask[row]][:50]
+
+
+def test_fold_strips_accents_and_case():
+    assert fold('Mbappé') == fold('MBAPPE') == 'mbappe'
+    assert tokenize("N'Golo Kanté") == ['n', 'golo', 'kante']
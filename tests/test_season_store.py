@@ -0,0 +1,43 @@
+import numpy as np
+
+from search_index import fold
+from season_store import SeasonStore, add_season, search_names
+from synthetic_players import synthetic_players
+
+
+def store(tmp_path, n=2_000):
+    df = synthetic_players(n)
+    df.loc[:2, 'short_name'] = ['Mo_Salah', 'Mo Salah 100%', 'Momo Salahs']
+    add_season(df, 2024, str(tmp_path))
+    return df, SeasonStore(str(tmp_path))
+
+
+def naive_search(df, text, k):
+    names = [fold(f"{short} {long}") for short, long in zip(df['short_name'], df['long_name'])]
+    words = fold(text).split()
+    matches = df[[all(word in name for word in words) for name in names]]
+    return matches.sort_values(['overall', 'sofifa_id'], ascending=[False, True])['sofifa_id'].head(k).tolist()
+
+
+def test_search_matches_substring_scan(tmp_path):
+    df, seasons = store(tmp_path)
+
+    for text in ['salah', 'MO SALAH', 'ana', 'é', 'zzzz']:
+        assert seasons.search(2024, text, k=20)['player_id'].tolist() == naive_search(df, text, 20), text
+
+
+def test_like_wildcards_in_search_are_literal(tmp_path):
+    df, seasons = store(tmp_path)
+
+    assert seasons.search(2024, 'mo_salah')['short_name'].tolist() == ['Mo_Salah']
+    assert seasons.search(2024, '100%')['short_name'].tolist() == ['Mo Salah 100%']
+    assert seasons.search(2024, '%')['short_name'].tolist() == ['Mo Salah 100%']
+
+
+def test_search_names_folds_each_player():
+    df = synthetic_players(500)
+
+    names = search_names(df)
+
+    np.testing.assert_array_equal(names, [fold(f"{short} {long}")
+                                          for short, long in zip(df['short_name'], df['long_name'])])